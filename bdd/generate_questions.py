@@ -0,0 +1,655 @@
+"""
+Générateur de banques de questions synthétiques pour les tests de montée en charge.
+
+Produit N questions réalistes (gabarits par sujet, 2 à 4 propositions, une ou
+plusieurs réponses correctes) dans l'un des formats suivants :
+
+- csv   : le gabarit d'import (`question,subject,use,correct,responseA..D,remark`)
+- jsonl : un document Mongo par ligne (Extended JSON, compatible `mongoimport`)
+- mongo : insertion directe par lots `insert_many` (configuration `.env`)
+
+Les lignes sont produites en flux (mémoire constante hors réservoir de doublons)
+et plusieurs paramètres contrôlent ce que les importeurs doivent corriger :
+
+- distribution des sujets (loi de Zipf, `--subject-skew`) et des usages ;
+- doublons exacts (même clé de question, propositions partiellement
+  différentes : exerce la fusion des réponses) ;
+- quasi-doublons (article, ponctuation, faute de frappe : clé différente) ;
+- fautes de frappe dans les sujets (exerce la correction approximative).
+
+Les chiffres réels générés sont affichés en fin d'exécution (`--stats-file`
+pour les enregistrer en JSON) afin de vérifier les rapports d'import.
+
+    python generate_questions.py --rows 1000000 --output questions_1m.csv
+    python generate_questions.py --rows 200000 --format mongo --writers 4
+"""
+
+import argparse
+import csv
+import gzip
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGO_HOST = os.getenv("MONGO_HOST", "localhost")
+MONGO_PORT = os.getenv("MONGO_PORT", "27018")
+DB_NAME = os.getenv("DB_NAME", "miskatonic")
+COLLECTION_NAME = os.getenv("COLLECTION_NAME", "questions")
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1000"))
+
+CSV_HEADER = [
+    "question",
+    "subject",
+    "use",
+    "correct",
+    "responseA",
+    "responseB",
+    "responseC",
+    "responseD",
+    "remark",
+]
+LETTERS = ["A", "B", "C", "D"]
+
+# Sujets de la banque réelle (bdd/questions.csv), complétés si --subjects > 8
+BASE_SUBJECTS = [
+    "BDD",
+    "Automation",
+    "Classification",
+    "Data Science",
+    "Docker",
+    "Machine Learning",
+    "Streaming de données",
+    "Systèmes distribués",
+]
+EXTRA_SUBJECTS = [
+    "Sécurité",
+    "Réseaux",
+    "Cloud",
+    "Kubernetes",
+    "Statistiques",
+    "Visualisation",
+    "Python avancé",
+    "Big Data",
+    "Traitement du langage",
+    "Vision par ordinateur",
+    "Architecture logicielle",
+    "Gouvernance des données",
+]
+# Répartition des usages observée dans la banque réelle
+DEFAULT_USES = "Test de validation:0.45,Test de positionnement:0.35,Total Bootcamp:0.20"
+
+TEMPLATES = [
+    "En {subject}, à quoi sert {a} lorsque l'on utilise {b} {ctx} ?",
+    "Quelle est la différence entre {a} et {b} {ctx} ?",
+    "Dans un projet de {subject}, {a} permet-il de remplacer {b} {ctx} ?",
+    "Pourquoi privilégier {a} plutôt que {b} {ctx} ?",
+    "Quel est le rôle de {a} par rapport à {b} en {subject} ?",
+    "Parmi les propositions suivantes, laquelle décrit {a} {ctx} :",
+    "Que se passe-t-il si {a} échoue alors que {b} est actif {ctx} ?",
+    "Comment configurer {a} pour travailler avec {b} {ctx} ?",
+    "{a} et {b} sont-ils compatibles {ctx} ?",
+    "Quelle affirmation sur {a} est correcte {ctx} ?",
+    "En {subject}, quel composant dépend de {a} et de {b} ?",
+    "Quel indicateur surveiller pour {a} lorsque {b} sature {ctx} ?",
+]
+TERMS = [
+    "le partitionnement",
+    "la réplication",
+    "un index secondaire",
+    "le sharding",
+    "un consumer group",
+    "le broker",
+    "un conteneur",
+    "une image",
+    "un volume",
+    "le réseau bridge",
+    "la validation croisée",
+    "la régularisation",
+    "un arbre de décision",
+    "une forêt aléatoire",
+    "la descente de gradient",
+    "la normalisation",
+    "le théorème CAP",
+    "un combiner",
+    "un partitioner",
+    "le DAG",
+    "un opérateur",
+    "un capteur",
+    "la file de messages",
+    "le journal de transactions",
+    "la mise en cache",
+    "un équilibreur de charge",
+    "la compression",
+    "le schéma",
+    "une jointure",
+    "une agrégation",
+    "la matrice de confusion",
+    "la précision",
+    "le rappel",
+    "le surapprentissage",
+    "un pipeline",
+    "la sérialisation",
+    "un orchestrateur",
+    "une fenêtre glissante",
+    "le watermark",
+    "un checkpoint",
+    "la tolérance aux pannes",
+    "le consensus",
+    "un verrou distribué",
+    "la cohérence à terme",
+    "un réplica",
+    "la clé primaire",
+    "une transaction",
+    "le quorum",
+]
+CONTEXTS = [
+    "en production",
+    "sur un cluster de trois nœuds",
+    "avec un volume de données important",
+    "lors d'une panne réseau",
+    "pendant une montée de version",
+    "dans un environnement de test",
+    "avec des données non structurées",
+    "en temps réel",
+    "en mode batch",
+    "sur une seule machine",
+    "avec une forte latence",
+    "lorsque la mémoire est limitée",
+    "dans le cloud",
+    "sur site",
+    "avec plusieurs équipes",
+    "pour un tableau de bord",
+    "pour un modèle de classification",
+    "pour un flux de capteurs",
+    "avec des données sensibles",
+    "lors d'un audit",
+    "avec un budget limité",
+    "à grande échelle",
+    "lors du déploiement initial",
+    "après une migration",
+    "avec des utilisateurs concurrents",
+    "lors d'une reprise après incident",
+    "avec un schéma évolutif",
+    "en haute disponibilité",
+    "avec des exigences de conformité",
+    "pour une application mobile",
+    "pour un entrepôt de données",
+    "pour un lac de données",
+]
+RESPONSE_PATTERNS = [
+    "{term}",
+    "Il faut utiliser {term}",
+    "{term} n'a aucun effet",
+    "Seulement avec {term}",
+    "Aucune, {term} suffit",
+]
+ARTICLE_SWAPS = [
+    (" le ", " la "),
+    (" la ", " le "),
+    (" un ", " une "),
+    (" une ", " un "),
+    (" des ", " les "),
+    (" les ", " des "),
+]
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--format", choices=["csv", "jsonl", "mongo"])
+    parser.add_argument(
+        "--output", default="-", help="Fichier de sortie (.gz accepté), '-' : stdout"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--subjects", type=int, default=len(BASE_SUBJECTS))
+    parser.add_argument(
+        "--subject-skew",
+        type=float,
+        default=1.0,
+        help="Exposant de Zipf des sujets (0 : répartition uniforme)",
+    )
+    parser.add_argument(
+        "--uses", default=DEFAULT_USES, help="Usages pondérés 'nom:poids,...'"
+    )
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--near-duplicate-rate", type=float, default=0.03)
+    parser.add_argument("--typo-rate", type=float, default=0.02)
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=10000,
+        help="Questions gardées en réservoir pour tirer les doublons",
+    )
+    parser.add_argument("--active-rate", type=float, default=0.8)
+    parser.add_argument("--created-by", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument(
+        "--writers", type=int, default=4, help="Insertions Mongo concurrentes"
+    )
+    parser.add_argument("--stats-file")
+    args = parser.parse_args()
+    if args.format is None:
+        name = args.output[:-3] if args.output.endswith(".gz") else args.output
+        args.format = "jsonl" if name.endswith(".jsonl") else "csv"
+    return args
+
+
+# --- Paramètres de distribution ---
+def build_subjects(count: int) -> List[str]:
+    """Liste de `count` sujets : banque réelle, puis sujets supplémentaires."""
+    subjects = (BASE_SUBJECTS + EXTRA_SUBJECTS)[:count]
+    subjects += [f"Module {i}" for i in range(len(subjects) + 1, count + 1)]
+    return subjects
+
+
+def zipf_weights(count: int, skew: float) -> List[float]:
+    return [1 / (rank**skew) for rank in range(1, count + 1)]
+
+
+def parse_weighted(spec: str) -> Tuple[List[str], List[float]]:
+    """'a:0.5,b:0.5' -> (['a', 'b'], [0.5, 0.5])"""
+    names, weights = [], []
+    for item in spec.split(","):
+        name, _, weight = item.rpartition(":")
+        if not name:
+            name, weight = weight, "1"
+        names.append(name.strip())
+        weights.append(float(weight))
+    return names, weights
+
+
+# --- Altérations ---
+def strip_accents(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s)
+    return "".join(ch for ch in s if not unicodedata.combining(ch))
+
+
+def typo(rng: random.Random, s: str) -> str:
+    """Faute de frappe : lettre omise, doublée, inversée, ou accents perdus."""
+    if len(s) < 4:
+        return s + s[-1]
+    kind = rng.randrange(4)
+    i = rng.randrange(1, len(s) - 1)
+    if kind == 0:
+        return s[:i] + s[i + 1 :]
+    if kind == 1:
+        return s[:i] + s[i] + s[i:]
+    if kind == 2:
+        return s[:i] + s[i + 1] + s[i] + s[i + 2 :]
+    stripped = strip_accents(s)
+    return stripped if stripped != s else s[:i] + s[i + 1 :]
+
+
+def near_duplicate(rng: random.Random, question: str) -> str:
+    """
+    Variante proche d'une question dont la clé normalisée diffère :
+    article changé, ponctuation modifiée ou faute de frappe dans un mot.
+    """
+    for _ in range(3):
+        kind = rng.randrange(3)
+        if kind == 0:
+            swaps = [swap for swap in ARTICLE_SWAPS if swap[0] in question]
+            if swaps:
+                old, new = rng.choice(swaps)
+                return question.replace(old, new, 1)
+        elif kind == 1:
+            if question.endswith(" ?"):
+                return question[:-2] + "?"
+            if question.endswith("?"):
+                return question[:-1].rstrip()
+            return question.rstrip(" :") + " ?"
+        else:
+            words = question.split(" ")
+            candidates = [i for i, word in enumerate(words) if len(word) >= 5]
+            if candidates:
+                i = rng.choice(candidates)
+                words[i] = typo(rng, words[i])
+                return " ".join(words)
+    return question + "."
+
+
+# --- Génération ---
+class QuestionGenerator:
+    """
+    Génère des lignes au format du gabarit CSV.
+    Le texte des questions « neuves » est une bijection de l'index vers les
+    combinaisons gabarit x termes x contexte (permutées par un multiplicateur
+    premier avec leur nombre) : les questions sont uniques sans garder
+    d'ensemble des questions déjà produites.
+    """
+
+    def __init__(self, args):
+        self.rng = random.Random(args.seed)
+        self.subjects = build_subjects(args.subjects)
+        self.subject_weights = list(
+            itertools.accumulate(zipf_weights(len(self.subjects), args.subject_skew))
+        )
+        self.uses, use_weights = parse_weighted(args.uses)
+        self.use_weights = list(itertools.accumulate(use_weights))
+        self.duplicate_rate = args.duplicate_rate
+        self.near_duplicate_rate = args.near_duplicate_rate
+        self.typo_rate = args.typo_rate
+        self.pool_size = args.pool_size
+        self.pool: List[Dict[str, str]] = []
+        self.fresh_count = 0
+        self.stats = {
+            "rows": 0,
+            "fresh": 0,
+            "exact_duplicates": 0,
+            "near_duplicates": 0,
+            "subject_typos": 0,
+        }
+
+        self.combinations = (
+            len(TEMPLATES) * len(TERMS) * (len(TERMS) - 1) * len(CONTEXTS)
+        )
+        multiplier = int(self.combinations * 0.6180339887)
+        while math.gcd(multiplier, self.combinations) != 1:
+            multiplier += 1
+        self.multiplier = multiplier
+
+    def _question_text(self, index: int, subject: str) -> str:
+        cycle, position = divmod(index, self.combinations)
+        position = (position * self.multiplier) % self.combinations
+        position, ctx = divmod(position, len(CONTEXTS))
+        position, b = divmod(position, len(TERMS) - 1)
+        template, a = divmod(position, len(TERMS))
+        b = (a + 1 + b) % len(TERMS)  # toujours deux termes distincts
+        text = TEMPLATES[template].format(
+            subject=subject.lower(), a=TERMS[a], b=TERMS[b], ctx=CONTEXTS[ctx]
+        )
+        text = text[0].upper() + text[1:]
+        if cycle:
+            text = f"{text} (partie {cycle + 1})"
+        return text
+
+    def _responses(self) -> Tuple[List[str], List[str]]:
+        """Propositions (2 à 4) et lettres correctes (0 à 2)."""
+        count = self.rng.choices([4, 3, 2], cum_weights=[70, 85, 100])[0]
+        terms = self.rng.sample(TERMS, count)
+        responses = [
+            self.rng.choice(RESPONSE_PATTERNS).format(term=term) for term in terms
+        ]
+        responses = [r[0].upper() + r[1:] for r in responses]
+        n_correct = self.rng.choices([1, 2, 0], cum_weights=[75, 95, 100])[0]
+        correct = sorted(self.rng.sample(LETTERS[:count], min(n_correct, count)))
+        return responses, correct
+
+    def _row(
+        self,
+        question: str,
+        subject: str,
+        use: str,
+        responses: List[str],
+        correct: List[str],
+        remark: str = "",
+    ) -> Dict[str, str]:
+        row = {
+            "question": question,
+            "subject": subject,
+            "use": use,
+            "correct": " ".join(correct),
+            "remark": remark,
+        }
+        for i, letter in enumerate(LETTERS):
+            row[f"response{letter}"] = responses[i] if i < len(responses) else ""
+        return row
+
+    def _fresh(self) -> Dict[str, str]:
+        subject = self.rng.choices(self.subjects, cum_weights=self.subject_weights)[0]
+        use = self.rng.choices(self.uses, cum_weights=self.use_weights)[0]
+        responses, correct = self._responses()
+        remark = f"Voir le module {subject}" if self.rng.random() < 0.1 else ""
+        row = self._row(
+            self._question_text(self.fresh_count, subject),
+            subject,
+            use,
+            responses,
+            correct,
+            remark,
+        )
+        self.fresh_count += 1
+        self.stats["fresh"] += 1
+
+        # Réservoir borné des questions neuves, source des doublons
+        if len(self.pool) < self.pool_size:
+            self.pool.append(row)
+        else:
+            self.pool[self.rng.randrange(self.pool_size)] = row
+        return row
+
+    def _exact_duplicate(self, base: Dict[str, str]) -> Dict[str, str]:
+        """
+        Même clé de question (casse, espaces ou ':' final différents) et
+        propositions en partie nouvelles : les importeurs doivent fusionner.
+        """
+        question = base["question"]
+        variant = self.rng.randrange(3)
+        if variant == 1:
+            question = f"  {question} "
+        elif variant == 2:
+            question = question[0].lower() + question[1:].rstrip(" :") + " :"
+
+        old = [
+            (base[f"response{letter}"], letter in base["correct"].split())
+            for letter in LETTERS
+            if base[f"response{letter}"]
+        ]
+        kept = self.rng.sample(old, self.rng.randint(1, len(old)))
+        new_count = self.rng.randint(0, len(LETTERS) - len(kept))
+        new = [
+            (f"Proposition complémentaire : {term}", False)
+            for term in self.rng.sample(TERMS, new_count)
+        ]
+        if new and self.rng.random() < 0.3:
+            new[0] = (new[0][0], True)
+        proposals = kept + new
+        self.rng.shuffle(proposals)
+        self.stats["exact_duplicates"] += 1
+        return self._row(
+            question,
+            base["subject"],
+            base["use"],
+            [text for text, _ in proposals],
+            [LETTERS[i] for i, (_, ok) in enumerate(proposals) if ok],
+            base["remark"],
+        )
+
+    def _near_duplicate(self, base: Dict[str, str]) -> Dict[str, str]:
+        self.stats["near_duplicates"] += 1
+        row = dict(base)
+        row["question"] = near_duplicate(self.rng, base["question"])
+        return row
+
+    def rows(self, count: int) -> Iterator[Dict[str, str]]:
+        for _ in range(count):
+            draw = self.rng.random()
+            if self.pool and draw < self.duplicate_rate:
+                row = self._exact_duplicate(self.rng.choice(self.pool))
+            elif self.pool and draw < self.duplicate_rate + self.near_duplicate_rate:
+                row = self._near_duplicate(self.rng.choice(self.pool))
+            else:
+                row = self._fresh()
+            if self.rng.random() < self.typo_rate:
+                row = dict(row, subject=typo(self.rng, row["subject"]))
+                self.stats["subject_typos"] += 1
+            self.stats["rows"] += 1
+            yield row
+
+
+def to_document(
+    row: Dict[str, str],
+    rng: random.Random,
+    created_by: int,
+    active_rate: float,
+    now: datetime,
+) -> Dict[str, Any]:
+    """Ligne du gabarit -> document Mongo (forme de `template_mongo.json`)."""
+    responses, corrects = [], []
+    correct = set(row["correct"].split())
+    for letter in LETTERS:
+        text = row[f"response{letter}"].strip()
+        if text:
+            responses.append(text)
+            if letter in correct:
+                corrects.append(text)
+    created_at = now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+    return {
+        "question": row["question"].strip(),
+        "subject": [row["subject"]],
+        "use": [row["use"]],
+        "corrects": corrects,
+        "responses": responses,
+        "remark": row["remark"] or None,
+        "status": "active" if rng.random() < active_rate else "draft",
+        "created_by": created_by,
+        "created_at": created_at,
+        "edited_at": None,
+    }
+
+
+# --- Sorties ---
+def open_output(path: str):
+    if path == "-":
+        return sys.stdout
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def write_csv(rows: Iterator[Dict[str, str]], path: str) -> None:
+    out = open_output(path)
+    try:
+        writer = csv.DictWriter(out, fieldnames=CSV_HEADER)
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def _extended_json(value):
+    if isinstance(value, datetime):
+        return {"$date": value.strftime("%Y-%m-%dT%H:%M:%S.000Z")}
+    raise TypeError(type(value).__name__)
+
+
+def write_jsonl(documents: Iterator[Dict[str, Any]], path: str) -> None:
+    out = open_output(path)
+    try:
+        for document in documents:
+            out.write(
+                json.dumps(document, ensure_ascii=False, default=_extended_json)
+            )
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def write_mongo(
+    documents: Iterator[Dict[str, Any]], batch_size: int, writers: int
+) -> int:
+    """
+    Insère les documents par lots `insert_many(ordered=False)` ; jusqu'à
+    `writers` lots en vol pendant que la génération continue.
+    """
+    from pymongo import MongoClient
+
+    client = MongoClient(
+        f"mongodb://{MONGO_HOST}:{MONGO_PORT}",
+        serverSelectionTimeoutMS=8000,
+        maxPoolSize=writers + 1,
+    )
+    client.admin.command("ping")
+    collection = client[DB_NAME][COLLECTION_NAME]
+    in_flight = threading.BoundedSemaphore(writers * 2)
+    inserted = 0
+    lock = threading.Lock()
+
+    def _insert(batch):
+        nonlocal inserted
+        try:
+            result = collection.insert_many(batch, ordered=False)
+            with lock:
+                inserted += len(result.inserted_ids)
+        finally:
+            in_flight.release()
+
+    try:
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            futures = []
+            batch: List[Dict[str, Any]] = []
+            for document in documents:
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    in_flight.acquire()
+                    futures.append(pool.submit(_insert, batch))
+                    batch = []
+            if batch:
+                in_flight.acquire()
+                futures.append(pool.submit(_insert, batch))
+            for future in futures:
+                future.result()  # remonte la première erreur d'insertion
+    finally:
+        client.close()
+    return inserted
+
+
+def main():
+    args = _parse_args()
+    generator = QuestionGenerator(args)
+    rows = generator.rows(args.rows)
+    start = time.perf_counter()
+
+    if args.format == "csv":
+        write_csv(rows, args.output)
+    else:
+        doc_rng = random.Random(args.seed + 1)
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        documents = (
+            to_document(row, doc_rng, args.created_by, args.active_rate, now)
+            for row in rows
+        )
+        if args.format == "jsonl":
+            write_jsonl(documents, args.output)
+        else:
+            inserted = write_mongo(documents, args.batch_size, args.writers)
+            print(
+                f"{inserted} documents insérés dans {DB_NAME}.{COLLECTION_NAME}",
+                file=sys.stderr,
+            )
+
+    elapsed = time.perf_counter() - start
+    stats: Dict[str, Optional[Any]] = dict(generator.stats)
+    stats.update(
+        {
+            "subjects": generator.subjects,
+            "seconds": round(elapsed, 2),
+            "rows_per_second": round(stats["rows"] / elapsed) if elapsed else None,
+        }
+    )
+    # stderr : stdout peut porter le CSV généré
+    print(json.dumps(stats, ensure_ascii=False, indent=2), file=sys.stderr)
+    if args.stats_file:
+        with open(args.stats_file, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
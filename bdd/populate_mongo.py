@@ -1,19 +1,65 @@
-import os
+"""
+Chargement en masse d'un CSV de questions (gabarit d'import) dans MongoDB,
+avec le même traitement que l'import de l'API (`CSVQuestionProcessor` :
+nettoyage, correction des sujets, fusion des doublons, empreinte et clés LSH).
+
+- le nettoyage des lignes (`normalize_row`, clés LSH) est réparti sur un pool
+  de processus (`--workers`) ; la correction des sujets et la fusion des
+  doublons, qui dépendent de l'ordre du fichier, restent dans le processus
+  principal ;
+- les clés LSH sont de loin l'étape la plus coûteuse (environ 0,7 ms par
+  question) : `--no-lsh` les omet, `cluster_near_duplicates.py` (depuis
+  `backend/`) les calcule ensuite pour les questions qui n'en ont pas ;
+- les lots sont insérés par plusieurs `insert_many(ordered=False)`
+  concurrents (`--writers`). Une question déjà en base (index unique sur
+  `question_key_hash`, y compris depuis un lot précédent) est fusionnée
+  dans le document existant, comme l'import en mode upsert ;
+- après chaque lot écrit (et tous ceux qui le précèdent), l'avancement est
+  enregistré dans `--checkpoint` : relancer la même commande après une
+  interruption reprend après le dernier lot écrit. Rejouer un lot déjà
+  écrit ne crée pas de doublon (fusion idempotente).
+
+Le débit de bout en bout (lecture, traitement et insertion, en lignes/s) est
+affiché en fin de chargement ; `--dry-run` mesure le traitement seul, sans
+écriture.
+
+    python populate_mongo.py --source questions.csv
+    python populate_mongo.py --source questions_1m.csv --no-lsh
+    python populate_mongo.py --source questions_1m.csv --workers 8 --writers 4
+    python populate_mongo.py --source questions_1m.csv --dry-run
+"""
+
+import argparse
 import csv
+import json
+import os
 import sys
-import unicodedata
-from collections import Counter
-from typing import Dict, Iterator, List, Optional, Any
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
-from pymongo import MongoClient
-from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError
 from dotenv import load_dotenv
-from difflib import SequenceMatcher
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError
+
+# `src/backend/` pour partager le traitement des imports de l'API
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "backend"))
+
+from models.question import Question  # noqa: E402
+from repositories.question_repository import (  # noqa: E402
+    DUPLICATE_KEY_CODE,
+    QuestionRepository,
+)
+from utils.csv_processor import CSVQuestionProcessor  # noqa: E402
+from utils.minhash import minhasher  # noqa: E402
 
 load_dotenv()
 
-MONGO_USERNAME = os.getenv("MONGO_USERNAME")
-MONGO_PASSWORD = os.getenv("MONGO_PASSWORD")
 MONGO_HOST = os.getenv("MONGO_HOST", "localhost")
 MONGO_PORT = os.getenv("MONGO_PORT", "27018")
 DB_NAME = os.getenv("DB_NAME", "miskatonic")
@@ -21,352 +67,357 @@ COLLECTION_NAME = os.getenv("COLLECTION_NAME", "questions")
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1000"))
 CSV_SOURCE = os.getenv("CSV_SOURCE", "./questions.csv")
 
-SUBJECT_FIX_ENABLED = os.getenv("SUBJECT_FIX_ENABLED", "true")
+SUBJECT_FIX_ENABLED = os.getenv("SUBJECT_FIX_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
 SUBJECT_SEUIL = float(os.getenv("SUBJECT_SEUIL", "0.90"))
 
-
-def normalize_text(s: str) -> str:
-    if not s:
-        return ""
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    return "".join(ch for ch in s.lower() if ch.isalnum())
-
-
-def letter_similarity(a: str, b: str) -> float:
-    # % lettres communes: nb commun/max lettres
-    na, nb = normalize_text(a), normalize_text(b)
-    if not na and not nb:
-        return 1.0
-    if not na or not nb:
-        return 0.0
-    ca, cb = Counter(na), Counter(nb)
-    inter = sum((ca & cb).values())
-    denom = max(len(na), len(nb))
-    return inter / denom if denom else 0.0
+# Traitement sans état des lignes, dans les processus du pool
+_normalizer = CSVQuestionProcessor()
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--source", default=CSV_SOURCE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processus de nettoyage des lignes (0 : dans le processus principal)",
+    )
+    parser.add_argument(
+        "--writers", type=int, default=4, help="Insertions Mongo concurrentes"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=2000,
+        help="Lignes envoyées à la fois à un processus du pool",
+    )
+    parser.add_argument(
+        "--checkpoint", help="Fichier d'avancement (défaut : <source>.checkpoint.json)"
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore l'avancement enregistré et recommence au début du fichier",
+    )
+    parser.add_argument("--created-by", type=int)
+    parser.add_argument(
+        "--no-fix-subjects",
+        dest="fix_subjects",
+        action="store_false",
+        default=SUBJECT_FIX_ENABLED,
+    )
+    parser.add_argument("--subject-threshold", type=float, default=SUBJECT_SEUIL)
+    parser.add_argument(
+        "--no-lsh",
+        dest="lsh",
+        action="store_false",
+        help="N'enregistre pas les clés LSH (calculées ensuite par "
+        "cluster_near_duplicates.py)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Traite le fichier sans rien écrire"
+    )
+    args = parser.parse_args()
+    if args.checkpoint is None:
+        args.checkpoint = f"{args.source}.checkpoint.json"
+    return args
+
+
+# ==================== AVANCEMENT ====================
+
+
+def read_checkpoint(path: str, source: str, size: int) -> Optional[Dict[str, Any]]:
+    """Avancement d'un chargement interrompu du même fichier, s'il existe"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint["source"] != source or checkpoint["size"] != size:
+        raise ValueError(
+            f"{path} concerne un autre fichier ou une autre version de "
+            f"{source} : relancer avec --restart"
+        )
+    return checkpoint
 
 
-def sequence_similarity(a: str, b: str) -> float:
-    # % séquences communes : voir 'Distance de Levenshtein'
-    na, nb = normalize_text(a), normalize_text(b)
-    return SequenceMatcher(None, na, nb).ratio()
+def write_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    """Écriture atomique : un arrêt brutal laisse l'ancien ou le nouveau fichier"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
 
 
-def similarity(a: str, b: str) -> float:
-    # pondération actuelle : autant de poids pour similarité lettres et séquence (à ajuster)
-    ls = letter_similarity(a, b)
-    ss = sequence_similarity(a, b)
-    return 0.5 * ls + 0.5 * ss
+# ==================== LECTURE ET NETTOYAGE ====================
 
 
-def canonicalize_subject(
-    subject: str, known_subjects: Dict[str, int], seuil: float
-) -> str:
+def read_chunks(
+    path: str, processor: CSVQuestionProcessor, skip: int, chunk_size: int
+) -> Iterator[Tuple[List[str], List[List[str]]]]:
     """
-    Retourne un subject existant
-    le plus proche si score >= seuil, sinon le subject tel quel.
-    known_subjects: dict {subject_canonique: count}
+    Lignes brutes du CSV par paquets (en-tête, lignes), à partir de la
+    ligne `skip` ; les lignes vides sont ignorées comme par `csv.DictReader`.
     """
-    if subject is None or not known_subjects:
-        return subject
-
-    if subject in known_subjects:
-        return subject  # égalité stricte
-
-    best_subject = None
-    best_score = 0.0
-
-    for s in known_subjects.keys():
-        if s == subject:
-            return s
-        score = similarity(subject, s)
-        if score > best_score:
-            best_score = score
-            best_subject = s
-
-    if best_subject is not None and best_score >= seuil:
-        return best_subject
-    return subject
-
-
-# --- Normalisations champs ---
-def strip_or_none(v: Optional[str]) -> Optional[str]:
-    if v is None:
-        return None
-    v2 = v.strip()
-    return v2 if v2 else None
-
-
-def normalize_correct(v: Optional[str]) -> Optional[List[str]]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            raise ValueError("Le fichier CSV ne contient pas d'en-têtes")
+        processor.validate_csv_headers(header)
+        rows = islice((row for row in reader if row), skip, None)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield header, chunk
+
+
+def _normalize_chunk(
+    header: List[str], chunk: List[List[str]], lsh: bool = True
+) -> List[Optional[Dict[str, Any]]]:
+    """Nettoyage (et clés LSH) d'un paquet de lignes (processus du pool)"""
+    items = []
+    for values in chunk:
+        item = _normalizer.normalize_row(dict(zip(header, values)))
+        if item is not None and lsh:
+            item["minhash_bands"] = minhasher.keys(item["question"])
+        items.append(item)
+    return items
+
+
+def normalized_rows(
+    chunks: Iterator[Tuple[List[str], List[List[str]]]],
+    workers: int,
+    lsh: bool = True,
+) -> Iterator[Optional[Dict[str, Any]]]:
     """
-    Normalisation du champ 'correct'
+    Lignes nettoyées, dans l'ordre du fichier. Au plus deux paquets par
+    processus sont en attente : la mémoire reste bornée.
     """
-    if v is None:
-        return []
-
-    txt = v.strip().upper()
-    if not txt:
-        return []
-    txt = txt.replace(",", " ").replace("-", " ")
-    parts = [p for p in txt.split() if p]
+    if workers < 1:
+        for header, chunk in chunks:
+            yield from _normalize_chunk(header, chunk, lsh)
+        return
 
-    return parts
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for header, chunk in chunks:
+            pending.append(pool.submit(_normalize_chunk, header, chunk, lsh))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
 
 
-def standardize_question(question: str) -> str:
-    """
-    Standardise une question :
-    - Supprime les espaces en début/fin
-    - Supprime le dernier caractère si c'est ":"
-    """
-    if not question:
-        return question
+# ==================== ÉCRITURE ====================
 
-    standardized = question.strip()
-    if standardized.endswith(":"):
-        standardized = standardized[:-1].strip()
 
-    return standardized
+def make_mongo_client(writers: int) -> MongoClient:
+    return MongoClient(
+        f"mongodb://{MONGO_HOST}:{MONGO_PORT}",
+        serverSelectionTimeoutMS=8000,
+        maxPoolSize=writers + 1,
+    )
 
 
-def create_question_key(question: str) -> str:
-    """
-    Crée une clé unique basée uniquement sur la question standardisée pour détecter les doublons
-    """
-    return standardize_question(question).lower()
+def ensure_indexes(collection) -> None:
+    """Index nécessaires au dédoublonnage entre lots (mêmes que l'API)"""
+    collection.create_index(
+        "question_key_hash",
+        unique=True,
+        partialFilterExpression={"question_key_hash": {"$type": "string"}},
+    )
+    collection.create_index("minhash_bands")
 
 
-def merge_responses_and_corrects(
-    existing_reponses: List[str],
-    new_reponses: List[str],
-    existing_corrects: List[str],
-    new_corrects: List[str],
-) -> tuple:
+def write_batch(
+    collection, questions: List[Question], lsh: bool = True
+) -> Tuple[int, int]:
     """
-    Fusionne les réponses et corrects en supprimant les doublons
-    Retourne (reponses_merged, corrects_merged)
+    Insère un lot ; les questions déjà en base sont fusionnées dans le
+    document existant. Retourne (insérées, fusionnées). Sans `lsh`, le champ
+    `minhash_bands` est omis pour être calculé plus tard.
     """
-    # Fusion des réponses en préservant l'ordre et supprimant les doublons
-    all_reponses = existing_reponses + [
-        r for r in new_reponses if r not in existing_reponses
+    exclude = {"id"} if lsh else {"id", "minhash_bands"}
+    documents = [question.model_dump(exclude=exclude) for question in questions]
+    try:
+        result = collection.insert_many(documents, ordered=False)
+        return len(result.inserted_ids), 0
+    except BulkWriteError as bwe:
+        errors = bwe.details.get("writeErrors", [])
+        others = [error for error in errors if error.get("code") != DUPLICATE_KEY_CODE]
+        if others:
+            raise
+        inserted = bwe.details.get("nInserted", 0)
+
+    operations = [
+        UpdateOne(
+            {"question_key_hash": questions[error["index"]].question_key_hash},
+            QuestionRepository.merge_pipeline(
+                questions[error["index"]], with_bands=lsh
+            ),
+            upsert=True,
+        )
+        for error in errors
     ]
+    collection.bulk_write(operations, ordered=False)
+    return inserted, len(operations)
+
+
+# ==================== CHARGEMENT ====================
+
+
+def load(args, collection) -> Dict[str, Any]:
+    """Charge `args.source` (collection None : `--dry-run`) ; retourne le bilan"""
+    source = os.path.abspath(args.source)
+    size = os.path.getsize(source)
+    processor = CSVQuestionProcessor(
+        fix_subjects=args.fix_subjects, subject_threshold=args.subject_threshold
+    )
+    totals = {"inserted": 0, "merged_existing": 0}
+
+    checkpoint = None
+    if not args.restart and not args.dry_run:
+        checkpoint = read_checkpoint(args.checkpoint, source, size)
+    if checkpoint is not None:
+        processor.stats.update(checkpoint["stats"])
+        processor.subjects_count.update(checkpoint["subjects_count"])
+        for name in totals:
+            totals[name] = checkpoint[name]
+        print(f"Reprise après {checkpoint['stats']['total_rows']} lignes")
+    skip = processor.stats["total_rows"]
+
+    # clés LSH des questions du lot en cours (calculées par le pool)
+    bands: Dict[str, List[int]] = {}
+
+    def _keep_bands(items):
+        for item in items:
+            if item is not None and args.lsh:
+                bands.setdefault(item["key"], item.pop("minhash_bands"))
+            yield item
+
+    def _commit(entry: Tuple[Future, Dict[str, Any]]) -> None:
+        future, state = entry
+        inserted, merged = future.result()
+        totals["inserted"] += inserted
+        totals["merged_existing"] += merged
+        write_checkpoint(
+            args.checkpoint, {"source": source, "size": size, **state, **totals}
+        )
 
-    # Fusion des corrects en supprimant les doublons
-    all_corrects = list(set(existing_corrects + new_corrects))
-
-    return all_reponses, sorted(all_corrects)
-
-
-# --- Lecture CSV + nettoyage + correction des subjects ---
-def read_csv_rows(
-    file_path: str, fix_subjects: bool = True, subject_seuil: float = 0.90
-) -> Iterator[dict]:
-    """
-    Lecture CSV avec nettoyage:
-    - supprime espaces en trop
-    - 'correct' -> normalisation
-    - 'subject' -> rapprochement /correction typo
-    - déduplication des questions identiques
-    - restructuration responseA/B/C/D -> liste "responses"
-    """
-    subjects_count: Dict[str, int] = {}
-    questions_cache: Dict[str, dict] = {}  # Cache pour détecter les doublons
-
-    with open(file_path, "r", encoding="utf-8", newline="") as file:
-        reader = csv.DictReader(file)
-        if not reader.fieldnames:
-            return
-
-        for row in reader:
-            # Nettoyage initial des colonnes
-            question = strip_or_none(row.get("question"))
-            if question:
-                question = standardize_question(
-                    question
-                )  # Standardisation de la question
-            subject = strip_or_none(row.get("subject"))
-            use = strip_or_none(row.get("use"))
-            correct = normalize_correct(row.get("correct"))
-            responseA = strip_or_none(row.get("responseA"))
-            responseB = strip_or_none(row.get("responseB"))
-            responseC = strip_or_none(row.get("responseC"))
-            responseD = strip_or_none(row.get("responseD"))
-            remark = strip_or_none(row.get("remark"))
-
-            # Ignorer les lignes sans question
-            if not question:
-                continue
-
-            # Création de la clé pour détecter les doublons (basée uniquement sur la question)
-            question_key = create_question_key(question or "")
-
-            # Correction du subject si activée
-            if fix_subjects and subject:
-                canon = canonicalize_subject(
-                    subject, subjects_count, seuil=subject_seuil
-                )
-                subject = canon
-                subjects_count[canon] = subjects_count.get(canon, 0) + 1
-
-            # Création des listes de réponses et corrects pour cette ligne
-            liste_reponses = []
-            liste_corrects = []
-
-            # Mapping des réponses avec leurs labels
-            response_mapping = {
-                "A": responseA,
-                "B": responseB,
-                "C": responseC,
-                "D": responseD,
-            }
-
-            # Construction de la liste des réponses
-            for label in ["A", "B", "C", "D"]:
-                response_text = response_mapping[label]
-                if response_text:
-                    liste_reponses.append(response_text)
-
-            # Construction de la liste des textes corrects
-            for correct_label in correct:
-                if (
-                    correct_label in response_mapping
-                    and response_mapping[correct_label]
-                ):
-                    liste_corrects.append(response_mapping[correct_label])
-
-            # Vérification des doublons
-            if question_key in questions_cache:
-                existing_question = questions_cache[question_key]
-                existing_reponses = existing_question.get("responses", [])
-                existing_corrects = existing_question.get("corrects", [])
-
-                # Fusion des réponses et corrects
-                merged_reponses, merged_corrects = merge_responses_and_corrects(
-                    existing_reponses,
-                    liste_reponses,
-                    existing_corrects,
-                    liste_corrects,
-                )
-
-                # Mise à jour de la question existante
-                questions_cache[question_key]["responses"] = merged_reponses
-                questions_cache[question_key]["corrects"] = merged_corrects
-
-                print(
-                    f"Question fusionnée: {question[:30]}... | Réponses:{len(merged_reponses)}"
+    rows = normalized_rows(
+        read_chunks(source, processor, skip, args.chunk_size), args.workers, args.lsh
+    )
+    started = time.perf_counter()
+    writers = ThreadPoolExecutor(max_workers=max(args.writers, 1))
+    # lots en cours d'écriture, dans l'ordre du fichier
+    pending: Deque[Tuple[Future, Dict[str, Any]]] = deque()
+    try:
+        for keys, batch, _ in processor.iter_batches(
+            _keep_bands(rows), args.batch_size, normalized=True
+        ):
+            created_at = datetime.now(ZoneInfo("Europe/Paris")).replace(microsecond=0)
+            questions = [
+                Question(
+                    **question.model_dump(),
+                    created_by=args.created_by,
+                    created_at=created_at,
+                    question_key_hash=processor.key_hash(key),
+                    minhash_bands=bands.pop(key, []),
                 )
+                for key, question in zip(keys, batch)
+            ]
+            if collection is None:
                 continue
-
-            # Création du document final
-            cleaned_row = {
-                "question": question,
-                "subject": [subject] if subject else [],
-                "use": [use] if use else [],
-                "responses": liste_reponses,
-                "corrects": liste_corrects,
-                "remark": remark,
+            state = {
+                "stats": processor.get_stats(),
+                "subjects_count": dict(processor.subjects_count),
             }
-
-            # Mise en cache
-            questions_cache[question_key] = cleaned_row
-
-    # Retour des questions uniques
-    for question_data in questions_cache.values():
-        yield question_data
-
-
-# --- Connexion MongoDB ---
-def make_mongo_client() -> MongoClient:
-    """
-    Construit un client MongoDB à partir des variables d'environnement.
-    Utilise l'auth si user/password fournis, sinon connexion simple host:port.
-    """
-    host = MONGO_HOST
-    port = MONGO_PORT
-
-    # if MONGO_USERNAME and MONGO_PASSWORD:
-    #    uri = f"mongodb://{MONGO_USERNAME}:{MONGO_PASSWORD}@{host}:{port}"
-    # else:
-    uri = f"mongodb://{host}:{port}"
-
-    return MongoClient(uri, serverSelectionTimeoutMS=8000)
-
-
-# --- Insertions par lots ---
-def insert_documents(collection, documents: Iterator[dict]) -> int:
-    """
-    Insère les documents par lots.
-    Retourne le nombre total inséré.
-    """
-    batch = []
-    total_inserted = 0
-
-    def flush_batch():
-        nonlocal batch, total_inserted
-        if not batch:
-            return
-        try:
-            result = collection.insert_many(batch, ordered=False)
-            total_inserted += len(result.inserted_ids)
-        except BulkWriteError as bwe:
-            ok = bwe.details.get("nInserted", 0)
-            total_inserted += ok
-            print(
-                f"BulkWriteError: {ok} insérés avant erreur, détails resumés: {bwe.details.get('writeErrors', [])[:3]}"
-            )
-        finally:
-            batch = []
-
-    for doc in documents:
-        batch.append(doc)
-        if len(batch) >= BATCH_SIZE:
-            flush_batch()
-
-    flush_batch()
-    return total_inserted
+            future = writers.submit(write_batch, collection, questions, args.lsh)
+            pending.append((future, state))
+            # avancement enregistré pour les lots écrits en tête de file
+            while pending and (
+                pending[0][0].done() or len(pending) > 2 * args.writers
+            ):
+                _commit(pending.popleft())
+        while pending:
+            _commit(pending.popleft())
+    except BaseException:
+        writers.shutdown(wait=True, cancel_futures=True)
+        raise
+    writers.shutdown()
+    elapsed = time.perf_counter() - started
+
+    if collection is not None and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    rows_done = processor.stats["total_rows"] - skip
+    return {
+        **processor.get_stats(),
+        **totals,
+        "subjects": len(processor.subjects_count),
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(rows_done / elapsed) if elapsed else None,
+    }
 
 
 # --- Programme principal ---
 def populate_mongo():
-    print(f"Source CSV: {CSV_SOURCE}")
+    args = _parse_args()
+    print(f"Source CSV: {args.source}")
     print(f"DB: {DB_NAME} / Collection: {COLLECTION_NAME}")
-    print(f"Batch size: {BATCH_SIZE}")
-    if SUBJECT_FIX_ENABLED:
-        print(f"Correction de 'subject' activée (seuil={SUBJECT_SEUIL:.2f})")
+    print(
+        f"Batch size: {args.batch_size} / processus: {args.workers} / "
+        f"écritures concurrentes: {args.writers} / "
+        f"clés LSH: {'oui' if args.lsh else 'non (--no-lsh)'}"
+    )
+    if args.fix_subjects:
+        print(f"Correction de 'subject' activée (seuil={args.subject_threshold:.2f})")
     else:
         print("Correction de 'subject' désactivée")
 
+    client = None
     try:
-        client = make_mongo_client()
-        client.admin.command("ping")
-
-        db = client[DB_NAME]
-        collection = db[COLLECTION_NAME]
-
-        documents = read_csv_rows(
-            CSV_SOURCE,
-            fix_subjects=SUBJECT_FIX_ENABLED,
-            subject_seuil=SUBJECT_SEUIL,
+        collection = None
+        if not args.dry_run:
+            client = make_mongo_client(args.writers)
+            client.admin.command("ping")
+            collection = client[DB_NAME][COLLECTION_NAME]
+            ensure_indexes(collection)
+
+        report = load(args, collection)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        print(
+            f"Terminé. {report['inserted']} documents insérés, "
+            f"{report['merged_existing']} fusionnés "
+            f"({report['rows_per_second']} lignes/s)."
         )
 
-        total = insert_documents(collection, documents)
-        print(f"Terminé. {total} documents insérés.")
-
     except FileNotFoundError:
-        print(f"Fichier CSV introuvable: {CSV_SOURCE}")
+        print(f"Fichier CSV introuvable: {args.source}")
         sys.exit(1)
     except ServerSelectionTimeoutError as e:
         print("Connexion MongoDB impossible (timeout).")
         print(str(e))
         sys.exit(2)
-    except Exception as e:
-        print(f"Erreur: {e}")
+    except (Exception, KeyboardInterrupt) as e:
+        print(f"Erreur: {e!r}")
+        if not args.dry_run and os.path.exists(args.checkpoint):
+            print(
+                f"Avancement enregistré dans {args.checkpoint} : "
+                "relancer pour reprendre"
+            )
         sys.exit(3)
     finally:
-        try:
+        if client is not None:
             client.close()
-        except Exception:
-            pass
 
 
 if __name__ == "__main__":
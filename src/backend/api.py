@@ -1,15 +1,36 @@
 from contextlib import asynccontextmanager
+import logging
+import os
+import time
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 from typing import Dict, Any
 from datetime import datetime
 
+try:
+    import resource
+except ImportError:  # Windows : pas de getrusage
+    resource = None
+
 from routers import questions
 from routers import auth
 from routers import questionnaires
+from routers import admin
+from routers import import_jobs
+from services.csv_import_service import shutdown_parse_pool
+from services.import_job_service import import_job_service
 from utils.mg_database import database
+from utils.sq_database import sqlite_pool
+from utils.metrics import MetricsMiddleware, registry
+from utils.logger import RequestIdMiddleware, setup_logging
+from utils.profiling import PROFILING_ENABLED, ProfilingMiddleware
+from utils.loop_monitor import LOOP_MONITOR_ENABLED, loop_monitor
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
 
 class QuizAPI:
@@ -20,22 +41,25 @@ class QuizAPI:
 
     def __init__(self):
         self.app = None
+        self.started_at = time.time()
 
     def startup(self):
         """
         Initialisation de l'application au démarrage (version synchrone).
         """
-        print("Démarrage de l'application...")
+        logger.info("Démarrage de l'application...")
+        self.started_at = time.time()
         database.init_db()
-        print("Application initialisée")
+        logger.info("Application initialisée")
 
     def shutdown(self):
         """
         Nettoyage de l'application à l'arrêt (version synchrone).
         """
-        print("Arrêt de l'application...")
+        logger.info("Arrêt de l'application...")
         database.close_db()
-        print("Application fermée")
+        sqlite_pool.close_all()
+        logger.info("Application fermée")
 
     @asynccontextmanager
     async def lifespan(self, app: FastAPI):
@@ -45,8 +69,19 @@ class QuizAPI:
         """
         try:
             self.startup()
+            if LOOP_MONITOR_ENABLED:
+                loop_monitor.start()
+            try:
+                interrupted = await import_job_service.recover()
+                if interrupted:
+                    logger.warning("%d import(s) interrompu(s) repérés", interrupted)
+            except Exception as e:
+                logger.warning("Reprise des tâches d'import impossible: %s", e)
             yield
         finally:
+            await import_job_service.shutdown()
+            shutdown_parse_pool()
+            await loop_monitor.stop()
             self.shutdown()
 
     def create_app(self) -> FastAPI:
@@ -72,6 +107,14 @@ class QuizAPI:
             allow_headers=["*"],
         )
 
+        # Profilage à la demande : installé seulement s'il est activé
+        if PROFILING_ENABLED:
+            app.add_middleware(ProfilingMiddleware)
+
+        # Identifiant de requête des logs, puis mesures par route (le plus externe)
+        app.add_middleware(RequestIdMiddleware)
+        app.add_middleware(MetricsMiddleware)
+
         self._setup_exception_handlers(app)
 
         self._setup_base_routes(app)
@@ -101,7 +144,7 @@ class QuizAPI:
 
         @app.exception_handler(Exception)
         async def general_exception_handler(request, exc: Exception):
-            print(f"Erreur non gérée: {exc}")
+            logger.error("Erreur non gérée: %s", exc, exc_info=exc)
             return JSONResponse(
                 status_code=500,
                 content={
@@ -128,6 +171,52 @@ class QuizAPI:
                 "database": "pymongo",
             }
 
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics() -> PlainTextResponse:
+            """Métriques du worker au format texte Prometheus."""
+            return PlainTextResponse(
+                registry.render(), media_type="text/plain; version=0.0.4"
+            )
+
+        @app.get("/health", summary="Vivacité du worker", tags=["Système"])
+        async def health() -> JSONResponse:
+            """
+            Sonde de vivacité : le worker répond (boucle d'événements libre).
+            Indépendante de MongoDB : le lanceur de production ne relance
+            l'API que sur cette sonde, une panne de la base ne doit pas
+            interrompre les workers ni leurs imports en arrière-plan.
+            `cpu_s` et `max_rss_kb` sont absents hors Unix.
+            """
+            content = {
+                "status": "ok",
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started_at, 1),
+            }
+            if resource is not None:
+                usage = resource.getrusage(resource.RUSAGE_SELF)
+                content["cpu_s"] = round(usage.ru_utime + usage.ru_stime, 2)
+                content["max_rss_kb"] = usage.ru_maxrss
+            return JSONResponse(content=content)
+
+        @app.get("/ready", summary="Disponibilité du worker", tags=["Système"])
+        async def ready() -> JSONResponse:
+            """
+            Sonde de disponibilité : connexion MongoDB (503 si indisponible),
+            pour retirer le worker d'un répartiteur de charge sans le relancer.
+            """
+            try:
+                mongo_ok = await run_in_threadpool(database.ping)
+            except Exception:
+                mongo_ok = False
+            return JSONResponse(
+                status_code=200 if mongo_ok else 503,
+                content={
+                    "status": "ok" if mongo_ok else "degraded",
+                    "pid": os.getpid(),
+                    "mongo": mongo_ok,
+                },
+            )
+
     def _setup_routers(self, app: FastAPI):
         """
         Configure les routers de l'application.
@@ -135,12 +224,14 @@ class QuizAPI:
         app.include_router(questions.router, tags=["Questions"])
         app.include_router(questionnaires.router, tags=["Questionnaires"])
         app.include_router(auth.router, tags=["Auth"])
+        app.include_router(admin.router, tags=["Admin"])
+        app.include_router(import_jobs.router, tags=["Questions"])
 
     def run(self):
         """
         Lance l'application en mode développement.
         """
-        print("Démarrage en mode développement avec PyMongo")
+        logger.info("Démarrage en mode développement avec PyMongo")
         uvicorn.run(
             self.app,
             host="0.0.0.0",
@@ -0,0 +1,59 @@
+"""
+Migration ponctuelle : calcule `question_key_hash` (empreinte de l'intitulé
+normalisé, index unique) des questions qui n'en ont pas, c'est-à-dire créées
+avant son introduction ou insérées directement en base. À lancer une fois
+après la mise à jour, hors du démarrage de l'API (configuration `.env` de
+l'API), depuis `backend/` :
+
+    python backfill_question_keys.py
+    python backfill_question_keys.py --retry-duplicates
+
+Les questions sont parcourues des plus anciennes aux plus récentes. Si des
+doublons sont déjà en base, seule la plus ancienne reçoit l'empreinte ; les
+autres sont marquées `question_key_duplicate` (empreinte de la question
+qu'elles doublent, pour les retrouver) et ne sont plus reprises par les
+lancements suivants. Après fusion ou suppression de ces doublons,
+`--retry-duplicates` les reprend.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from services.question_service import QuestionService
+from utils.mg_database import Database
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--retry-duplicates",
+        action="store_true",
+        help="Reprend aussi les doublons marqués lors d'un lancement précédent",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_args()
+    Database.init_db()
+    started = time.perf_counter()
+    keyed, duplicates = asyncio.run(
+        QuestionService().ensure_question_keys(
+            batch_size=args.batch_size, retry_duplicates=args.retry_duplicates
+        )
+    )
+    print(
+        f"Empreintes calculées : {keyed} questions, {duplicates} doublons marqués "
+        f"en {time.perf_counter() - started:.1f} s",
+        file=sys.stderr,
+    )
+    Database.close_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark du coût par requête de la dépendance `get_current_user`.
+
+Compare la vérification complète du JWT (HMAC + décodage + validation Pydantic)
+au chemin servi par le cache des tokens vérifiés.
+
+Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_auth --iterations 20000
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from utils.auth_dependencies import get_current_user, token_cache
+from utils.security import create_access_token
+
+
+def _make_credentials() -> HTTPAuthorizationCredentials:
+    token = create_access_token(
+        subject="bench@example.com",
+        claims={
+            "id": 1,
+            "name": "bench",
+            "email": "bench@example.com",
+            "role": "teacher",
+        },
+    )
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+async def _run(iterations: int, cached: bool) -> float:
+    """Retourne le coût moyen d'un appel en microsecondes."""
+    credentials = _make_credentials()
+    token_cache.clear()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if not cached:
+            token_cache.clear()
+        await get_current_user(credentials)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    uncached = asyncio.run(_run(args.iterations, cached=False))
+    cached = asyncio.run(_run(args.iterations, cached=True))
+
+    print(f"Itérations            : {args.iterations}")
+    print(f"Sans cache (µs/appel) : {uncached:8.2f}")
+    print(f"Avec cache (µs/appel) : {cached:8.2f}")
+    print(f"Gain                  : x{uncached / cached:.1f}")
+    print(f"Statistiques du cache : {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark de `AuthService.register` et `AuthService.login` à différents
+niveaux de concurrence (1, 16, 64 par défaut), sur une base SQLite temporaire.
+
+Le coût de bcrypt peut être réduit (`--bcrypt-rounds 4`) pour isoler
+l'accès à la base. Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_auth_sqlite --users 256 --levels 1 16 64
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import List
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=256)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    return parser.parse_args()
+
+
+async def _bounded(concurrency: int, coros) -> List[float]:
+    """Exécute les coroutines avec au plus `concurrency` en parallèle."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def _one(coro):
+        async with semaphore:
+            start = time.perf_counter()
+            result = await coro
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not result or result == (None, None):
+                raise RuntimeError("Échec de l'opération d'authentification")
+
+    await asyncio.gather(*(_one(c) for c in coros))
+    return latencies
+
+
+async def _run_level(level: int, users: int) -> None:
+    from benchmarks.stats import format_summary, summarize
+    from schemas.user import UserCreate
+    from services.auth_service import AuthService
+
+    password = "Bench123*"
+    names = [f"bench_{level}_{i}" for i in range(users)]
+
+    start = time.perf_counter()
+    register = await _bounded(
+        level,
+        [
+            AuthService.register(
+                UserCreate(name=n, email=f"{n}@example.com", password=password)
+            )
+            for n in names
+        ],
+    )
+    register_rate = users / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    login = await _bounded(level, [AuthService.login(n, password) for n in names])
+    login_rate = users / (time.perf_counter() - start)
+
+    print(f"--- concurrence {level}")
+    print(format_summary(f"register ({register_rate:.0f}/s)", summarize(register)))
+    print(format_summary(f"login ({login_rate:.0f}/s)", summarize(login)))
+
+
+def main():
+    args = _parse_args()
+    # Base et coût bcrypt configurés avant l'import des modules du backend
+    os.environ["SQLITE_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+
+    from utils.sq_database import sqlite_pool
+
+    async def _run_all():
+        for level in args.levels:
+            await _run_level(level, args.users)
+
+    try:
+        asyncio.run(_run_all())
+    finally:
+        sqlite_pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
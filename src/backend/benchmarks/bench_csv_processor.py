@@ -0,0 +1,339 @@
+"""
+Microbenchmarks de `CSVQuestionProcessor` (code Python pur exécuté par ligne).
+
+Fonctions mesurées, sur des données de `bdd/generate_questions.py`
+(mêmes taux de doublons et de fautes de frappe que le générateur) :
+
+- normalize_text            : un texte de question
+- similarity                : une paire de sujets
+- minhash_keys              : clés LSH d'un intitulé (quasi-doublons)
+- canonicalize_subject      : sujet connu (hit) / sujet avec faute (scan complet),
+                              pour 8, 50 et 200 sujets connus
+- _merge_duplicate_question : fusion dans un cache de 10 000 questions
+- _process_csv_row          : lignes d'un CSV de 1k / 10k / 50k lignes
+- process_csv_content       : CSV complet (parsing + QuestionCreate)
+
+Chaque cas est calibré (au moins `--min-time` s par mesure) puis répété
+`--rounds` fois ; le minimum (le moins bruité) sert de référence. `--save` enregistre une
+base de comparaison ; `--compare` signale les cas plus lents que la base
+de plus de `--threshold` % et termine avec le code 1 (utilisable en CI).
+
+`--check` vérifie d'abord que `canonicalize_subject` (mémorisation des
+meilleurs sujets par sujet brut) donne le même résultat que le parcours
+complet des sujets connus qu'il remplace : mêmes questions, sujets et
+statistiques sur des CSV de `--sizes` lignes pour `--subjects` sujets ;
+termine avec le code 1 en cas d'écart.
+Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_csv_processor --save
+    python -m benchmarks.bench_csv_processor --compare
+    python -m benchmarks.bench_csv_processor --only canonicalize --sizes 1000
+    python -m benchmarks.bench_csv_processor --check --sizes 50000 --rounds 1
+"""
+
+import argparse
+import csv
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from utils.csv_processor import CSVQuestionProcessor
+from utils.minhash import minhasher
+
+# `bdd/` pour réutiliser le générateur de banques synthétiques
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "bdd"))
+
+from generate_questions import (  # noqa: E402
+    CSV_HEADER,
+    QuestionGenerator,
+    build_subjects,
+    typo,
+)
+
+BASELINE_PATH = Path(__file__).resolve().parent / "results" / "csv_processor.json"
+
+
+class Case(NamedTuple):
+    name: str
+    run: Callable[[], None]
+    # unités traitées par appel (lignes, questions...) pour le débit
+    units: int = 1
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--subjects", type=int, nargs="+", default=[8, 50, 200])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--only", help="Ne lance que les cas dont le nom contient")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--save",
+        nargs="?",
+        const=BASELINE_PATH,
+        type=Path,
+        help="Enregistre les résultats comme base de comparaison",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const=BASELINE_PATH,
+        type=Path,
+        help="Compare à une base enregistrée",
+    )
+    parser.add_argument("--threshold", type=float, default=10.0)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Vérifie canonicalize_subject contre le parcours complet",
+    )
+    return parser.parse_args()
+
+
+def _csv_rows(rows: int, subjects: int, seed: int) -> List[Dict[str, str]]:
+    generator = QuestionGenerator(
+        argparse.Namespace(
+            seed=seed,
+            subjects=subjects,
+            subject_skew=1.0,
+            uses="Test de validation:0.45,Test de positionnement:0.35,"
+            "Total Bootcamp:0.20",
+            duplicate_rate=0.05,
+            near_duplicate_rate=0.03,
+            typo_rate=0.02,
+            pool_size=10000,
+        )
+    )
+    return list(generator.rows(rows))
+
+
+def _csv_text(rows: List[Dict[str, str]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_HEADER)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+class _FullScanProcessor(CSVQuestionProcessor):
+    """Référence : parcours complet des sujets connus à chaque appel."""
+
+    def canonicalize_subject(self, subject: str) -> Tuple[str, bool]:
+        if not subject or not self.subjects_count:
+            return subject, False
+
+        if subject in self.subjects_count:
+            return subject, False
+
+        best_subject = None
+        best_score = 0.0
+
+        for s in self.subjects_count.keys():
+            score = self.similarity(subject, s)
+            if score > best_score:
+                best_score = score
+                best_subject = s
+
+        if best_subject and best_score >= self.subject_threshold:
+            return best_subject, True
+        return subject, False
+
+
+def check_canonicalize(args) -> List[str]:
+    """Écarts entre `canonicalize_subject` et la référence (liste vide si aucun)"""
+    mismatches = []
+    for count in args.subjects:
+        for size in args.sizes:
+            rows = _csv_rows(size, count, args.seed)
+            current, reference = CSVQuestionProcessor(), _FullScanProcessor()
+            for row in rows:
+                current._process_csv_row(row)
+                reference._process_csv_row(row)
+            same = (
+                current.questions_cache == reference.questions_cache
+                and current.subjects_count == reference.subjects_count
+                and current.stats == reference.stats
+            )
+            label = f"canonicalize_subject[{size} lignes,{count} sujets]"
+            print(
+                f"{label:<46} {'identique' if same else 'ÉCART'} "
+                f"({current.stats['subject_corrections']} corrections)"
+            )
+            if not same:
+                mismatches.append(label)
+    return mismatches
+
+
+def build_cases(args) -> List[Case]:
+    rng = random.Random(args.seed)
+    sample = _csv_rows(2000, 8, args.seed)
+    question = sample[0]["question"]
+    cases: List[Case] = []
+    processor = CSVQuestionProcessor()
+
+    cases.append(Case("normalize_text", lambda: processor.normalize_text(question)))
+    cases.append(
+        Case(
+            "similarity",
+            lambda: processor.similarity("Systèmes distribués", "Sytèmes distribués"),
+        )
+    )
+
+    cases.append(Case("minhash_keys", lambda: minhasher.keys(question)))
+
+    for count in args.subjects:
+        subjects = build_subjects(count)
+        known = CSVQuestionProcessor()
+        known.subjects_count = {subject: 1 for subject in subjects}
+        hit = subjects[-1]
+        miss = typo(rng, subjects[-1])
+        cases.append(
+            Case(
+                f"canonicalize_subject[hit,{count} sujets]",
+                lambda known=known, hit=hit: known.canonicalize_subject(hit),
+            )
+        )
+        cases.append(
+            Case(
+                f"canonicalize_subject[typo,{count} sujets]",
+                lambda known=known, miss=miss: known.canonicalize_subject(miss),
+            )
+        )
+
+    filled = CSVQuestionProcessor()
+    for row in _csv_rows(10000, 8, args.seed):
+        filled._process_csv_row(row)
+    key = next(iter(filled.questions_cache))
+    existing = filled.questions_cache[key]
+    new_responses = existing["responses"][:2] + ["Proposition complémentaire"]
+    new_corrects = existing["corrects"][:1]
+    cases.append(
+        Case(
+            "_merge_duplicate_question[10000 en cache]",
+            lambda: filled._merge_duplicate_question(
+                key, list(new_responses), list(new_corrects)
+            ),
+        )
+    )
+
+    for size in args.sizes:
+        rows = _csv_rows(size, 8, args.seed)
+        text = _csv_text(rows)
+
+        def _rows(rows=rows):
+            fresh = CSVQuestionProcessor()
+            for row in rows:
+                fresh._process_csv_row(row)
+
+        cases.append(Case(f"_process_csv_row[{size} lignes]", _rows, size))
+        cases.append(
+            Case(
+                f"process_csv_content[{size} lignes]",
+                lambda text=text: CSVQuestionProcessor().process_csv_content(text),
+                size,
+            )
+        )
+
+    if args.only:
+        cases = [case for case in cases if args.only in case.name]
+    return cases
+
+
+def measure(case: Case, rounds: int, min_time: float) -> Dict[str, float]:
+    """Temps par appel (µs) : médiane, min, écart-type, et débit en unités/s."""
+    timer = timeit.Timer(case.run)
+    number, elapsed = timer.autorange()
+    while elapsed < min_time:
+        number *= 2
+        elapsed = timer.timeit(number)
+    per_call = [t / number * 1e6 for t in timer.repeat(repeat=rounds, number=number)]
+    median = statistics.median(per_call)
+    return {
+        "median_us": round(median, 3),
+        "min_us": round(min(per_call), 3),
+        "stdev_us": round(statistics.pstdev(per_call), 3),
+        "calls_per_round": number,
+        "units_per_second": round(case.units / median * 1e6, 1),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline_path: Path, threshold: float
+) -> List[str]:
+    """Affiche l'écart à la base ; retourne les cas en régression."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    regressions = []
+    print(f"\nComparaison avec {baseline_path} (seuil {threshold:g} %) :")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        delta = (result["min_us"] / before["min_us"] - 1) * 100
+        flag = ""
+        if delta > threshold:
+            flag = "  RÉGRESSION"
+            regressions.append(name)
+        elif delta < -threshold:
+            flag = "  amélioration"
+        print(f"{name:<46} {delta:+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    args = _parse_args()
+    if args.check:
+        print("Vérification de canonicalize_subject...")
+        if check_canonicalize(args):
+            sys.exit(1)
+
+    print("Préparation des données...")
+    cases = build_cases(args)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for case in cases:
+        results[case.name] = measure(case, args.rounds, args.min_time)
+        result = results[case.name]
+        rate = (
+            f"{result['units_per_second']:12,.0f} lignes/s" if case.units > 1 else ""
+        )
+        print(
+            f"{case.name:<46} min {result['min_us']:12.2f} µs  "
+            f"médiane {result['median_us']:12.2f} µs{rate}"
+        )
+
+    regressions = []
+    if args.compare:
+        if not args.compare.exists():
+            sys.exit(f"Base introuvable : {args.compare} (lancer avec --save)")
+        regressions = compare(results, args.compare, args.threshold)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "meta": {
+                "saved_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "host": platform.node(),
+                "rounds": args.rounds,
+            },
+            "results": results,
+        }
+        args.save.write_text(json.dumps(report, indent=2, ensure_ascii=False), "utf-8")
+        print(f"\nBase enregistrée dans {args.save}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Comparaison des deux modes de déploiement lancés par `main.py` :
+
+- split   : deux process (API sur :8000, Flask sur :5005, auth via HTTP local)
+- unified : un seul process sur :8000 (Flask monté dans FastAPI, auth en direct)
+
+Pour chaque mode : temps de démarrage (jusqu'à ce que l'API et la page de
+connexion répondent), mémoire résidente des process serveurs (lue dans
+`/proc`, Linux uniquement) et latence du formulaire `POST /login` de l'interface.
+Les deux modes utilisent une base SQLite temporaire ; MongoDB doit être joignable.
+
+Le coût de bcrypt est réduit par défaut (`--bcrypt-rounds 4`) pour que la
+latence mesurée reflète surtout le saut réseau. Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_layouts --logins 200
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+
+from benchmarks.stats import format_summary, summarize
+
+SRC_DIR = Path(__file__).resolve().parents[2]
+API_URL = "http://localhost:8000"
+UI_URLS = {"split": "http://localhost:5005", "unified": "http://localhost:8000"}
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modes", nargs="+", default=["split", "unified"])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    return parser.parse_args()
+
+
+def _children(pid: int) -> List[int]:
+    """PIDs des descendants d'un process (via /proc/<pid>/task/*/children)."""
+    found: List[int] = []
+    task_dir = Path(f"/proc/{pid}/task")
+    if not task_dir.exists():
+        return found
+    for task in task_dir.iterdir():
+        try:
+            content = (task / "children").read_text().split()
+        except OSError:
+            continue
+        for child in map(int, content):
+            found.append(child)
+            found.extend(_children(child))
+    return found
+
+
+def _rss_kb(pid: int) -> int:
+    """Mémoire résidente (VmRSS) d'un process, en Ko."""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _wait_ready(urls: List[str], timeout: float) -> bool:
+    """Attend que toutes les URL répondent (code < 500)."""
+    deadline = time.monotonic() + timeout
+    pending = list(urls)
+    while pending and time.monotonic() < deadline:
+        try:
+            if requests.get(pending[0], timeout=1).status_code < 500:
+                pending.pop(0)
+                continue
+        except requests.RequestException:
+            pass
+        time.sleep(0.05)
+    return not pending
+
+
+def _measure_logins(ui_url: str, count: int) -> List[float]:
+    """Latences du formulaire de connexion de l'interface, en ms."""
+    name, password = "bench_layout", "Pass123*"
+    requests.post(
+        f"{API_URL}/api/auth/register",
+        json={"name": name, "email": f"{name}@example.com", "password": password},
+        timeout=30,
+    )
+
+    latencies: List[float] = []
+    with requests.Session() as http:
+        for _ in range(count):
+            start = time.perf_counter()
+            response = http.post(
+                f"{ui_url}/login",
+                data={"name": name, "password": password},
+                allow_redirects=False,
+                timeout=30,
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 302:
+                raise RuntimeError(f"Connexion refusée ({response.status_code})")
+    return latencies
+
+
+def run_mode(mode: str, args, db_path: str) -> Dict[str, object]:
+    env = {
+        **os.environ,
+        "PYTHONUNBUFFERED": "1",
+        "SQLITE_DB_PATH": db_path,
+        "BCRYPT_ROUNDS": str(args.bcrypt_rounds),
+    }
+    start = time.perf_counter()
+    launcher = subprocess.Popen(
+        [sys.executable, "main.py", "--mode", mode],
+        cwd=SRC_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        ui_url = UI_URLS[mode]
+        ready_urls = [f"{API_URL}/docs", f"{ui_url}/login"]
+        if not _wait_ready(ready_urls, args.startup_timeout):
+            raise RuntimeError(f"Le mode {mode} n'a pas démarré à temps")
+        startup = time.perf_counter() - start
+
+        latencies = _measure_logins(ui_url, args.logins)
+        servers = _children(launcher.pid)
+        rss_mb = sum(_rss_kb(pid) for pid in servers) / 1024
+        return {
+            "startup_s": startup,
+            "processes": len(servers),
+            "rss_mb": rss_mb,
+            "login": summarize(latencies),
+        }
+    finally:
+        launcher.send_signal(signal.SIGTERM)
+        try:
+            launcher.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            launcher.kill()
+
+
+def main():
+    args = _parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench_layouts.db")
+        for mode in args.modes:
+            result = run_mode(mode, args, db_path)
+            print(
+                f"{mode:<8} démarrage={result['startup_s']:.2f}s "
+                f"process={result['processes']} rss={result['rss_mb']:.1f}Mo"
+            )
+            print(format_summary(f"  POST /login ({mode})", result["login"]))
+
+
+if __name__ == "__main__":
+    main()
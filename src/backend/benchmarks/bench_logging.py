@@ -0,0 +1,123 @@
+"""
+Coût de la journalisation sur le chemin d'insertion d'une question.
+
+Plusieurs threads (comme les workers d'exécuteur des repositories) émettent
+chacun N événements « question insérée » selon trois variantes :
+
+- print   : ancien comportement, écriture synchrone sur stdout
+- logger  : logger structuré (QueueHandler), chaque événement journalisé
+- sampled : logger structuré avec échantillonnage (LOG_SAMPLE_RATE)
+
+La sortie est redirigée vers un fichier temporaire ; `--write-latency-us`
+ajoute un délai à chaque écriture pour simuler une sortie lente (terminal,
+pilote de logs Docker). On mesure le temps passé dans les threads appelants
+(le formatage et l'écriture du logger ont lieu dans le thread d'arrière-plan).
+Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_logging --events 20000 --threads 8
+    python -m benchmarks.bench_logging --write-latency-us 50
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from bson import ObjectId
+
+from utils import logger as log_utils
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument(
+        "--sample-rate", type=float, default=log_utils.LOG_SAMPLE_RATE
+    )
+    parser.add_argument("--write-latency-us", type=float, default=0.0)
+    return parser.parse_args()
+
+
+class _SlowSink:
+    """Flux texte dont chaque écriture coûte un délai fixe (sortie lente)."""
+
+    def __init__(self, target, latency_s: float):
+        self.target = target
+        self.latency_s = latency_s
+        self._lock = threading.Lock()
+
+    def write(self, data: str) -> int:
+        with self._lock:
+            if self.latency_s:
+                time.sleep(self.latency_s)
+            return self.target.write(data)
+
+    def flush(self):
+        self.target.flush()
+
+
+def _run(threads: int, events: int, emit: Callable[[str], None]) -> float:
+    """Temps moyen par événement côté appelant, en microsecondes."""
+    barrier = threading.Barrier(threads)
+
+    def _worker():
+        ids = [str(ObjectId()) for _ in range(events)]
+        barrier.wait()
+        start = time.perf_counter()
+        for inserted_id in ids:
+            emit(inserted_id)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        elapsed = list(pool.map(lambda _: _worker(), range(threads)))
+    return sum(elapsed) / (threads * events) * 1e6
+
+
+def main():
+    args = _parse_args()
+    logger = logging.getLogger("bench.insert")
+
+    with tempfile.TemporaryFile("w") as target:
+        sink = _SlowSink(target, args.write_latency_us / 1e6)
+        stdout, sys.stdout = sys.stdout, sink
+        try:
+            log_utils.setup_logging(level="INFO", fmt="json")
+
+            def _print(inserted_id):
+                print(f"Question insérée avec l'ID: {inserted_id}")
+
+            def _log(inserted_id):
+                logger.info("Question insérée", extra={"question_id": inserted_id})
+
+            def _sampled(inserted_id):
+                if log_utils.sampled(args.sample_rate):
+                    logger.info(
+                        "Question insérée", extra={"question_id": inserted_id}
+                    )
+
+            results = {
+                "print": _run(args.threads, args.events, _print),
+                "logger": _run(args.threads, args.events, _log),
+                f"sampled ({args.sample_rate:g})": _run(
+                    args.threads, args.events, _sampled
+                ),
+            }
+            drain_start = time.perf_counter()
+            log_utils.stop_logging()
+            drain = time.perf_counter() - drain_start
+        finally:
+            sys.stdout = stdout
+
+    print(f"{args.threads} threads x {args.events} événements")
+    for label, per_event in results.items():
+        print(f"{label:<16} {per_event:8.2f} µs/événement (thread appelant)")
+    print(f"vidage de la file à l'arrêt : {drain * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Test de charge "rush de connexion du matin".
+
+Simule N connexions simultanées (une classe entière) sur `/api/auth/login`
+pendant qu'une sonde interroge en continu un autre endpoint (`GET /` par défaut).
+Affiche les latences p50/p95/p99 de la sonde pendant le rush, comparées à une
+mesure de référence sans connexion en cours.
+
+L'API doit être lancée au préalable. Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_login_rush --logins 300 --concurrency 50
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import requests
+
+from benchmarks.stats import format_summary, summarize
+
+
+def _ensure_user(base_url: str, name: str, password: str) -> None:
+    """Crée l'utilisateur de test s'il n'existe pas encore."""
+    requests.post(
+        f"{base_url}/api/auth/register",
+        json={"name": name, "email": f"{name}@example.com", "password": password},
+        timeout=10,
+    )
+
+
+def _probe(
+    base_url: str, path: str, stop: threading.Event, interval: float
+) -> List[float]:
+    """Interroge `path` en boucle et retourne les latences en ms."""
+    latencies: List[float] = []
+    with requests.Session() as http:
+        while not stop.is_set():
+            start = time.perf_counter()
+            http.get(f"{base_url}{path}", timeout=30)
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(interval)
+    return latencies
+
+
+def _login(base_url: str, name: str, password: str) -> float:
+    start = time.perf_counter()
+    response = requests.post(
+        f"{base_url}/api/auth/login",
+        json={"username": name, "password": password},
+        timeout=60,
+    )
+    response.raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+def _probe_for(
+    base_url: str, path: str, seconds: float, interval: float
+) -> List[float]:
+    stop = threading.Event()
+    timer = threading.Timer(seconds, stop.set)
+    timer.start()
+    return _probe(base_url, path, stop, interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--logins", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probe-path", default="/")
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--user", default="bench_rush")
+    parser.add_argument("--password", default="Bench123*")
+    args = parser.parse_args()
+
+    _ensure_user(args.base_url, args.user, args.password)
+
+    baseline = _probe_for(args.base_url, args.probe_path, 3.0, args.probe_interval)
+
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as probe_pool:
+        probe_future = probe_pool.submit(
+            _probe, args.base_url, args.probe_path, stop, args.probe_interval
+        )
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            login_latencies = list(
+                pool.map(
+                    lambda _: _login(args.base_url, args.user, args.password),
+                    range(args.logins),
+                )
+            )
+        rush_duration = time.perf_counter() - start
+        stop.set()
+        during_rush = probe_future.result()
+
+    print(
+        f"{args.logins} connexions en {rush_duration:.1f}s "
+        f"({args.logins / rush_duration:.1f} connexions/s)"
+    )
+    print(format_summary("login", summarize(login_latencies)))
+    print(format_summary(f"{args.probe_path} (référence)", summarize(baseline)))
+    print(format_summary(f"{args.probe_path} (pendant rush)", summarize(during_rush)))
+
+
+if __name__ == "__main__":
+    main()
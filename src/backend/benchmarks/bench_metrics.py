@@ -0,0 +1,96 @@
+"""
+Coût par requête du `MetricsMiddleware`.
+
+Une application FastAPI minimale (une route paramétrée) est appelée
+directement via l'interface ASGI, sans réseau, avec et sans le middleware ;
+la différence de temps moyen donne le surcoût par requête. Le temps de rendu
+de `/metrics` est mesuré à part. Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_metrics --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from utils.metrics import MetricsMiddleware, registry
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    return parser.parse_args()
+
+
+def _build_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def _call(app, item_id: int) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": f"/items/{item_id}",
+        "raw_path": f"/items/{item_id}".encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 12345),
+        "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def _run(app, count: int) -> float:
+    """Temps moyen par requête, en microsecondes."""
+    await _call(app, 0)  # démarrage de la pile de middlewares
+    start = time.perf_counter()
+    for i in range(count):
+        await _call(app, i)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+async def main():
+    args = _parse_args()
+    plain, measured = _build_app(False), _build_app(True)
+
+    best_plain = best_measured = float("inf")
+    for _ in range(args.rounds):
+        best_plain = min(best_plain, await _run(plain, args.requests))
+        best_measured = min(best_measured, await _run(measured, args.requests))
+
+    print(f"sans middleware   : {best_plain:8.1f} µs/requête")
+    print(f"avec middleware   : {best_measured:8.1f} µs/requête")
+    print(f"surcoût           : {best_measured - best_plain:8.1f} µs/requête")
+
+    start = time.perf_counter()
+    body = registry.render()
+    print(
+        f"rendu /metrics    : {(time.perf_counter() - start) * 1000:8.2f} ms "
+        f"({len(body.splitlines())} lignes)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
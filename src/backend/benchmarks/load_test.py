@@ -0,0 +1,442 @@
+"""
+Banc de charge reproductible de l'API.
+
+1. Amorçage : insère dans MongoDB (configuration `.env` de l'API) une banque
+   synthétique de questions actives, marquées `created_by = --user-id`.
+2. Authentification : un JWT de test (rôle TEACHER) est obtenu via
+   `/api/auth/test-token` ; un utilisateur SQLite est créé pour le scénario login.
+3. Charge : pour chaque scénario, `--concurrency` clients asyncio (httpx)
+   enchaînent les requêtes pendant `--duration` secondes.
+
+Scénarios :
+
+- list          : GET  /api/questions
+- get           : GET  /api/question/{id} (id tiré dans la banque amorcée)
+- full          : GET  /api/questionnaire/{id}/full
+- random_add    : PATCH /api/questionnaire/{id}/random (un questionnaire par client)
+- csv_import    : PUT  /api/questions/from_csv (`--csv-rows` lignes par fichier)
+- login         : POST /api/auth/login (coût bcrypt inclus)
+
+Pour chaque scénario : débit (req/s), erreurs et latences p50/p95/p99.
+Les résultats sont enregistrés en JSON (`--output`) ; `--compare` affiche
+l'écart avec un run précédent. L'API doit être lancée au préalable.
+Lancement depuis `backend/` :
+
+    python -m benchmarks.load_test --seed 5000 --duration 20 --concurrency 32
+    python -m benchmarks.load_test --scenarios list get --compare results/load_x.json
+    python -m benchmarks.load_test --cleanup
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.stats import format_summary, summarize
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+SUBJECTS = [
+    "Bases de données",
+    "Automation",
+    "Classification",
+    "Data Science",
+    "Docker",
+    "Machine Learning",
+    "Streaming de données",
+    "Systèmes distribués",
+]
+USES = ["Test de positionnement", "Test de validation", "Total Bootcamp"]
+LETTERS = ["A", "B", "C", "D"]
+
+CSV_HEADER = [
+    "question",
+    "subject",
+    "use",
+    "correct",
+    "responseA",
+    "responseB",
+    "responseC",
+    "responseD",
+    "remark",
+]
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=["list", "get", "full", "random_add", "csv_import", "login"],
+    )
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument(
+        "--seed", type=int, default=2000, help="Questions à amorcer (0 : aucune)"
+    )
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--user-id", type=int, default=990001)
+    parser.add_argument("--questionnaire-size", type=int, default=20)
+    parser.add_argument("--random-number", type=int, default=5)
+    parser.add_argument("--csv-rows", type=int, default=50)
+    parser.add_argument("--user", default="bench_load")
+    parser.add_argument("--password", default="Bench123*")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument(
+        "--cleanup",
+        action="store_true",
+        help="Supprime les questions et questionnaires de --user-id puis quitte",
+    )
+    return parser.parse_args()
+
+
+# ==================== AMORÇAGE ====================
+
+
+def _synthetic_question(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Question au format du CSV d'import (réponses A-D, lettres correctes)."""
+    subject = rng.choice(SUBJECTS)
+    responses = [f"Réponse {letter} de la question {index}" for letter in LETTERS]
+    corrects = sorted(rng.sample(LETTERS, rng.choice([1, 1, 1, 2])))
+    return {
+        "question": f"Question de charge n°{index} sur {subject.lower()} ?",
+        "subject": subject,
+        "use": rng.choice(USES),
+        "correct": ",".join(corrects),
+        "responseA": responses[0],
+        "responseB": responses[1],
+        "responseC": responses[2],
+        "responseD": responses[3],
+        "remark": "",
+    }
+
+
+def _to_document(row: Dict[str, str], user_id: int, now: datetime) -> Dict[str, Any]:
+    """Ligne CSV -> document Mongo, comme après un import."""
+    responses = [row[f"response{letter}"] for letter in LETTERS]
+    corrects = [
+        responses[LETTERS.index(letter)] for letter in row["correct"].split(",")
+    ]
+    return {
+        "question": row["question"],
+        "subject": [row["subject"]],
+        "use": [row["use"]],
+        "corrects": corrects,
+        "responses": responses,
+        "remark": row["remark"] or None,
+        "status": "active",
+        "created_by": user_id,
+        "created_at": now,
+        "edited_at": now,
+    }
+
+
+def seed_bank(count: int, user_id: int, rng_seed: int) -> List[str]:
+    """
+    Remplace la banque synthétique de `user_id` par `count` questions
+    et retourne leurs ids.
+    """
+    from utils.mg_database import Database
+
+    Database.init_db()
+    collection = Database.get_collection("questions")
+    collection.delete_many({"created_by": user_id})
+    if count <= 0:
+        return []
+
+    rng = random.Random(rng_seed)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    ids: List[str] = []
+    batch: List[Dict[str, Any]] = []
+    for index in range(count):
+        batch.append(_to_document(_synthetic_question(rng, index), user_id, now))
+        if len(batch) == 1000 or index == count - 1:
+            result = collection.insert_many(batch, ordered=False)
+            ids.extend(str(inserted) for inserted in result.inserted_ids)
+            batch = []
+    return ids
+
+
+def cleanup(user_id: int) -> Dict[str, int]:
+    from utils.mg_database import Database
+
+    Database.init_db()
+    return {
+        name: Database.get_collection(name)
+        .delete_many({"created_by": user_id})
+        .deleted_count
+        for name in ("questions", "questionnaires")
+    }
+
+
+def _csv_payload(rng: random.Random, rows: int) -> bytes:
+    """Fichier CSV d'import de `rows` questions inédites."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_HEADER)
+    writer.writeheader()
+    offset = rng.randrange(10**9)
+    for index in range(rows):
+        writer.writerow(_synthetic_question(rng, offset + index))
+    return buffer.getvalue().encode("utf-8")
+
+
+# ==================== AUTHENTIFICATION ====================
+
+
+async def _test_token(http: httpx.AsyncClient, user_id: int, user: str) -> str:
+    response = await http.post(
+        "/api/auth/test-token",
+        json={
+            "id": user_id,
+            "name": user,
+            "email": f"{user}@example.com",
+            "password": "unused",
+            "role": "teacher",
+        },
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _ensure_user(http: httpx.AsyncClient, name: str, password: str) -> None:
+    """Crée l'utilisateur du scénario login s'il n'existe pas encore."""
+    await http.post(
+        "/api/auth/register",
+        json={"name": name, "email": f"{name}@example.com", "password": password},
+    )
+
+
+# ==================== SCÉNARIOS ====================
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+async def _build_scenario(
+    name: str,
+    http: httpx.AsyncClient,
+    args,
+    ids: List[str],
+    rng: random.Random,
+) -> Request:
+    """Prépare les données d'un scénario et retourne la requête à répéter."""
+    if name == "list":
+        return lambda client, worker: client.get("/api/questions")
+
+    if name == "get":
+        if not ids:
+            raise SystemExit("Le scénario 'get' nécessite --seed > 0")
+        return lambda client, worker: client.get(f"/api/question/{rng.choice(ids)}")
+
+    if name in ("full", "random_add"):
+        if not ids:
+            raise SystemExit(f"Le scénario '{name}' nécessite --seed > 0")
+        questionnaires: List[str] = []
+        count = 1 if name == "full" else args.concurrency
+        for index in range(count):
+            picked = rng.sample(ids, min(args.questionnaire_size, len(ids)))
+            response = await http.put(
+                "/api/questionnaire",
+                json={
+                    "title": f"Charge {name} {index}",
+                    "subjects": SUBJECTS,
+                    "questions": [{"id": qid, "question": ""} for qid in picked],
+                },
+            )
+            response.raise_for_status()
+            questionnaires.append(response.json()["id"])
+        if name == "full":
+            return lambda client, worker: client.get(
+                f"/api/questionnaire/{questionnaires[0]}/full"
+            )
+        body = {"number": args.random_number, "subjects": rng.sample(SUBJECTS, 2)}
+        # un questionnaire par client : pas de contention sur le même document
+        return lambda client, worker: client.patch(
+            f"/api/questionnaire/{questionnaires[worker]}/random", json=body
+        )
+
+    if name == "csv_import":
+        return lambda client, worker: client.put(
+            "/api/questions/from_csv",
+            files={
+                "file": (
+                    "charge.csv",
+                    _csv_payload(rng, args.csv_rows),
+                    "text/csv",
+                )
+            },
+        )
+
+    if name == "login":
+        await _ensure_user(http, args.user, args.password)
+        return lambda client, worker: client.post(
+            "/api/auth/login",
+            json={"username": args.user, "password": args.password},
+        )
+
+    raise SystemExit(f"Scénario inconnu : {name}")
+
+
+async def _run_scenario(
+    http: httpx.AsyncClient,
+    request: Request,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> Dict[str, Any]:
+    """`concurrency` clients en boucle fermée ; la phase de chauffe est ignorée."""
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    start = time.perf_counter()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+
+    async def _worker(worker: int):
+        while True:
+            sent = time.perf_counter()
+            if sent >= deadline:
+                return
+            try:
+                response = await request(http, worker)
+                outcome = None if response.status_code < 400 else response.status_code
+            except httpx.HTTPError as e:
+                outcome = type(e).__name__
+            done = time.perf_counter()
+            if sent < measure_from:
+                continue
+            if outcome is None:
+                latencies.append((done - sent) * 1000)
+            else:
+                errors[str(outcome)] = errors.get(str(outcome), 0) + 1
+
+    await asyncio.gather(*(_worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - measure_from
+    summary = summarize(latencies)
+    summary.update(
+        {
+            "errors": sum(errors.values()),
+            "error_codes": errors,
+            "duration_s": round(elapsed, 3),
+            "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        }
+    )
+    return summary
+
+
+# ==================== RÉSULTATS ====================
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(current: Dict[str, Any], previous_path: Path) -> None:
+    previous = json.loads(previous_path.read_text(encoding="utf-8"))["scenarios"]
+    print(f"\nComparaison avec {previous_path.name} :")
+    for name, result in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+        rps_delta = (
+            (result["throughput_rps"] / before["throughput_rps"] - 1) * 100
+            if before["throughput_rps"]
+            else 0.0
+        )
+        p95_delta = (result["p95"] / before["p95"] - 1) * 100 if before["p95"] else 0.0
+        print(
+            f"{name:<12} débit {rps_delta:+6.1f}%  "
+            f"p95 {p95_delta:+6.1f}%  (p95 {before['p95']:.1f} -> {result['p95']:.1f} ms)"
+        )
+
+
+async def _main(args) -> Dict[str, Any]:
+    ids = (
+        await asyncio.to_thread(seed_bank, args.seed, args.user_id, args.random_seed)
+        if args.seed
+        else []
+    )
+    print(f"{len(ids)} questions amorcées (created_by={args.user_id})")
+    rng = random.Random(args.random_seed)
+
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=120, limits=limits
+    ) as http:
+        token = await _test_token(http, args.user_id, args.user)
+        http.headers["Authorization"] = f"Bearer {token}"
+
+        results: Dict[str, Any] = {}
+        for name in args.scenarios:
+            request = await _build_scenario(name, http, args, ids, rng)
+            results[name] = await _run_scenario(
+                http, request, args.concurrency, args.duration, args.warmup
+            )
+            print(
+                f"{format_summary(name, results[name])} "
+                f"{results[name]['throughput_rps']:8.1f} req/s "
+                f"erreurs={results[name]['errors']}"
+            )
+    return results
+
+
+def main():
+    args = _parse_args()
+    if args.cleanup:
+        print(f"Supprimés : {cleanup(args.user_id)}")
+        return
+
+    started_at = datetime.now(timezone.utc)
+    results = asyncio.run(_main(args))
+
+    report = {
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "commit": _git_commit(),
+            "base_url": args.base_url,
+            "python": platform.python_version(),
+            "host": platform.node(),
+            "seed": args.seed,
+            "random_seed": args.random_seed,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "csv_rows": args.csv_rows,
+        },
+        "scenarios": results,
+    }
+    output = args.output or RESULTS_DIR / (
+        f"load_{started_at.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), "utf-8")
+    print(f"\nRésultats enregistrés dans {output}")
+
+    if args.compare:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
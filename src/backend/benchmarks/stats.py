@@ -0,0 +1,37 @@
+"""
+Utilitaires statistiques communs aux benchmarks.
+"""
+
+from typing import Dict, List
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Percentile (interpolation linéaire) d'une liste de valeurs, p entre 0 et 100."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(latencies_ms: List[float]) -> Dict[str, float]:
+    """Résumé d'une série de latences en millisecondes."""
+    return {
+        "count": len(latencies_ms),
+        "min": min(latencies_ms, default=0.0),
+        "p50": percentile(latencies_ms, 50),
+        "p95": percentile(latencies_ms, 95),
+        "p99": percentile(latencies_ms, 99),
+        "max": max(latencies_ms, default=0.0),
+    }
+
+
+def format_summary(label: str, summary: Dict[str, float]) -> str:
+    """Ligne lisible pour l'affichage console."""
+    return (
+        f"{label:<28} n={summary['count']:<6} "
+        f"p50={summary['p50']:8.1f}ms p95={summary['p95']:8.1f}ms "
+        f"p99={summary['p99']:8.1f}ms max={summary['max']:8.1f}ms"
+    )
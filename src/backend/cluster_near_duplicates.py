@@ -0,0 +1,254 @@
+"""
+Regroupement hors ligne des quasi-doublons de la collection `questions`
+(configuration `.env` de l'API), à partir des clés MinHash/LSH de
+`utils/minhash.py` :
+
+1. calcul des clés `minhash_bands` des questions qui n'en ont pas encore
+   (questions antérieures, scripts de `bdd/`), par un pool de processus
+   (`--workers`) ; l'import en a besoin pour trouver les quasi-doublons en base ;
+2. seaux LSH : une agrégation MongoDB regroupe les questions par clé
+   (`$unwind` + `$group`, sur disque si besoin) ; seules les paires partageant
+   un seau sont comparées, le coût reste proportionnel au nombre de questions ;
+3. vérification des paires candidates (`near_duplicate_score` au moins égal à
+   `--threshold`) et regroupement transitif (union-find).
+
+Les groupes sont écrits en JSON Lines (`--output`), du plus grand au plus
+petit ; la collection n'est modifiée que par l'étape 1.
+Lancement depuis `backend/` :
+
+    python cluster_near_duplicates.py --output near_duplicates.jsonl
+    python cluster_near_duplicates.py --threshold 0.95 --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import combinations
+from typing import Any, Dict, List, Set, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from utils.minhash import (
+    NEAR_DUPLICATE_THRESHOLD,
+    minhasher,
+    near_duplicate_score,
+    question_words,
+)
+from utils.mg_database import Database
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--output", default="near_duplicates.jsonl")
+    parser.add_argument("--threshold", type=float, default=NEAR_DUPLICATE_THRESHOLD)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument(
+        "--max-bucket",
+        type=int,
+        default=200,
+        help="Seaux plus grands ignorés (intitulés très courts ou génériques)",
+    )
+    parser.add_argument(
+        "--skip-backfill",
+        action="store_true",
+        help="Ne calcule pas les clés manquantes",
+    )
+    return parser.parse_args()
+
+
+# ==================== CLÉS LSH MANQUANTES ====================
+
+
+def _band_keys(
+    chunk: List[Tuple[ObjectId, str]],
+) -> List[Tuple[ObjectId, List[int]]]:
+    """Clés LSH d'un paquet de questions (exécuté dans un processus du pool)"""
+    return [(question_id, minhasher.keys(text)) for question_id, text in chunk]
+
+
+def backfill(collection, workers: int, batch_size: int) -> int:
+    """
+    Calcule et enregistre `minhash_bands` pour les questions qui n'en ont
+    pas. Au plus deux paquets par processus sont en attente : la mémoire
+    reste bornée quelle que soit la taille de la collection.
+    """
+    cursor = collection.find(
+        {"minhash_bands": {"$exists": False}}, {"question": 1}
+    ).batch_size(batch_size)
+    updated = 0
+    pending: List[Future] = []
+
+    def _write(future: Future) -> int:
+        operations = [
+            UpdateOne({"_id": question_id}, {"$set": {"minhash_bands": keys}})
+            for question_id, keys in future.result()
+        ]
+        if not operations:
+            return 0
+        return collection.bulk_write(operations, ordered=False).modified_count
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunk: List[Tuple[ObjectId, str]] = []
+        for doc in cursor:
+            chunk.append((doc["_id"], doc.get("question") or ""))
+            if len(chunk) < batch_size:
+                continue
+            pending.append(pool.submit(_band_keys, chunk))
+            chunk = []
+            if len(pending) >= 2 * workers:
+                updated += _write(pending.pop(0))
+        if chunk:
+            pending.append(pool.submit(_band_keys, chunk))
+        for future in pending:
+            updated += _write(future)
+    return updated
+
+
+# ==================== REGROUPEMENT ====================
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent: Dict[str, str] = {}
+
+    def find(self, item: str) -> str:
+        root = self.parent.setdefault(item, item)
+        while root != self.parent[root]:
+            root = self.parent[root]
+        while item != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: str, b: str) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # la plus ancienne question (plus petit ObjectId) représente le groupe
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def candidate_pairs(collection, max_bucket: int) -> Tuple[Set[Tuple[str, str]], int]:
+    """Paires de questions partageant au moins un seau LSH"""
+    pipeline = [
+        {"$match": {"minhash_bands.0": {"$exists": True}}},
+        {"$project": {"minhash_bands": 1}},
+        {"$unwind": "$minhash_bands"},
+        {"$group": {"_id": "$minhash_bands", "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ]
+    pairs: Set[Tuple[str, str]] = set()
+    skipped = 0
+    for bucket in collection.aggregate(pipeline, allowDiskUse=True):
+        ids = sorted(str(question_id) for question_id in bucket["ids"])
+        if len(ids) > max_bucket:
+            skipped += 1
+            continue
+        pairs.update(combinations(ids, 2))
+    return pairs, skipped
+
+
+def load_words(collection, ids: Set[str], batch_size: int) -> Dict[str, List[str]]:
+    """Intitulés réduits des questions candidates, lus par paquets"""
+    words: Dict[str, List[str]] = {}
+    ordered = list(ids)
+    for start in range(0, len(ordered), batch_size):
+        chunk = [ObjectId(qid) for qid in ordered[start : start + batch_size]]
+        for doc in collection.find({"_id": {"$in": chunk}}, {"question": 1}):
+            words[str(doc["_id"])] = question_words(doc.get("question") or "")
+    return words
+
+
+def cluster(
+    pairs: Set[Tuple[str, str]], words: Dict[str, List[str]], threshold: float
+) -> Tuple[Dict[str, List[str]], Dict[Tuple[str, str], float]]:
+    groups = UnionFind()
+    scores: Dict[Tuple[str, str], float] = {}
+    for a, b in pairs:
+        score = near_duplicate_score(words.get(a, []), words.get(b, []), threshold)
+        if score >= threshold:
+            scores[(a, b)] = score
+            groups.union(a, b)
+    clusters: Dict[str, List[str]] = {}
+    for item in groups.parent:
+        clusters.setdefault(groups.find(item), []).append(item)
+    return clusters, scores
+
+
+def write_report(
+    collection, clusters: Dict[str, List[str]], scores, path: str, batch_size: int
+) -> None:
+    texts: Dict[str, Dict[str, Any]] = {}
+    members = [question_id for ids in clusters.values() for question_id in ids]
+    for start in range(0, len(members), batch_size):
+        chunk = [ObjectId(qid) for qid in members[start : start + batch_size]]
+        for doc in collection.find(
+            {"_id": {"$in": chunk}}, {"question": 1, "subject": 1, "status": 1}
+        ):
+            texts[str(doc["_id"])] = doc
+
+    best: Dict[str, float] = {}
+    for (a, b), score in scores.items():
+        best[a] = max(best.get(a, 0.0), score)
+        best[b] = max(best.get(b, 0.0), score)
+
+    with open(path, "w", encoding="utf-8") as output:
+        for representative, ids in sorted(
+            clusters.items(), key=lambda item: len(item[1]), reverse=True
+        ):
+            questions = []
+            for question_id in sorted(ids):
+                doc = texts.get(question_id, {})
+                questions.append(
+                    {
+                        "id": question_id,
+                        "question": doc.get("question"),
+                        "subject": doc.get("subject", []),
+                        "status": doc.get("status"),
+                        "score": round(best.get(question_id, 0.0), 3),
+                    }
+                )
+            line = {
+                "representative": representative,
+                "size": len(ids),
+                "questions": questions,
+            }
+            output.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+def main():
+    args = _parse_args()
+    Database.init_db()
+    collection = Database.get_collection("questions")
+    started = time.perf_counter()
+
+    if not args.skip_backfill:
+        updated = backfill(collection, args.workers, args.batch_size)
+        print(f"Clés LSH calculées : {updated} questions", file=sys.stderr)
+
+    pairs, skipped = candidate_pairs(collection, args.max_bucket)
+    print(
+        f"Paires candidates : {len(pairs)} ({skipped} seaux ignorés)",
+        file=sys.stderr,
+    )
+    candidates = {question_id for pair in pairs for question_id in pair}
+    words = load_words(collection, candidates, args.batch_size)
+    clusters, scores = cluster(pairs, words, args.threshold)
+    write_report(collection, clusters, scores, args.output, args.batch_size)
+
+    grouped = sum(len(ids) for ids in clusters.values())
+    print(
+        f"{len(clusters)} groupes, {grouped} questions, {len(scores)} paires "
+        f"vérifiées en {time.perf_counter() - started:.1f} s -> {args.output}",
+        file=sys.stderr,
+    )
+    Database.close_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+
+
+class ImportJobStatus(str, Enum):
+    """Énumération des statuts d'une tâche d'import"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    INTERRUPTED = "interrupted"
+
+
+# Statuts définitifs : la tâche ne progressera plus
+FINAL_STATUSES = {
+    ImportJobStatus.COMPLETED,
+    ImportJobStatus.FAILED,
+    ImportJobStatus.INTERRUPTED,
+}
+
+
+class ImportJob(BaseModel):
+    """Modèle d'une tâche d'import CSV en arrière-plan"""
+
+    id: Optional[str] = None
+    filename: str
+    status: ImportJobStatus = ImportJobStatus.PENDING
+    options: Dict[str, Any] = {}
+    progress: Dict[str, int] = {}
+    error_details: List[Dict[str, str]] = []
+    message: Optional[str] = None
+    error: Optional[str] = None
+    # process qui exécute la tâche (hôte:pid:jeton) et dernier signe de vie
+    worker: Optional[str] = None
+    heartbeat_at: Optional[datetime] = None
+    created_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
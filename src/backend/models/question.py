@@ -26,3 +26,7 @@ class Question(BaseModel):
     created_by: Optional[int] = None
     created_at: Optional[datetime] = None
     edited_at: Optional[datetime] = None
+    # empreinte de l'intitulé normalisé (dédoublonnage entre imports)
+    question_key_hash: Optional[str] = None
+    # clés LSH de l'intitulé (recherche des quasi-doublons, utils/minhash.py)
+    minhash_bands: List[int] = []
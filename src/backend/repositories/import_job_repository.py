@@ -0,0 +1,80 @@
+import asyncio
+import concurrent
+import contextvars
+import logging
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from models.import_job import FINAL_STATUSES, ImportJob
+from utils.mg_database import database
+
+logger = logging.getLogger(__name__)
+
+
+class ImportJobRepository:
+    """
+    Repository des tâches d'import (collection `import_jobs`).
+    Utilise pymongo (synchrone) avec des adaptateurs pour FastAPI (async).
+    """
+
+    async def _run_in_executor(self, sync_func):
+        # le contexte (identifiant de requête des logs) suit le thread worker
+        ctx = contextvars.copy_context()
+        loop = asyncio.get_event_loop()
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            return await loop.run_in_executor(executor, ctx.run, sync_func)
+
+    def _get_collection(self):
+        return database.get_collection("import_jobs")
+
+    @staticmethod
+    def _doc_to_job(doc: dict) -> ImportJob:
+        doc = dict(doc)
+        return ImportJob(id=str(doc.pop("_id")), **doc)
+
+    ################################################################################
+    async def insert_job(self, job: ImportJob) -> str:
+        def _sync_insert():
+            document = job.model_dump(exclude={"id"}, mode="json")
+            # dates conservées en type date MongoDB
+            for field in ("created_at", "started_at", "finished_at", "heartbeat_at"):
+                document[field] = getattr(job, field)
+            result = self._get_collection().insert_one(document)
+            return str(result.inserted_id)
+
+        return await self._run_in_executor(_sync_insert)
+
+    ################################################################################
+    async def get_job(self, job_id: str) -> Optional[ImportJob]:
+        def _sync_get():
+            try:
+                oid = ObjectId(job_id)
+            except (InvalidId, TypeError):
+                raise ValueError("Identifiant de tâche invalide")
+            doc = self._get_collection().find_one({"_id": oid})
+            return self._doc_to_job(doc) if doc else None
+
+        return await self._run_in_executor(_sync_get)
+
+    ################################################################################
+    async def update_job(self, job_id: str, fields: Dict[str, Any]) -> None:
+        def _sync_update():
+            self._get_collection().update_one(
+                {"_id": ObjectId(job_id)}, {"$set": fields}
+            )
+
+        await self._run_in_executor(_sync_update)
+
+    ################################################################################
+    async def get_active_jobs(self) -> List[ImportJob]:
+        """Tâches en attente ou en cours (toutes instances confondues)."""
+
+        def _sync_active():
+            cursor = self._get_collection().find(
+                {"status": {"$nin": [status.value for status in FINAL_STATUSES]}}
+            )
+            return [self._doc_to_job(doc) for doc in cursor]
+
+        return await self._run_in_executor(_sync_active)
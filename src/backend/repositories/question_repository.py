@@ -1,12 +1,36 @@
 import asyncio
+import base64
+import contextvars
+import logging
+import os
 
 import concurrent
-from models.question import Question
-from bson import ObjectId
-from typing import Any, Dict, List, Optional
-
+from datetime import datetime
+from models.question import Question, QuestionStatus
+from bson import ObjectId, json_util
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils.logger import LOG_SAMPLE_RATE, sampled
+from utils.question_export import EXPORT_BATCH_SIZE, EXPORT_PROJECTION
 from utils.mg_database import Database
 
+logger = logging.getLogger(__name__)
+
+# Code d'erreur MongoDB d'une violation d'index unique
+DUPLICATE_KEY_CODE = 11000
+DUPLICATE_QUESTION_MESSAGE = "Une question identique existe déjà"
+# Pagination par numéro de page limitée aux premiers résultats (skip coûteux),
+# au-delà : curseur (`next_cursor`)
+QUERY_MAX_SKIP = int(os.getenv("QUERY_MAX_SKIP", "1000"))
+# Comptage plafonné : au-delà, le total est signalé comme approximatif
+QUERY_COUNT_LIMIT = int(os.getenv("QUERY_COUNT_LIMIT", "10000"))
+
+
+class DuplicateQuestionError(ValueError):
+    """Une question de même intitulé normalisé existe déjà (index unique)"""
+
 
 class QuestionRepository:
     """
@@ -18,9 +42,11 @@ class QuestionRepository:
         pass  # La collection sera récupérée dynamiquement
 
     async def _run_in_executor(self, sync_func):
+        # le contexte (identifiant de requête des logs) suit le thread worker
+        ctx = contextvars.copy_context()
         loop = asyncio.get_event_loop()
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            return await loop.run_in_executor(executor, sync_func)
+            return await loop.run_in_executor(executor, ctx.run, sync_func)
 
     def _get_collection(self):
         """
@@ -28,6 +54,88 @@ class QuestionRepository:
         """
         return Database.get_collection()
 
+    @staticmethod
+    def _doc_to_question(doc: dict) -> Question:
+        """
+        Convertit un document MongoDB en modèle Question.
+        """
+        return Question(
+            id=str(doc["_id"]),
+            question=doc.get("question"),
+            subject=doc.get("subject", []),
+            use=doc.get("use", []),
+            corrects=doc.get("corrects", []),
+            responses=doc.get("responses", []),
+            remark=doc.get("remark"),
+            status=doc.get("status") or "draft",
+            created_by=doc.get("created_by"),
+            created_at=doc.get("created_at"),
+            edited_at=doc.get("edited_at"),
+            question_key_hash=doc.get("question_key_hash"),
+            minhash_bands=doc.get("minhash_bands") or [],
+        )
+
+    @staticmethod
+    def _question_to_doc(question: Question) -> Dict[str, Any]:
+        """
+        Convertit un modèle Question en document MongoDB (champs null inclus).
+        """
+        return {
+            "question": question.question,
+            "subject": question.subject,
+            "use": question.use,
+            "corrects": question.corrects,
+            "responses": question.responses,
+            "remark": question.remark,
+            "status": question.status,
+            "created_by": question.created_by,
+            "created_at": question.created_at,
+            "edited_at": question.edited_at,
+            "question_key_hash": question.question_key_hash,
+            "minhash_bands": question.minhash_bands,
+        }
+
+    @staticmethod
+    def _build_filter(
+        subjects: Optional[List[str]] = None,
+        uses: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        created_by: Optional[List[int]] = None,
+        text: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Construit le filtre MongoDB : OU entre les valeurs d'un même champ,
+        ET entre les champs. Un statut absent en base est considéré "draft".
+        La recherche `text` porte sur les mots de l'intitulé (index texte,
+        insensible à la casse et aux accents) : tous doivent y figurer.
+        """
+        query: Dict[str, Any] = {}
+        if subjects:
+            query["subject"] = {"$in": list(subjects)}
+        if uses:
+            query["use"] = {"$in": list(uses)}
+        if statuses:
+            statuses = list(statuses)
+            if "draft" in statuses:
+                statuses.append(None)
+            query["status"] = {"$in": statuses}
+        if created_by:
+            query["created_by"] = {"$in": list(created_by)}
+        if text:
+            # index texte : chaque mot doit figurer dans l'intitulé
+            words = text.replace('"', " ").split()
+            if words:
+                query["$text"] = {"$search": " ".join(f'"{w}"' for w in words)}
+        if created_from or created_to:
+            query["created_at"] = {}
+            if created_from:
+                query["created_at"]["$gte"] = created_from
+            if created_to:
+                query["created_at"]["$lte"] = created_to
+        return query
+
     ################################################################################
     async def insert_question(self, question: Question) -> str:
         """
@@ -42,18 +150,7 @@ class QuestionRepository:
             try:
                 collection = self._get_collection()
 
-                question_dict = {
-                    "question": question.question,
-                    "subject": question.subject,
-                    "use": question.use,
-                    "corrects": question.corrects,
-                    "responses": question.responses,
-                    "remark": question.remark,
-                    "status": question.status,
-                    "created_by": question.created_by,
-                    "created_at": question.created_at,
-                    "edited_at": question.edited_at,
-                }
+                question_dict = self._question_to_doc(question)
 
                 # Dé-commenter pour ne pas enregistrer les champs null
                 # cleaned_dict = {k: v for k, v in question_dict.items() if v is not None}
@@ -61,15 +158,362 @@ class QuestionRepository:
                 # enregistre même les champs null
                 result = collection.insert_one(question_dict)
 
-                print(f"Question insérée avec l'ID: {result.inserted_id}")
+                if sampled():
+                    logger.info(
+                        "Question insérée",
+                        extra={
+                            "question_id": str(result.inserted_id),
+                            "sample_rate": LOG_SAMPLE_RATE,
+                        },
+                    )
                 return str(result.inserted_id)
 
+            except DuplicateKeyError:
+                raise DuplicateQuestionError(DUPLICATE_QUESTION_MESSAGE)
             except Exception as e:
-                print(f"Erreur lors de l'insertion: {e}")
+                logger.exception("Erreur lors de l'insertion: %s", e)
                 raise
 
         return await self._run_in_executor(_sync_insert)
 
+    ################################################################################
+    async def insert_questions(
+        self, questions: List[Question]
+    ) -> Tuple[List[Optional[str]], Dict[int, str]]:
+        """
+        Insère un lot de questions en une seule commande `insert_many`
+        (non ordonnée : une erreur n'interrompt pas le reste du lot).
+        Returns:
+            (ids, erreurs) : l'id de chaque question (None si l'insertion a
+            échoué) et le message d'erreur par position dans le lot
+        """
+
+        def _sync_insert_many():
+            if not questions:
+                return [], {}
+            collection = self._get_collection()
+            documents = [self._question_to_doc(q) for q in questions]
+            errors: Dict[int, str] = {}
+            try:
+                # pymongo renseigne `_id` dans chaque document avant l'envoi
+                collection.insert_many(documents, ordered=False)
+            except BulkWriteError as bwe:
+                for error in bwe.details.get("writeErrors", []):
+                    errors[error["index"]] = self._write_error_message(error)
+                logger.warning(
+                    "Insertion par lot partielle",
+                    extra={"batch": len(documents), "errors": len(errors)},
+                )
+            ids = [
+                None if index in errors else str(doc["_id"])
+                for index, doc in enumerate(documents)
+            ]
+            return ids, errors
+
+        return await self._run_in_executor(_sync_insert_many)
+
+    @staticmethod
+    def _write_error_message(error: Dict[str, Any]) -> str:
+        if error.get("code") == DUPLICATE_KEY_CODE:
+            return DUPLICATE_QUESTION_MESSAGE
+        return error.get("errmsg", "Erreur d'écriture")
+
+    @staticmethod
+    def merge_pipeline(
+        question: Question, with_bands: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Mise à jour (pipeline) d'une question importée en mode upsert : crée
+        le document s'il n'existe pas, sinon fusionne réponses et corrects
+        selon les règles de `CSVQuestionProcessor.merge_responses_and_corrects`
+        (réponses existantes puis nouvelles absentes, corrects dédoublonnés et
+        triés) ; les autres champs du document existant sont conservés.
+        Sans `with_bands`, `minhash_bands` n'est pas écrit (clés LSH calculées
+        plus tard par `cluster_near_duplicates.py`).
+        """
+        responses = {"$ifNull": ["$responses", []]}
+        corrects = {"$ifNull": ["$corrects", []]}
+        # valeurs importées en littéraux (une chaîne "$..." n'est pas un champ)
+        new_responses = {"$literal": question.responses}
+        new_corrects = {"$literal": question.corrects}
+        exists = {"$ne": [{"$type": "$question"}, "missing"]}
+        doc = QuestionRepository._question_to_doc(question)
+        fields = ["question", "subject", "use", "remark", "created_by"]
+        if with_bands:
+            fields.append("minhash_bands")
+        kept = {
+            field: {"$ifNull": [f"${field}", {"$literal": doc[field]}]}
+            for field in fields
+        }
+        return [
+            {
+                "$set": {
+                    "_merged": {
+                        "responses": {
+                            "$concatArrays": [
+                                responses,
+                                {
+                                    "$filter": {
+                                        "input": new_responses,
+                                        "cond": {
+                                            "$not": [{"$in": ["$$this", responses]}]
+                                        },
+                                    }
+                                },
+                            ]
+                        },
+                        "corrects": {
+                            "$sortArray": {
+                                "input": {"$setUnion": [corrects, new_corrects]},
+                                "sortBy": 1,
+                            }
+                        },
+                    },
+                    "_exists": exists,
+                }
+            },
+            {
+                "$set": {
+                    "_changed": {
+                        "$or": [
+                            {"$not": ["$_exists"]},
+                            {"$ne": ["$_merged.responses", responses]},
+                            {"$ne": ["$_merged.corrects", corrects]},
+                        ]
+                    }
+                }
+            },
+            {
+                "$set": {
+                    **kept,
+                    "responses": "$_merged.responses",
+                    "corrects": "$_merged.corrects",
+                    # un document inchangé garde son statut (ex. archive)
+                    "status": {
+                        "$cond": [
+                            "$_changed",
+                            {
+                                "$cond": [
+                                    {"$gt": [{"$size": "$_merged.corrects"}, 0]},
+                                    QuestionStatus.ACTIVE.value,
+                                    QuestionStatus.DRAFT.value,
+                                ]
+                            },
+                            "$status",
+                        ]
+                    },
+                    "created_at": {
+                        "$cond": ["$_exists", "$created_at", doc["created_at"]]
+                    },
+                    "edited_at": {
+                        "$cond": [
+                            {"$and": ["$_exists", "$_changed"]},
+                            "$$NOW",
+                            {"$ifNull": ["$edited_at", None]},
+                        ]
+                    },
+                }
+            },
+            {"$unset": ["_merged", "_exists", "_changed"]},
+        ]
+
+    ################################################################################
+    async def upsert_questions(
+        self, questions: List[Question]
+    ) -> Tuple[List[int], int, Dict[int, str]]:
+        """
+        Importe un lot de questions en un seul `bulk_write` d'`UpdateOne`
+        (upsert) sur `question_key_hash` : les nouvelles questions sont
+        créées, les autres fusionnées dans le document existant. Rejouer le
+        même import ne crée donc aucun doublon.
+        Returns:
+            (positions des questions créées, fusionnées, erreurs par position
+            dans le lot)
+        """
+
+        def _sync_upsert():
+            if not questions:
+                return [], 0, {}
+            collection = self._get_collection()
+            operations = [
+                UpdateOne(
+                    {"question_key_hash": q.question_key_hash},
+                    self.merge_pipeline(q),
+                    upsert=True,
+                )
+                for q in questions
+            ]
+            errors: Dict[int, str] = {}
+            try:
+                result = collection.bulk_write(operations, ordered=False)
+                details = result.bulk_api_result
+            except BulkWriteError as bwe:
+                details = bwe.details
+                for error in details.get("writeErrors", []):
+                    errors[error["index"]] = self._write_error_message(error)
+                logger.warning(
+                    "Upsert par lot partiel",
+                    extra={"batch": len(operations), "errors": len(errors)},
+                )
+            upserted = [item["index"] for item in details.get("upserted", [])]
+            return upserted, details.get("nMatched", 0), errors
+
+        return await self._run_in_executor(_sync_upsert)
+
+    ################################################################################
+    async def find_by_minhash_bands(
+        self, keys: List[int], limit: int = 50000
+    ) -> List[Dict[str, Any]]:
+        """
+        Questions partageant au moins une clé LSH (candidates quasi-doublons),
+        en une requête sur l'index multiclé `minhash_bands`.
+        """
+
+        def _sync_find():
+            if not keys:
+                return []
+            cursor = (
+                self._get_collection()
+                .find(
+                    {"minhash_bands": {"$in": list(set(keys))}},
+                    {"question": 1, "question_key_hash": 1, "minhash_bands": 1},
+                )
+                .limit(limit)
+            )
+            return [
+                {
+                    "id": str(doc["_id"]),
+                    "question": doc.get("question") or "",
+                    "question_key_hash": doc.get("question_key_hash"),
+                    "minhash_bands": doc.get("minhash_bands") or [],
+                }
+                for doc in cursor
+            ]
+
+        return await self._run_in_executor(_sync_find)
+
+    ################################################################################
+    async def backfill_question_key_hashes(
+        self,
+        key_hash: Callable[[str], str],
+        batch_size: int = 1000,
+        retry_duplicates: bool = False,
+    ) -> Tuple[int, int]:
+        """
+        Renseigne `question_key_hash` sur les questions qui n'en ont pas (créées
+        avant son introduction ou hors API), des plus anciennes aux plus
+        récentes : en cas de doublons déjà présents en base, seule la première
+        reçoit l'empreinte (index unique). Les autres sont marquées
+        (`question_key_duplicate`, empreinte de la question qu'elles doublent)
+        et ne sont plus reprises, sauf avec `retry_duplicates` (après fusion
+        ou suppression des doublons).
+        Returns:
+            (questions renseignées, doublons marqués)
+        """
+
+        def _sync_backfill():
+            collection = self._get_collection()
+            query: Dict[str, Any] = {
+                "question_key_hash": {"$exists": False},
+                "question": {"$type": "string"},
+            }
+            if not retry_duplicates:
+                query["question_key_duplicate"] = {"$exists": False}
+            cursor = collection.find(query, {"question": 1}).sort("_id", 1)
+            updated = duplicates = 0
+            operations: List[UpdateOne] = []
+            hashes: List[Tuple[ObjectId, str]] = []
+
+            def _flush():
+                nonlocal updated, duplicates
+                skipped: List[UpdateOne] = []
+                try:
+                    result = collection.bulk_write(operations, ordered=False)
+                    updated += result.modified_count
+                except BulkWriteError as bwe:
+                    updated += bwe.details.get("nModified", 0)
+                    for error in bwe.details.get("writeErrors", []):
+                        if error.get("code") != DUPLICATE_KEY_CODE:
+                            raise
+                        question_id, digest = hashes[error["index"]]
+                        skipped.append(
+                            UpdateOne(
+                                {"_id": question_id},
+                                {"$set": {"question_key_duplicate": digest}},
+                            )
+                        )
+                if skipped:
+                    collection.bulk_write(skipped, ordered=False)
+                    duplicates += len(skipped)
+                operations.clear()
+                hashes.clear()
+
+            for doc in cursor:
+                digest = key_hash(doc["question"])
+                hashes.append((doc["_id"], digest))
+                operations.append(
+                    UpdateOne(
+                        {"_id": doc["_id"]},
+                        {
+                            "$set": {"question_key_hash": digest},
+                            "$unset": {"question_key_duplicate": ""},
+                        },
+                    )
+                )
+                if len(operations) >= batch_size:
+                    _flush()
+            if operations:
+                _flush()
+            return updated, duplicates
+
+        return await self._run_in_executor(_sync_backfill)
+
+    ################################################################################
+    async def get_answers_by_ids(
+        self, question_ids: List[str]
+    ) -> Dict[str, Tuple[List[str], List[str]]]:
+        """
+        Réponses et réponses correctes de plusieurs questions (une requête).
+        """
+
+        def _sync_get_answers():
+            collection = self._get_collection()
+            cursor = collection.find(
+                {"_id": {"$in": [ObjectId(qid) for qid in question_ids]}},
+                {"responses": 1, "corrects": 1},
+            )
+            return {
+                str(doc["_id"]): (doc.get("responses") or [], doc.get("corrects") or [])
+                for doc in cursor
+            }
+
+        return await self._run_in_executor(_sync_get_answers)
+
+    ################################################################################
+    async def update_questions(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Met à jour plusieurs questions en un seul `bulk_write`.
+        Args:
+            updates: {id: champs à mettre à jour}
+        Returns:
+            int: nombre de documents modifiés
+        """
+
+        def _sync_bulk_update():
+            if not updates:
+                return 0
+            collection = self._get_collection()
+            result = collection.bulk_write(
+                [
+                    UpdateOne({"_id": ObjectId(qid)}, {"$set": fields})
+                    for qid, fields in updates.items()
+                ],
+                ordered=False,
+            )
+            return result.modified_count
+
+        return await self._run_in_executor(_sync_bulk_update)
+
     ################################################################################
     async def get_question_by_id(self, question_id: str) -> Optional[Question]:
         collection = self._get_collection()
@@ -241,18 +685,243 @@ class QuestionRepository:
                 # cleaned_data = {k: v for k, v in update_data.items() if v is not None}
                 # result = collection.update_one({"_id": oid}, {"$set": cleaned_data})
                 # enregistre même les champs null
-                result = collection.update_one({"_id": oid}, {"$set": update_data})
+                try:
+                    result = collection.update_one(
+                        {"_id": oid}, {"$set": update_data}
+                    )
+                except DuplicateKeyError:
+                    raise DuplicateQuestionError(DUPLICATE_QUESTION_MESSAGE)
 
                 if result.matched_count == 0:
                     raise LookupError("Question introuvable")
 
-                print(
-                    f"Question {question_id} mise à jour: {result.modified_count} champ(s) modifié(s)"
-                )
+                if sampled():
+                    logger.info(
+                        "Question mise à jour",
+                        extra={
+                            "question_id": question_id,
+                            "modified": result.modified_count,
+                            "sample_rate": LOG_SAMPLE_RATE,
+                        },
+                    )
                 return result.modified_count > 0
 
             except Exception as e:
-                print(f"Erreur lors de la mise à jour: {e}")
+                logger.warning("Erreur lors de la mise à jour: %s", e)
                 raise
 
         return await self._run_in_executor(_sync_update)
+
+    ################################################################################
+    async def get_facets(
+        self,
+        subjects: Optional[List[str]] = None,
+        uses: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        Calcule en une seule agrégation $facet les compteurs par sujet,
+        usage et statut, ainsi que le total et la première page des
+        questions filtrées (les plus récentes d'abord).
+        Facettes disjonctives : les compteurs d'une facette appliquent les
+        filtres des autres facettes seulement, et donnent donc ce que
+        chaque valeur ajouterait à la sélection (un sujet sélectionné
+        n'efface pas les compteurs des autres sujets).
+        Returns:
+            dict: {"total", "subject", "use", "status", "items"}
+        """
+        # filtre de chaque facette : celui des autres facettes
+        facet_filters = {
+            "subject": self._build_filter(uses=uses, statuses=statuses),
+            "use": self._build_filter(subjects=subjects, statuses=statuses),
+            "status": self._build_filter(subjects=subjects, uses=uses),
+        }
+        full_filter = self._build_filter(subjects, uses, statuses)
+        # documents utiles à au moins une facette (tous si l'une n'a pas de filtre)
+        branches = [f for f in facet_filters.values() if f]
+        match = {"$or": branches} if len(branches) == len(facet_filters) else {}
+
+        def _counts(field: str) -> List[Dict[str, Any]]:
+            return [
+                {"$match": facet_filters[field]},
+                {"$unwind": f"${field}"},
+                {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+            ]
+
+        def _sync_facets():
+            collection = self._get_collection()
+            pipeline = [
+                {"$match": match},
+                {
+                    "$facet": {
+                        "subject": _counts("subject"),
+                        "use": _counts("use"),
+                        "status": [
+                            {"$match": facet_filters["status"]},
+                            {
+                                "$group": {
+                                    "_id": {"$ifNull": ["$status", "draft"]},
+                                    "count": {"$sum": 1},
+                                }
+                            },
+                            {"$sort": {"count": -1, "_id": 1}},
+                        ],
+                        "total": [{"$match": full_filter}, {"$count": "count"}],
+                        "items": [
+                            {"$match": full_filter},
+                            {"$sort": {"created_at": -1, "_id": -1}},
+                            {"$limit": limit},
+                        ],
+                    }
+                },
+            ]
+            result = next(collection.aggregate(pipeline), {})
+
+            def _as_counts(key: str) -> List[Dict[str, Any]]:
+                return [
+                    {"value": str(d["_id"]), "count": d["count"]}
+                    for d in result.get(key, [])
+                    if d.get("_id")
+                ]
+
+            total = result.get("total") or [{"count": 0}]
+            return {
+                "total": total[0]["count"],
+                "subject": _as_counts("subject"),
+                "use": _as_counts("use"),
+                "status": _as_counts("status"),
+                "items": [self._doc_to_question(d) for d in result.get("items", [])],
+            }
+
+        return await self._run_in_executor(_sync_facets)
+
+    ################################################################################
+    @staticmethod
+    def _encode_cursor(doc: Dict[str, Any], sort_field: str) -> str:
+        """Curseur opaque : valeur du champ de tri et `_id` du dernier document"""
+        position = json_util.dumps([doc.get(sort_field), doc["_id"]])
+        return base64.urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _after_cursor(cursor: str, sort_field: str, sort_order: int) -> Dict[str, Any]:
+        """
+        Filtre des documents situés après le curseur dans l'ordre
+        (sort_field, _id). Les valeurs absentes sont triées en premier
+        (ordre croissant) par MongoDB.
+        """
+        try:
+            value, last_id = json_util.loads(base64.urlsafe_b64decode(cursor))
+            if not isinstance(last_id, ObjectId):
+                raise TypeError
+        except Exception:
+            raise ValueError("Curseur de pagination invalide")
+
+        after = "$gt" if sort_order == 1 else "$lt"
+        same = {sort_field: value, "_id": {after: last_id}}
+        if value is None:
+            if sort_order == 1:
+                return {"$or": [same, {sort_field: {"$ne": None}}]}
+            return same
+        clauses = [{sort_field: {after: value}}, same]
+        if sort_order == -1:
+            clauses.append({sort_field: None})
+        return {"$or": clauses}
+
+    async def query_questions(
+        self,
+        filters: Dict[str, Any],
+        sort_field: str = "created_at",
+        sort_order: int = -1,
+        page: int = 1,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Recherche paginée côté serveur. La page suivante se lit par curseur
+        (`cursor`, valeur de tri et `_id` du dernier document) : une requête
+        servie par les index composés (filtre, tri, _id), dont le coût ne
+        dépend pas de la position dans les résultats. `page` reste accepté
+        pour les QUERY_MAX_SKIP premiers résultats. Le total est compté
+        jusqu'à QUERY_COUNT_LIMIT documents.
+        Args:
+            filters: Arguments de `_build_filter`
+            sort_field: Champ de tri
+            sort_order: 1 (croissant) ou -1 (décroissant)
+            page: Numéro de page (commence à 1), ignoré avec `cursor`
+            page_size: Nombre d'éléments par page
+            cursor: `next_cursor` de la page précédente
+        Returns:
+            dict: {"items", "total", "total_capped", "next_cursor"}
+        """
+        skip = 0 if cursor else (page - 1) * page_size
+        if skip > QUERY_MAX_SKIP:
+            raise ValueError(
+                f"Pagination par numéro de page limitée aux {QUERY_MAX_SKIP} "
+                "premiers résultats : utiliser `cursor`"
+            )
+        after = self._after_cursor(cursor, sort_field, sort_order) if cursor else None
+
+        def _sync_query():
+            collection = self._get_collection()
+            query = self._build_filter(**filters)
+            total = collection.count_documents(query, limit=QUERY_COUNT_LIMIT + 1)
+            if after:
+                query = {"$and": [query, after]} if query else after
+            docs = list(
+                collection.find(query)
+                .sort([(sort_field, sort_order), ("_id", sort_order)])
+                .skip(skip)
+                .limit(page_size + 1)
+            )
+            next_cursor = None
+            if len(docs) > page_size:
+                docs = docs[:page_size]
+                next_cursor = self._encode_cursor(docs[-1], sort_field)
+            return {
+                "items": [self._doc_to_question(doc) for doc in docs],
+                "total": min(total, QUERY_COUNT_LIMIT),
+                "total_capped": total > QUERY_COUNT_LIMIT,
+                "next_cursor": next_cursor,
+            }
+
+        return await self._run_in_executor(_sync_query)
+
+    ################################################################################
+    def iter_export_docs(self, filters: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Questions filtrées (arguments de `_build_filter`), dans l'ordre
+        d'insertion, lues au fil du curseur par lots de EXPORT_BATCH_SIZE.
+        Générateur synchrone : consommé dans le pool de threads par la
+        réponse en flux, il n'est pas enveloppé par `_run_in_executor`.
+        """
+        collection = self._get_collection()
+        cursor = (
+            collection.find(self._build_filter(**filters), EXPORT_PROJECTION)
+            .sort("_id", 1)
+            .batch_size(EXPORT_BATCH_SIZE)
+        )
+        with cursor:
+            yield from cursor
+
+    def iter_export_docs_by_ids(
+        self, question_ids: List[str]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Questions dans l'ordre de `question_ids` (une requête par lot de
+        EXPORT_BATCH_SIZE identifiants) ; les identifiants absents sont ignorés.
+        """
+        collection = self._get_collection()
+        for start in range(0, len(question_ids), EXPORT_BATCH_SIZE):
+            batch = [
+                ObjectId(qid)
+                for qid in question_ids[start : start + EXPORT_BATCH_SIZE]
+            ]
+            docs = {
+                doc["_id"]: doc
+                for doc in collection.find({"_id": {"$in": batch}}, EXPORT_PROJECTION)
+            }
+            for oid in batch:
+                if oid in docs:
+                    yield docs[oid]
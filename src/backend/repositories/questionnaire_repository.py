@@ -1,9 +1,14 @@
 import asyncio
 import concurrent
+import contextvars
+import logging
 from models.questionnaire import Questionnaire, QItem
 from utils.mg_database import database
 from bson import ObjectId
 from typing import Any, Dict, List, Optional
+from utils.logger import LOG_SAMPLE_RATE, sampled
+
+logger = logging.getLogger(__name__)
 
 
 class QuestionnaireRepository:
@@ -55,16 +60,24 @@ class QuestionnaireRepository:
 
                 result = collection.insert_one(questionnaire_dict)
 
-                print(f"Questionnaire inséré avec l'ID: {result.inserted_id}")
+                if sampled():
+                    logger.info(
+                        "Questionnaire inséré",
+                        extra={
+                            "questionnaire_id": str(result.inserted_id),
+                            "sample_rate": LOG_SAMPLE_RATE,
+                        },
+                    )
                 return str(result.inserted_id)
 
             except Exception as e:
-                print(f"Erreur lors de l'insertion: {e}")
+                logger.exception("Erreur lors de l'insertion: %s", e)
                 raise
 
         loop = asyncio.get_event_loop()
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            result = await loop.run_in_executor(executor, _sync_insert)
+            ctx = contextvars.copy_context()
+            result = await loop.run_in_executor(executor, ctx.run, _sync_insert)
             return result
 
     ################################################################################
@@ -135,7 +148,9 @@ class QuestionnaireRepository:
                     if q_id:
                         question_ids.append(ObjectId(q_id))
                 except Exception as e:
-                    print(f"ID question invalide ignoré: {item.get('id')} - {e}")
+                    logger.warning(
+                        "ID question invalide ignoré: %s - %s", item.get("id"), e
+                    )
 
             full_questions = []
             if question_ids:
@@ -173,7 +188,8 @@ class QuestionnaireRepository:
 
         loop = asyncio.get_event_loop()
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            return await loop.run_in_executor(executor, _sync_get_full)
+            ctx = contextvars.copy_context()
+            return await loop.run_in_executor(executor, ctx.run, _sync_get_full)
 
     ################################################################################
     async def update_questionnaire(
@@ -203,18 +219,25 @@ class QuestionnaireRepository:
                 if result.matched_count == 0:
                     raise LookupError("Questionnaire introuvable")
 
-                print(
-                    f"Questionnaire {questionnaire_id} mis à jour: {result.modified_count} champ(s) modifié(s)"
-                )
+                if sampled():
+                    logger.info(
+                        "Questionnaire mis à jour",
+                        extra={
+                            "questionnaire_id": questionnaire_id,
+                            "modified": result.modified_count,
+                            "sample_rate": LOG_SAMPLE_RATE,
+                        },
+                    )
                 return result.modified_count > 0
 
             except Exception as e:
-                print(f"Erreur lors de la mise à jour: {e}")
+                logger.warning("Erreur lors de la mise à jour: %s", e)
                 raise
 
         loop = asyncio.get_event_loop()
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            result = await loop.run_in_executor(executor, _sync_update)
+            ctx = contextvars.copy_context()
+            result = await loop.run_in_executor(executor, ctx.run, _sync_update)
             return result
 
     ################################################################################
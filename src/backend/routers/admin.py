@@ -0,0 +1,198 @@
+import io
+import pstats
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from models.user import User, UserRole
+from schemas.admin import (
+    LoopStallsResponse,
+    ProfileInfo,
+    ProfileListResponse,
+    SlowQueriesResponse,
+    SlowQueryShape,
+)
+from utils.auth_dependencies import get_current_user
+from utils.loop_monitor import LOOP_MONITOR_ENABLED, loop_monitor
+from utils.mg_database import Database
+from utils.profiling import PROFILING_ENABLED, get_profile_path, list_profiles
+from utils.query_monitor import (
+    explain_winning_plan,
+    mongo_command_listener,
+    slow_query_log,
+)
+
+router = APIRouter()
+
+
+def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Dépendance : réserve la route aux administrateurs."""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé aux administrateurs",
+        )
+    return current_user
+
+
+@router.get(
+    "/api/admin/slow-queries",
+    response_model=SlowQueriesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Requêtes MongoDB les plus lentes",
+    description="""
+    Liste les N formes de requêtes MongoDB les plus lentes observées depuis le
+    démarrage du worker (durée maximale décroissante), avec le plan gagnant
+    retourné par `explain()` pour chacune.
+    Route réservée aux administrateurs.
+    """,
+    responses={
+        200: {"description": "Formes de requêtes lentes retournées"},
+        401: {"description": "Token d'authentification requis"},
+        403: {"description": "Accès réservé aux administrateurs"},
+        500: {"description": "Erreur interne du serveur"},
+    },
+    tags=["Admin"],
+)
+async def get_slow_queries(
+    limit: int = Query(10, ge=1, le=100, description="Nombre de formes"),
+    explain: bool = Query(True, description="Inclure le plan gagnant"),
+    current_user: User = Depends(require_admin),
+) -> SlowQueriesResponse:
+    """Retourne les formes de requêtes les plus lentes"""
+    try:
+        items = []
+        for entry in slow_query_log.top(limit):
+            winning_plan = None
+            if explain and entry["command"]:
+                try:
+                    winning_plan = await run_in_threadpool(
+                        explain_winning_plan,
+                        Database.get_database(),
+                        entry["command"],
+                    )
+                except Exception as e:
+                    winning_plan = {"error": str(e)}
+            items.append(
+                SlowQueryShape(
+                    collection=entry["collection"],
+                    operation=entry["operation"],
+                    shape=entry["shape"],
+                    count=entry["count"],
+                    avg_ms=entry["avg_ms"],
+                    max_ms=entry["max_ms"],
+                    winning_plan=winning_plan,
+                )
+            )
+        return SlowQueriesResponse(
+            threshold_ms=mongo_command_listener.threshold_ms, items=items
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de la lecture du journal des requêtes lentes: {str(e)}",
+        )
+
+
+@router.get(
+    "/api/admin/profiles",
+    response_model=ProfileListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Profils de requêtes enregistrés",
+    description="""
+    Liste les profils cProfile enregistrés par le worker (en-tête `X-Profile`
+    ou échantillonnage), du plus récent au plus ancien.
+    Route réservée aux administrateurs.
+    """,
+    responses={
+        200: {"description": "Profils retournés"},
+        401: {"description": "Token d'authentification requis"},
+        403: {"description": "Accès réservé aux administrateurs"},
+    },
+    tags=["Admin"],
+)
+async def get_profiles(
+    current_user: User = Depends(require_admin),
+) -> ProfileListResponse:
+    """Liste les profils disponibles"""
+    profiles = await run_in_threadpool(list_profiles)
+    return ProfileListResponse(
+        enabled=PROFILING_ENABLED,
+        items=[ProfileInfo(**profile) for profile in profiles],
+    )
+
+
+@router.get(
+    "/api/admin/profiles/{name}",
+    status_code=status.HTTP_200_OK,
+    summary="Télécharger un profil",
+    description="""
+    Télécharge un profil au format pstats (`format=pstats`, lisible avec
+    `python -m pstats` ou snakeviz), ou retourne les fonctions les plus
+    coûteuses en texte (`format=text`).
+    Route réservée aux administrateurs.
+    """,
+    responses={
+        200: {"description": "Profil retourné"},
+        401: {"description": "Token d'authentification requis"},
+        403: {"description": "Accès réservé aux administrateurs"},
+        404: {"description": "Profil introuvable"},
+    },
+    tags=["Admin"],
+)
+async def get_profile(
+    name: str,
+    format: str = Query("pstats", pattern="^(pstats|text)$"),
+    limit: int = Query(40, ge=1, le=500, description="Lignes (format texte)"),
+    current_user: User = Depends(require_admin),
+):
+    """Télécharge un profil ou son résumé texte"""
+    path = get_profile_path(name)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profil '{name}' introuvable",
+        )
+
+    if format == "pstats":
+        return FileResponse(
+            path, media_type="application/octet-stream", filename=path.name
+        )
+
+    def _summary() -> str:
+        out = io.StringIO()
+        stats = pstats.Stats(str(path), stream=out)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    return PlainTextResponse(await run_in_threadpool(_summary))
+
+
+@router.get(
+    "/api/admin/loop-stalls",
+    response_model=LoopStallsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Blocages de la boucle d'événements",
+    description="""
+    Liste les appels synchrones ayant bloqué la boucle d'événements du worker
+    au-delà du seuil (site applicatif le plus profond de la pile, par nombre
+    d'occurrences), puis les blocages récents avec leur pile complète.
+    Route réservée aux administrateurs.
+    """,
+    responses={
+        200: {"description": "Blocages retournés"},
+        401: {"description": "Token d'authentification requis"},
+        403: {"description": "Accès réservé aux administrateurs"},
+    },
+    tags=["Admin"],
+)
+async def get_loop_stalls(
+    current_user: User = Depends(require_admin),
+) -> LoopStallsResponse:
+    """Retourne les sites bloquant la boucle d'événements"""
+    return LoopStallsResponse(
+        enabled=LOOP_MONITOR_ENABLED,
+        threshold_ms=loop_monitor.threshold * 1000,
+        **loop_monitor.report(),
+    )
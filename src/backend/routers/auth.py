@@ -1,12 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from models.user import User
-from utils.auth_dependencies import get_current_user, hide_email
+from utils.auth_dependencies import (
+    get_current_user,
+    hide_email,
+    revoke_token,
+    security,
+)
 from schemas.user import (
     LoginRequest,
     UserCreate,
     UserResponse,
     TokenResponse,
     TokenValidationResponse,
+    UserNamesRequest,
+    UserNamesResponse,
+    UserRenameRequest,
 )
 from services.auth_service import AuthService
 
@@ -121,6 +130,36 @@ async def login(credentials: LoginRequest) -> TokenResponse:
         )
 
 
+@router.post(
+    "/api/auth/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Se déconnecter",
+    description="""
+    Révoque le token JWT de la requête : il est refusé jusqu'à son expiration.
+    La révocation est gardée en mémoire du worker qui la reçoit.
+    Route sécurisée JWT.
+    """,
+    responses={
+        204: {"description": "Token révoqué"},
+        401: {"description": "Token manquant, invalide ou déjà révoqué"},
+        503: {"description": "Trop de révocations en cours (JWT_REVOKED_SIZE)"},
+    },
+    tags=["Auth"],
+)
+async def logout(
+    current_user: User = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> None:
+    """Révoque le token courant"""
+    try:
+        revoke_token(credentials.credentials)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Déconnexion impossible: {str(e)}",
+        )
+
+
 @router.get(
     "/api/auth/me",
     response_model=UserResponse,
@@ -159,6 +198,59 @@ async def get_current_user_info(
         )
 
 
+@router.patch(
+    "/api/auth/me",
+    response_model=TokenResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Renommer l'utilisateur courant",
+    description="""
+    Change le nom de l'utilisateur authentifié (nom de connexion et nom affiché
+    comme créateur des questions). Le nom est retiré du cache des noms, et un
+    nouveau token portant le nouveau nom remplace celui de la requête, révoqué.
+    Route sécurisée JWT.
+    """,
+    responses={
+        200: {"description": "Utilisateur renommé", "model": TokenResponse},
+        400: {"description": "Nom invalide"},
+        401: {"description": "Token manquant ou invalide"},
+        404: {"description": "Utilisateur introuvable"},
+        409: {"description": "Nom déjà utilisé par un autre utilisateur"},
+        500: {"description": "Erreur interne du serveur"},
+    },
+    tags=["Auth"],
+)
+async def rename_current_user(
+    payload: UserRenameRequest,
+    current_user: User = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> TokenResponse:
+    """Renomme l'utilisateur connecté et retourne un nouveau token"""
+    name = payload.name.strip()
+    if not name:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Nom requis"
+        )
+    try:
+        result = await AuthService.rename_user(current_user, name)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors du renommage: {str(e)}",
+        )
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Utilisateur introuvable"
+        )
+    try:
+        revoke_token(credentials.credentials)
+    except RuntimeError:
+        # déjà journalisé : l'ancien token reste valide jusqu'à son expiration
+        pass
+    return result
+
+
 @router.post(
     "/api/auth/token",
     response_model=TokenValidationResponse,
@@ -240,6 +332,38 @@ async def get_user_name(
         )
 
 
+@router.post(
+    "/api/auth/users/names",
+    response_model=UserNamesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Récupérer les noms de plusieurs utilisateurs",
+    description="""
+    Retourne le nom de chaque utilisateur demandé, résolu en une seule requête
+    (cache LRU côté serveur). Les identifiants inconnus valent "Inconnu".
+    Route sécurisée JWT.
+    """,
+    responses={
+        200: {"description": "Noms des utilisateurs retournés"},
+        401: {"description": "Token d'authentification requis"},
+        500: {"description": "Erreur interne du serveur"},
+    },
+    tags=["Auth"],
+)
+async def get_user_names(
+    payload: UserNamesRequest,
+    current_user: User = Depends(get_current_user),
+) -> UserNamesResponse:
+    """Récupère les noms de plusieurs utilisateurs par leurs IDs"""
+    try:
+        names = await AuthService.get_user_names(payload.ids)
+        return UserNamesResponse(names=names)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de la récupération des noms: {str(e)}",
+        )
+
+
 # ============================================================================
 # ENDPOINTS DE DÉVELOPPEMENT - À SUPPRIMER EN PRODUCTION
 # ============================================================================
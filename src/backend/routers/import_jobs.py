@@ -0,0 +1,118 @@
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi.responses import StreamingResponse
+
+from models.import_job import ImportJob
+from models.user import User
+from schemas.import_job import ImportJobProgress, ImportJobResponse
+from services.import_job_service import import_job_service
+from utils.auth_dependencies import get_current_user
+
+router = APIRouter()
+
+
+def to_job_response(job: ImportJob) -> ImportJobResponse:
+    return ImportJobResponse(
+        id=job.id,
+        filename=job.filename,
+        status=job.status,
+        progress=ImportJobProgress(**job.progress),
+        message=job.message,
+        error=job.error,
+        error_details=job.error_details,
+        created_by=job.created_by,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.get(
+    "/api/import-jobs/{id}",
+    response_model=ImportJobResponse,
+    status_code=status.HTTP_200_OK,
+    summary="État d'un import CSV en arrière-plan",
+    description="""Retourne l'état d'une tâche créée par
+    `PUT /api/questions/from_csv?async=true` : statut, lignes traitées, questions
+    insérées et fusionnées, sujets corrigés et erreurs.
+    Route sécurisée JWT - réservée au créateur de l'import et aux ADMIN.""",
+    responses={
+        200: {"description": "État de la tâche", "model": ImportJobResponse},
+        400: {"description": "Identifiant invalide"},
+        401: {"description": "Token d'authentification requis"},
+        403: {"description": "Accès refusé"},
+        404: {"description": "Tâche introuvable"},
+        500: {"description": "Erreur interne du serveur"},
+    },
+    tags=["Questions"],
+)
+async def get_import_job(
+    id: str = Path(..., description="ID de la tâche d'import"),
+    current_user: User = Depends(get_current_user),
+) -> ImportJobResponse:
+    try:
+        return to_job_response(await import_job_service.get_job(id, current_user))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de la récupération de la tâche: {e}",
+        )
+
+
+@router.get(
+    "/api/import-jobs/{id}/events",
+    status_code=status.HTTP_200_OK,
+    summary="Progression d'un import CSV (Server-Sent Events)",
+    description="""Flux `text/event-stream` : un événement `progress` à chaque
+    changement d'état de la tâche (même contenu que `GET /api/import-jobs/{id}`),
+    puis un événement `end` lorsque la tâche est terminée, échouée ou interrompue.
+    Route sécurisée JWT - réservée au créateur de l'import et aux ADMIN.""",
+    responses={
+        200: {
+            "description": "Flux d'événements",
+            "content": {"text/event-stream": {}},
+        },
+        400: {"description": "Identifiant invalide"},
+        401: {"description": "Token d'authentification requis"},
+        403: {"description": "Accès refusé"},
+        404: {"description": "Tâche introuvable"},
+    },
+    tags=["Questions"],
+)
+async def stream_import_job(
+    id: str = Path(..., description="ID de la tâche d'import"),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    # erreurs (id, droits) renvoyées avant l'ouverture du flux
+    try:
+        await import_job_service.get_job(id, current_user)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    async def _events():
+        last = None
+        async for job in import_job_service.watch(id, current_user):
+            if job is None:
+                yield ": ping\n\n"  # commentaire : garde la connexion ouverte
+                continue
+            last = to_job_response(job).model_dump(mode="json")
+            yield f"event: progress\ndata: {json.dumps(last, ensure_ascii=False)}\n\n"
+        if last is not None:
+            yield f"event: end\ndata: {json.dumps(last, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
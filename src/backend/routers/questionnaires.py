@@ -1,8 +1,10 @@
 from enum import Enum
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.responses import StreamingResponse
 
-from models.user import User
+from models.user import User, UserRole
+from utils.question_export import ExportFormat, export_response
 from utils.auth_dependencies import get_current_user
 from schemas.questionnaire import (
     QuestionnaireCreate,
@@ -78,6 +80,49 @@ async def create_questionnaire(
         )
 
 
+# déclarée avant /api/questionnaire/{id}/{format}, qui capturerait "export"
+@router.get(
+    "/api/questionnaire/{id}/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Exporter les questions d'un questionnaire (CSV ou JSON Lines)",
+    description="""Exporte les questions du questionnaire, dans son ordre, au gabarit
+    d'import des questions (voir `/api/questions/export`), en flux.
+    Route sécurisée JWT - seuls TEACHER et ADMIN peuvent exporter.""",
+    responses={
+        200: {
+            "description": "Fichier d'export",
+            "content": {"text/csv": {}, "application/x-ndjson": {}},
+        },
+        400: {"description": "Identifiant invalide"},
+        401: {"description": "Token d'authentification requis"},
+        403: {"description": "Accès refusé - rôle insuffisant"},
+        404: {"description": "Questionnaire introuvable"},
+    },
+    tags=["Questionnaires"],
+)
+async def export_questionnaire(
+    id: str = Path(..., description="ID du questionnaire"),
+    format: ExportFormat = Query(ExportFormat.csv, description="csv ou jsonl"),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    if current_user.role not in [UserRole.TEACHER, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Seuls les enseignants et administrateurs peuvent exporter des questions",
+        )
+    # erreurs (id, questionnaire absent) renvoyées avant l'ouverture du flux
+    try:
+        questionnaire, chunks = await questionnaire_service.export_questionnaire(
+            id, format.value
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return export_response(chunks, format, f"questionnaire-{questionnaire.id}")
+
+
 class QuestionnaireFormat(str, Enum):
     short = "short"
     full = "full"
@@ -1,3 +1,5 @@
+from datetime import datetime
+from enum import Enum
 from fastapi import (
     APIRouter,
     Depends,
@@ -5,39 +7,71 @@ from fastapi import (
     HTTPException,
     Path,
     Query,
+    Response,
     UploadFile,
     status,
 )
-from typing import Any, Dict, List
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List, Optional, Union
 
 from models.user import User, UserRole
 from services.csv_import_service import CSVImportService
+from services.import_job_service import import_job_service
+from routers.import_jobs import to_job_response
+from schemas.import_job import ImportJobResponse
 from utils.auth_dependencies import get_current_user
 from schemas.question import (
     AnswerCheckResponse,
     CSVImportResponse,
+    MultiFileImportResponse,
     QuestionCreate,
+    QuestionFacetsResponse,
+    QuestionPageResponse,
     QuestionResponse,
     QuestionUpdate,
 )
-from services.question_service import QuestionService
+from services.question_service import DuplicateQuestionError, QuestionService
+from utils.question_export import ExportFormat, export_response
 
 router = APIRouter()
 question_service = QuestionService()
 csv_import_service = CSVImportService()
 
 
+class QuestionSortField(str, Enum):
+    created_at = "created_at"
+    edited_at = "edited_at"
+    question = "question"
+    status = "status"
+
+
+class SortOrder(str, Enum):
+    asc = "asc"
+    desc = "desc"
+
+
+class CSVImportMode(str, Enum):
+    insert = "insert"
+    upsert = "upsert"
+
+
+class NearDuplicateMode(str, Enum):
+    off = "off"
+    flag = "flag"
+    merge = "merge"
+
+
 @router.put(
     "/api/question",
     response_model=QuestionResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Créer une nouvelle question",
-    description="Crée une nouvelle question à partir des données JSON fournies. Route sécurisée JWT.",
+    description="Crée une nouvelle question à partir des données JSON fournies. Une question de même intitulé normalisé (casse, espaces de début et de fin et « : » final ignorés) est refusée (409). Route sécurisée JWT.",
     responses={
         201: {"description": "Question créée avec succès", "model": QuestionResponse},
         400: {"description": "Données invalides"},
         401: {"description": "Token d'authentification requis"},
-        409: {"description": "Conflit - Erreur lors de l'insertion"},
+        409: {"description": "Une question de même intitulé existe déjà"},
         500: {"description": "Erreur interne du serveur"},
     },
     tags=["Questions"],
@@ -72,6 +106,8 @@ async def create_question(
             edited_at=q.edited_at,
         )
 
+    except DuplicateQuestionError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -228,6 +264,242 @@ async def get_uses() -> List[str]:
         )
 
 
+@router.get(
+    "/api/questions/facets",
+    response_model=QuestionFacetsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Recherche à facettes",
+    description="""Retourne, pour la combinaison de filtres donnée, les compteurs par sujet,
+    usage et statut ainsi que la première page des questions correspondantes.
+    Plusieurs valeurs d'un même filtre sont combinées en OU, les filtres entre eux en ET.
+    Facettes disjonctives : les compteurs d'une facette appliquent les filtres des autres
+    facettes seulement (nombre de questions qu'ajouterait chaque valeur) ; le total et la
+    page appliquent tous les filtres.
+    Les réponses correctes ne sont visibles que pour les rôles définis. Route sécurisée JWT.""",
+    responses={
+        200: {"description": "Facettes renvoyées avec succès"},
+        401: {"description": "Token d'authentification requis"},
+        500: {"description": "Erreur interne du serveur"},
+    },
+    tags=["Questions"],
+)
+async def get_question_facets(
+    subject: Optional[List[str]] = Query(None, description="Sujets à filtrer"),
+    use: Optional[List[str]] = Query(None, description="Usages à filtrer"),
+    status_: Optional[List[str]] = Query(
+        None, alias="status", description="Statuts à filtrer (draft/active/archive)"
+    ),
+    limit: int = Query(20, ge=1, le=200, description="Taille de la première page"),
+    current_user: User = Depends(get_current_user),
+) -> QuestionFacetsResponse:
+    try:
+        user_role = (current_user.role).upper()
+        facets = await question_service.get_facets(
+            subjects=subject, uses=use, statuses=status_, limit=limit
+        )
+        items: List[QuestionResponse] = []
+        for q in facets["items"]:
+            visible_corrects = []
+            if user_role in ["TEACHER", "ADMIN"]:
+                visible_corrects = q.corrects
+            items.append(
+                QuestionResponse(
+                    id=q.id,
+                    question=q.question,
+                    subject=q.subject,
+                    use=q.use,
+                    corrects=visible_corrects,
+                    responses=q.responses or [],
+                    remark=q.remark,
+                    status=q.status or "draft",
+                    created_by=q.created_by,
+                    created_at=q.created_at,
+                    edited_at=q.edited_at,
+                )
+            )
+        return QuestionFacetsResponse(
+            total=facets["total"],
+            subject=facets["subject"],
+            use=facets["use"],
+            status=facets["status"],
+            items=items,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors du calcul des facettes: {e}",
+        )
+
+
+@router.get(
+    "/api/questions/query",
+    response_model=QuestionPageResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Rechercher des questions (filtres, tri, pagination)",
+    description="""Recherche côté serveur : filtres (sujet, usage, statut, créateur, mots
+    de l'intitulé, intervalle de dates de création), tri et pagination traduits en une requête
+    MongoDB indexée. Pages suivantes par curseur : passer `next_cursor` de la réponse dans
+    `cursor` (coût constant quelle que soit la position) ; `page` est limité aux premiers
+    résultats. Le total est plafonné (`total_capped`).
+    Les réponses correctes ne sont visibles que pour les rôles définis.
+    Route sécurisée JWT.""",
+    responses={
+        200: {"description": "Page renvoyée avec succès"},
+        400: {"description": "Curseur invalide ou page trop lointaine"},
+        401: {"description": "Token d'authentification requis"},
+        500: {"description": "Erreur interne du serveur"},
+    },
+    tags=["Questions"],
+)
+async def query_questions(
+    subject: Optional[List[str]] = Query(None, description="Sujets à filtrer"),
+    use: Optional[List[str]] = Query(None, description="Usages à filtrer"),
+    status_: Optional[List[str]] = Query(
+        None, alias="status", description="Statuts à filtrer (draft/active/archive)"
+    ),
+    created_by: Optional[List[int]] = Query(
+        None, description="Identifiants des créateurs"
+    ),
+    text: Optional[str] = Query(
+        None, max_length=200, description="Mots recherchés dans l'intitulé"
+    ),
+    created_from: Optional[datetime] = Query(
+        None, description="Date de création minimale (ISO 8601)"
+    ),
+    created_to: Optional[datetime] = Query(
+        None, description="Date de création maximale (ISO 8601)"
+    ),
+    sort: QuestionSortField = Query(
+        QuestionSortField.created_at, description="Champ de tri"
+    ),
+    order: SortOrder = Query(SortOrder.desc, description="Sens du tri"),
+    page: int = Query(1, ge=1, description="Numéro de page"),
+    page_size: int = Query(50, ge=1, le=200, description="Taille de page"),
+    cursor: Optional[str] = Query(
+        None, description="`next_cursor` de la page précédente (remplace `page`)"
+    ),
+    current_user: User = Depends(get_current_user),
+) -> QuestionPageResponse:
+    try:
+        user_role = (current_user.role).upper()
+        result = await question_service.query_questions(
+            filters={
+                "subjects": subject,
+                "uses": use,
+                "statuses": status_,
+                "created_by": created_by,
+                "text": text,
+                "created_from": created_from,
+                "created_to": created_to,
+            },
+            sort_field=sort.value,
+            sort_order=1 if order == SortOrder.asc else -1,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
+        results: List[QuestionResponse] = []
+        for q in result["items"]:
+            visible_corrects = []
+            if user_role in ["TEACHER", "ADMIN"]:
+                visible_corrects = q.corrects
+            results.append(
+                QuestionResponse(
+                    id=q.id,
+                    question=q.question,
+                    subject=q.subject,
+                    use=q.use,
+                    corrects=visible_corrects,
+                    responses=q.responses or [],
+                    remark=q.remark,
+                    status=q.status or "draft",
+                    created_by=q.created_by,
+                    created_at=q.created_at,
+                    edited_at=q.edited_at,
+                )
+            )
+        return QuestionPageResponse(
+            items=results,
+            total=result["total"],
+            total_capped=result["total_capped"],
+            page=page,
+            page_size=page_size,
+            next_cursor=result["next_cursor"],
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de la recherche de questions: {e}",
+        )
+
+
+@router.get(
+    "/api/questions/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Exporter des questions (CSV ou JSON Lines)",
+    description="""Exporte les questions filtrées (mêmes filtres que `/api/questions/query`)
+    au gabarit d'import : colonnes question, subject, use, correct, responseA, responseB,
+    responseC, responseD, remark. Le fichier peut être réimporté tel quel par
+    `/api/questions/from_csv`. Une question de plus de 4 réponses occupe plusieurs
+    lignes de même intitulé ; seuls le premier sujet et le premier usage sont exportés.
+    Le fichier est produit en flux depuis un curseur MongoDB (mémoire constante).
+    Route sécurisée JWT - seuls TEACHER et ADMIN peuvent exporter.""",
+    responses={
+        200: {
+            "description": "Fichier d'export",
+            "content": {"text/csv": {}, "application/x-ndjson": {}},
+        },
+        401: {"description": "Token d'authentification requis"},
+        403: {"description": "Accès refusé - rôle insuffisant"},
+    },
+    tags=["Questions"],
+)
+async def export_questions(
+    format: ExportFormat = Query(ExportFormat.csv, description="csv ou jsonl"),
+    subject: Optional[List[str]] = Query(None, description="Sujets à filtrer"),
+    use: Optional[List[str]] = Query(None, description="Usages à filtrer"),
+    status_: Optional[List[str]] = Query(
+        None, alias="status", description="Statuts à filtrer (draft/active/archive)"
+    ),
+    created_by: Optional[List[int]] = Query(
+        None, description="Identifiants des créateurs"
+    ),
+    text: Optional[str] = Query(
+        None, max_length=200, description="Mots recherchés dans l'intitulé"
+    ),
+    created_from: Optional[datetime] = Query(
+        None, description="Date de création minimale (ISO 8601)"
+    ),
+    created_to: Optional[datetime] = Query(
+        None, description="Date de création maximale (ISO 8601)"
+    ),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    # l'export contient les réponses correctes
+    if current_user.role not in [UserRole.TEACHER, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Seuls les enseignants et administrateurs peuvent exporter des questions",
+        )
+
+    chunks = question_service.export_questions(
+        filters={
+            "subjects": subject,
+            "uses": use,
+            "statuses": status_,
+            "created_by": created_by,
+            "text": text,
+            "created_from": created_from,
+            "created_to": created_to,
+        },
+        format=format.value,
+    )
+    return export_response(chunks, format, "questions")
+
+
 @router.get(
     "/api/questions/subjects/{subject_name}",
     response_model=List[QuestionResponse],
@@ -296,6 +568,7 @@ async def get_questions_by_subject_name(
         401: {"description": "Token d'authentification requis"},
         403: {"description": "Accès refusé - seul le créateur peut modifier"},
         404: {"description": "Question introuvable"},
+        409: {"description": "Une autre question a déjà cet intitulé"},
         500: {"description": "Erreur interne du serveur"},
     },
     tags=["Questions"],
@@ -331,6 +604,8 @@ async def update_question(
             edited_at=updated.edited_at,
         )
 
+    except DuplicateQuestionError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except LookupError as e:
@@ -346,17 +621,32 @@ async def update_question(
 
 @router.put(
     "/api/questions/from_csv",
-    response_model=CSVImportResponse,
+    response_model=Union[CSVImportResponse, ImportJobResponse],
     status_code=status.HTTP_201_CREATED,
     summary="Importer des questions depuis un fichier CSV",
     description="""
     Importe des questions en masse depuis un fichier CSV.
     Le CSV doit contenir les colonnes: question, subject, use, correct, responseA, responseB, responseC, responseD, remark.
+    Mêmes champs acceptés en JSON Lines (`.jsonl`, un objet par ligne) et en
+    classeur Excel (`.xlsx`, première feuille, en-têtes en première ligne).
     Fusionne automatiquement les questions identiques et corrige les sujets similaires.
+    Avec `mode=upsert`, les questions déjà en base (même intitulé normalisé)
+    reçoivent les réponses du fichier au lieu d'être rejetées comme doublons :
+    réimporter le même fichier ne crée aucune question.
+    `near_duplicates=flag` signale les quasi-doublons (intitulés à un article,
+    une ponctuation ou une faute de frappe près, en base ou dans le fichier) ;
+    `near_duplicates=merge` les fusionne dans la question similaire.
+    Avec `async=true`, la réponse (202) est immédiate et contient l'identifiant
+    d'une tâche d'import en arrière-plan, suivie via `GET /api/import-jobs/{id}`
+    ou le flux SSE `GET /api/import-jobs/{id}/events`.
     Route sécurisée JWT - seuls TEACHER et ADMIN peuvent importer.
     """,
     responses={
         201: {"description": "Import réussi", "model": CSVImportResponse},
+        202: {
+            "description": "Import en arrière-plan accepté",
+            "model": ImportJobResponse,
+        },
         400: {"description": "Fichier CSV invalide ou données incorrectes"},
         401: {"description": "Token d'authentification requis"},
         403: {"description": "Accès refusé - rôle insuffisant"},
@@ -366,11 +656,25 @@ async def update_question(
     tags=["Questions"],
 )
 async def import_csv(
-    file: UploadFile = File(..., description="Fichier CSV à importer (max 10MB)"),
+    response: Response,
+    file: UploadFile = File(
+        ..., description="Fichier CSV ou JSONL (UTF-8), ou classeur XLSX, à importer"
+    ),
     fix_subjects: bool = True,
     subject_threshold: float = 0.90,
+    async_import: bool = Query(
+        False, alias="async", description="Import en arrière-plan (tâche)"
+    ),
+    mode: CSVImportMode = Query(
+        CSVImportMode.insert,
+        description="insert : doublons de la base en erreur ; upsert : fusion",
+    ),
+    near_duplicates: NearDuplicateMode = Query(
+        NearDuplicateMode.off,
+        description="Quasi-doublons : off, flag (signalés) ou merge (fusionnés)",
+    ),
     current_user: User = Depends(get_current_user),
-) -> CSVImportResponse:
+) -> Union[CSVImportResponse, ImportJobResponse]:
     """Importe des questions depuis un fichier CSV"""
     try:
         # Vérification des permissions - Accès direct aux propriétés de l'objet User
@@ -392,12 +696,26 @@ async def import_csv(
         if isinstance(user_id, str) and user_id.isdigit():
             user_id = int(user_id)
 
+        if async_import:
+            job = await import_job_service.submit(
+                file=file,
+                user_id=user_id,
+                fix_subjects=fix_subjects,
+                subject_threshold=subject_threshold,
+                upsert=mode == CSVImportMode.upsert,
+                near_duplicates=near_duplicates.value,
+            )
+            response.status_code = status.HTTP_202_ACCEPTED
+            return to_job_response(job)
+
         # Import via le service
         return await csv_import_service.import_questions_from_csv(
             file=file,
             user_id=user_id,
             fix_subjects=fix_subjects,
             subject_threshold=subject_threshold,
+            upsert=mode == CSVImportMode.upsert,
+            near_duplicates=near_duplicates.value,
         )
 
     except ValueError as e:
@@ -409,3 +727,82 @@ async def import_csv(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de l'import CSV: {str(e)}",
         )
+
+
+@router.put(
+    "/api/questions/from_files",
+    response_model=MultiFileImportResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Importer des questions depuis plusieurs fichiers CSV ou une archive ZIP",
+    description="""
+    Importe en une fois plusieurs fichiers CSV, JSONL ou XLSX (mêmes formats
+    que `/api/questions/from_csv`) et/ou des archives ZIP de tels fichiers.
+    Les fichiers sont analysés en parallèle ; les sujets sont corrigés et les
+    doublons fusionnés d'un fichier à l'autre comme dans un seul fichier.
+    La réponse contient le bilan de chaque fichier (un fichier illisible y est
+    signalé sans bloquer les autres) et le bilan global.
+    Options `fix_subjects`, `subject_threshold`, `mode` et `near_duplicates`
+    identiques à l'import d'un fichier.
+    Route sécurisée JWT - seuls TEACHER et ADMIN peuvent importer.
+    """,
+    responses={
+        201: {"description": "Import réussi", "model": MultiFileImportResponse},
+        400: {"description": "Fichier ou archive invalide"},
+        401: {"description": "Token d'authentification requis"},
+        403: {"description": "Accès refusé - rôle insuffisant"},
+        500: {"description": "Erreur interne du serveur"},
+    },
+    tags=["Questions"],
+)
+async def import_files(
+    files: List[UploadFile] = File(
+        ..., description="Fichiers CSV, JSONL ou XLSX, ou archives ZIP de fichiers"
+    ),
+    fix_subjects: bool = True,
+    subject_threshold: float = 0.90,
+    mode: CSVImportMode = Query(
+        CSVImportMode.insert,
+        description="insert : doublons de la base en erreur ; upsert : fusion",
+    ),
+    near_duplicates: NearDuplicateMode = Query(
+        NearDuplicateMode.off,
+        description="Quasi-doublons : off, flag (signalés) ou merge (fusionnés)",
+    ),
+    current_user: User = Depends(get_current_user),
+) -> MultiFileImportResponse:
+    """Importe des questions depuis plusieurs fichiers CSV ou archives ZIP"""
+    try:
+        if current_user.role not in [UserRole.TEACHER, UserRole.ADMIN]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Seuls les enseignants et administrateurs peuvent importer des questions",
+            )
+
+        if not current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Token JWT invalide - ID utilisateur manquant",
+            )
+
+        user_id = current_user.id
+        if isinstance(user_id, str) and user_id.isdigit():
+            user_id = int(user_id)
+
+        return await csv_import_service.import_questions_from_files(
+            files=files,
+            user_id=user_id,
+            fix_subjects=fix_subjects,
+            subject_threshold=subject_threshold,
+            upsert=mode == CSVImportMode.upsert,
+            near_duplicates=near_duplicates.value,
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de l'import: {str(e)}",
+        )
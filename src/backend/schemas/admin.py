@@ -0,0 +1,65 @@
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field
+
+
+class SlowQueryShape(BaseModel):
+    """Forme de requête MongoDB lente, agrégée"""
+
+    collection: str = Field(..., description="Collection interrogée")
+    operation: str = Field(..., description="Commande MongoDB (find, aggregate...)")
+    shape: str = Field(..., description="Filtre normalisé (valeurs remplacées par ?)")
+    count: int = Field(..., description="Nombre d'occurrences au-delà du seuil")
+    avg_ms: float = Field(..., description="Durée moyenne (ms)")
+    max_ms: float = Field(..., description="Durée maximale (ms)")
+    winning_plan: Optional[Any] = Field(
+        None, description="Plan gagnant retourné par explain()"
+    )
+
+
+class SlowQueriesResponse(BaseModel):
+    """Liste des formes de requêtes les plus lentes"""
+
+    threshold_ms: float = Field(
+        ..., description="Seuil du journal des requêtes lentes (ms)"
+    )
+    items: List[SlowQueryShape]
+
+
+class ProfileInfo(BaseModel):
+    """Profil de requête enregistré (format pstats)"""
+
+    name: str = Field(..., description="Nom du fichier")
+    size: int = Field(..., description="Taille en octets")
+    created_at: float = Field(..., description="Date de création (timestamp)")
+
+
+class ProfileListResponse(BaseModel):
+    """Profils disponibles, du plus récent au plus ancien"""
+
+    enabled: bool = Field(..., description="Profilage actif sur ce worker")
+    items: List[ProfileInfo]
+
+
+class BlockingSite(BaseModel):
+    """Appel synchrone ayant bloqué la boucle d'événements"""
+
+    site: str = Field(..., description="Fichier:ligne (fonction) du code applicatif")
+    count: int = Field(..., description="Nombre de blocages relevés")
+
+
+class LoopStall(BaseModel):
+    """Blocage relevé par le chien de garde"""
+
+    at: float = Field(..., description="Date du relevé (timestamp)")
+    blocked_ms: float = Field(..., description="Durée du blocage au moment du relevé")
+    site: str = Field(..., description="Site bloquant")
+    stack: List[str] = Field(..., description="Pile du thread de la boucle")
+
+
+class LoopStallsResponse(BaseModel):
+    """Sites bloquants et blocages récents"""
+
+    enabled: bool = Field(..., description="Surveillance active sur ce worker")
+    threshold_ms: float = Field(..., description="Seuil de blocage (ms)")
+    sites: List[BlockingSite]
+    recent: List[LoopStall]
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from models.import_job import ImportJobStatus
+
+
+class ImportJobProgress(BaseModel):
+    """Compteurs d'avancement d'un import"""
+
+    total_rows: int = Field(0, description="Lignes du CSV traitées")
+    imported: int = Field(0, description="Questions insérées")
+    merged: int = Field(0, description="Doublons fusionnés")
+    subject_corrections: int = Field(0, description="Sujets corrigés")
+    errors: int = Field(0, description="Questions en erreur")
+    near_duplicates: int = Field(0, description="Quasi-doublons trouvés")
+
+
+class ImportJobResponse(BaseModel):
+    """État d'une tâche d'import CSV en arrière-plan"""
+
+    id: str = Field(..., description="Identifiant de la tâche")
+    filename: str = Field(..., description="Nom du fichier importé")
+    status: ImportJobStatus = Field(
+        ..., description="pending, running, completed, failed ou interrupted"
+    )
+    progress: ImportJobProgress
+    message: Optional[str] = Field(None, description="Bilan de l'import terminé")
+    error: Optional[str] = Field(None, description="Cause de l'échec")
+    error_details: List[Dict[str, str]] = Field(
+        [], description="Premières questions en erreur"
+    )
+    created_by: Optional[int] = Field(None, description="Identifiant du créateur")
+    created_at: Optional[datetime] = Field(None, description="Date de soumission")
+    started_at: Optional[datetime] = Field(None, description="Début du traitement")
+    finished_at: Optional[datetime] = Field(None, description="Fin du traitement")
@@ -41,6 +41,47 @@ class QuestionResponse(BaseModel):
     edited_at: Optional[datetime] = Field(None, description="Date de modification")
 
 
+class FacetCount(BaseModel):
+    """
+    Compteur d'une valeur de facette (sujet, usage ou statut).
+    """
+
+    value: str = Field(..., description="Valeur de la facette.")
+    count: int = Field(..., ge=0, description="Nombre de questions correspondantes.")
+
+
+class QuestionFacetsResponse(BaseModel):
+    """
+    Réponse de la recherche à facettes : compteurs par sujet, usage et statut
+    et première page des questions correspondant aux filtres.
+    """
+
+    total: int = Field(..., ge=0, description="Nombre total de questions filtrées.")
+    subject: List[FacetCount] = Field(..., description="Compteurs par sujet.")
+    use: List[FacetCount] = Field(..., description="Compteurs par usage.")
+    status: List[FacetCount] = Field(..., description="Compteurs par statut.")
+    items: List[QuestionResponse] = Field(
+        ..., description="Première page des questions filtrées."
+    )
+
+
+class QuestionPageResponse(BaseModel):
+    """
+    Page de résultats de la recherche serveur sur les questions.
+    """
+
+    items: List[QuestionResponse] = Field(..., description="Questions de la page.")
+    total: int = Field(..., ge=0, description="Nombre total de questions filtrées.")
+    total_capped: bool = Field(
+        False, description="Total plafonné (il y a plus de questions que `total`)."
+    )
+    page: int = Field(..., ge=1, description="Numéro de la page (à partir de 1).")
+    page_size: int = Field(..., ge=1, description="Nombre d'éléments par page.")
+    next_cursor: Optional[str] = Field(
+        None, description="Curseur de la page suivante (absent en fin de liste)."
+    )
+
+
 class QuestionUpdate(BaseModel):
     """
     Schéma d'entrée pour la mise à jour partielle d'une question.
@@ -91,9 +132,36 @@ class CSVImportResponse(BaseModel):
     errors: int
     merged: int
     error_details: List[Dict[str, str]]
+    near_duplicates: int = 0
+    near_duplicate_details: List[Dict[str, str]] = []
     message: str
 
 
+class CSVFileImportReport(BaseModel):
+    """Bilan d'un fichier d'un import multi-fichiers"""
+
+    filename: str = Field(
+        ..., description="Nom du fichier (archive/fichier pour un ZIP)"
+    )
+    total_rows: int = Field(0, description="Lignes du CSV traitées")
+    questions: int = Field(0, description="Questions distinctes du fichier")
+    imported: int = Field(0, description="Questions du fichier créées en base")
+    merged: int = Field(
+        0,
+        description="Doublons fusionnés (dans le fichier, avec un fichier précédent ou avec une question déjà en base)",
+    )
+    subject_corrections: int = Field(0, description="Sujets corrigés")
+    errors: int = Field(0, description="Questions en erreur")
+    error: Optional[str] = Field(None, description="Cause du rejet du fichier")
+
+
+class MultiFileImportResponse(BaseModel):
+    """Réponse de l'import de plusieurs fichiers CSV ou d'archives ZIP"""
+
+    files: List[CSVFileImportReport]
+    summary: CSVImportResponse
+
+
 class CSVImportStats(BaseModel):
     """Statistiques de l'import"""
 
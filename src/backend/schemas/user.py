@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, EmailStr, Field
 from models.user import UserRole
 
@@ -65,3 +65,30 @@ class TokenValidationResponse(BaseModel):
     message: Optional[str] = Field(
         None, description="Message d'erreur si le token est invalide"
     )
+
+
+class UserRenameRequest(BaseModel):
+    """Schéma pour le renommage de l'utilisateur courant"""
+
+    name: str = Field(
+        ..., min_length=1, max_length=100, description="Nouveau nom", examples=["Bob"]
+    )
+
+
+class UserNamesRequest(BaseModel):
+    """Schéma pour la résolution groupée de noms d'utilisateurs"""
+
+    ids: List[int] = Field(
+        ...,
+        max_length=1000,
+        description="Identifiants des utilisateurs",
+        examples=[[1, 2, 3]],
+    )
+
+
+class UserNamesResponse(BaseModel):
+    """Schéma de réponse : nom de chaque utilisateur demandé"""
+
+    names: Dict[int, str] = Field(
+        ..., description="Nom par identifiant ('Inconnu' si introuvable)"
+    )
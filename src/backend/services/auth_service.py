@@ -1,22 +1,47 @@
+import asyncio
+import contextvars
+import logging
 import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import jwt
-import bcrypt
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 from models.user import User, UserRole
 from schemas.user import UserCreate, UserResponse, TokenResponse
-from utils.sq_database import Connection
+from utils.cache import LRUCache
+from utils.hashing import password_hasher
+from utils.metrics import register_cache, register_executor
+from utils.sq_database import sqlite_pool
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Configuration JWT
 JWT_SECRET = os.getenv("JWT_SECRET", "dev-only-unsafe-secret")
 JWT_ALG = "HS256"
 JWT_EXPIRE_MIN = 60
 
+# Exécuteur des accès SQLite : chaque thread garde sa connexion du pool
+SQLITE_WORKERS = int(os.getenv("SQLITE_WORKERS", "8"))
+_db_executor = ThreadPoolExecutor(
+    max_workers=SQLITE_WORKERS, thread_name_prefix="sqlite"
+)
+
+# Cache id -> nom, invalidé au renommage ; le TTL couvre les modifications hors API
+user_names_cache = LRUCache(
+    maxsize=int(os.getenv("USER_NAMES_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("USER_NAMES_CACHE_TTL", "300")),
+)
+register_executor("sqlite", _db_executor)
+register_cache("user_names", user_names_cache)
+# Nombre maximal de paramètres par requête IN (limite SQLite historique : 999)
+SQLITE_IN_CHUNK = 500
 
-class AuthService(Connection):
+
+class AuthService:
     """
     Service d'authentification unifié gérant :
     - Authentification avec BDD (login/register)
@@ -74,13 +99,13 @@ class AuthService(Connection):
             payload["isAuth"] = True
             return User.model_validate(payload)
         except jwt.ExpiredSignatureError:
-            print("Token expiré")
+            logger.debug("Token expiré")
             return None
         except jwt.InvalidTokenError as e:
-            print(f"Token invalide: {e}")
+            logger.info("Token invalide: %s", e)
             return None
         except Exception as e:
-            print(f"Erreur lors du décodage du token: {e}")
+            logger.exception("Erreur lors du décodage du token")
             return None
 
     # ==================== AUTHENTICATION WITH DATABASE ====================
@@ -91,6 +116,8 @@ class AuthService(Connection):
     ) -> Tuple[Optional[User], Optional[str]]:
         """
         Authentifie un utilisateur avec la base de données.
+        La requête SQLite et la vérification bcrypt s'exécutent hors de la
+        boucle d'événements.
 
         Args:
             username: Nom d'utilisateur
@@ -100,28 +127,15 @@ class AuthService(Connection):
             Tuple[Optional[User], Optional[str]]: (Utilisateur, Token) ou (None, None)
         """
         try:
-            cls.connect()
-
-            query = """
-                SELECT u.*, r.role as role 
-                FROM users u 
-                LEFT JOIN roles r ON u.role_id = r.id 
-                WHERE u.name = ?
-            """
-            cls.cursor.execute(query, (username,))
-            result = cls.cursor.fetchone()
+            result = await cls._run_db(cls._fetch_user_by_name, username)
 
             if not result:
-                print(f"Utilisateur non trouvé: {username}")
+                logger.info("Utilisateur non trouvé", extra={"username": username})
                 return None, None
 
             # Vérification du mot de passe avec bcrypt
-            stored_password = result["password"]
-            if isinstance(stored_password, str):
-                stored_password = stored_password.encode("utf-8")
-
-            if not bcrypt.checkpw(password.encode("utf-8"), stored_password):
-                print(f"Mot de passe incorrect pour: {username}")
+            if not await password_hasher.check(password, result["password"]):
+                logger.info("Mot de passe incorrect", extra={"username": username})
                 return None, None
 
             # Création de l'utilisateur authentifié
@@ -132,19 +146,22 @@ class AuthService(Connection):
             # Génération du token
             token = cls._generate_token_for_user(authenticated_user)
 
-            print(f"✅ Authentification réussie: {authenticated_user.name}/{token}")
+            logger.info(
+                "Authentification réussie",
+                extra={"user_id": authenticated_user.id},
+            )
             return authenticated_user, token
 
         except Exception as err:
-            print(f"❌ Erreur lors de l'authentification: {err}")
+            logger.exception("Erreur lors de l'authentification: %s", err)
             return None, None
-        finally:
-            cls.close()
 
     @classmethod
     async def register(cls, user_data: UserCreate) -> Optional[TokenResponse]:
         """
         Crée un nouveau compte utilisateur.
+        Les accès SQLite et le hachage bcrypt s'exécutent hors de la
+        boucle d'événements.
 
         Args:
             user_data: Données du nouvel utilisateur
@@ -153,34 +170,24 @@ class AuthService(Connection):
             Optional[TokenResponse]: Réponse avec token et user, ou None si échec
         """
         try:
-            cls.connect()
-            print("📡 Connexion BDD réussie")
-
             # Vérification de l'email unique
-            if await cls._email_exists(user_data.email):
-                print(f"⚠️ Email déjà utilisé: {user_data.email}")
+            if await cls._run_db(cls._email_exists, user_data.email):
+                logger.info("Email déjà utilisé lors de l'inscription")
                 return None
 
             # Hash du mot de passe
-            hashed_password = cls._hash_password(user_data.password)
-
-            # Récupération du role_id
-            role_id = await cls._get_role_id(user_data.role.value)
-            if not role_id:
-                raise RuntimeError(f"Rôle '{user_data.role.value}' introuvable")
-
-            # Insertion en base
-            user_id = await cls._insert_user(
-                user_data.name, user_data.email, hashed_password, role_id
+            hashed_password = await password_hasher.hash(user_data.password)
+
+            # Insertion en base et récupération de l'utilisateur créé
+            created_user = await cls._run_db(
+                cls._create_user,
+                user_data.name,
+                user_data.email,
+                hashed_password,
+                user_data.role.value,
             )
-
-            cls.connexion.commit()
-            print(f"✅ Utilisateur créé avec ID: {user_id}")
-
-            # Récupération de l'utilisateur créé
-            created_user = await cls._get_user_by_id(user_id)
             if not created_user:
-                print("❌ Impossible de récupérer l'utilisateur créé")
+                logger.error("Impossible de récupérer l'utilisateur créé")
                 return None
 
             # Génération du token
@@ -197,12 +204,8 @@ class AuthService(Connection):
             )
 
         except Exception as err:
-            print(f"❌ Erreur lors de la création du compte: {err}")
-            if cls.connexion:
-                cls.connexion.rollback()
+            logger.exception("Erreur lors de la création du compte: %s", err)
             return None
-        finally:
-            cls.close()
 
     # ==================== TEST MODE (sans BDD) ====================
 
@@ -239,28 +242,98 @@ class AuthService(Connection):
     @classmethod
     async def get_user_by_id(cls, user_id: int) -> Optional[User]:
         """Récupère un utilisateur par son ID."""
-        return await cls._get_user_by_id(user_id)
+        return await cls._run_db(cls._get_user_by_id, user_id)
 
     @classmethod
     async def get_user_name(cls, user_id: int) -> str:
         """Récupère le nom d'un utilisateur par son ID."""
-        try:
-            cls.connect()
-            query = "SELECT name FROM users WHERE id = ?"
-            cls.cursor.execute(query, (user_id,))
-            result = cls.cursor.fetchone()
-
-            if result and "name" in result.keys():
-                return result["name"]
-            return "Inconnu"
-        except Exception as err:
-            print(f"❌ Erreur getUserName: {err}")
-            return "Inconnu"
-        finally:
-            cls.close()
+        names = await cls.get_user_names([user_id])
+        return names[user_id]
+
+    @classmethod
+    async def get_user_names(cls, user_ids: List[int]) -> Dict[int, str]:
+        """
+        Résout les noms de plusieurs utilisateurs : cache LRU d'abord, puis une
+        requête `IN` pour les identifiants manquants. Les inconnus valent "Inconnu".
+        """
+        names: Dict[int, str] = {}
+        missing: List[int] = []
+        for user_id in dict.fromkeys(user_ids):
+            cached = user_names_cache.get(user_id)
+            if cached is not None:
+                names[user_id] = cached
+            else:
+                missing.append(user_id)
+
+        if missing:
+            try:
+                fetched = await cls._run_db(cls._fetch_user_names, missing)
+            except Exception as err:
+                logger.exception("Erreur getUserNames: %s", err)
+                fetched = {}
+            for user_id in missing:
+                if user_id in fetched:
+                    user_names_cache.set(user_id, fetched[user_id])
+                names[user_id] = fetched.get(user_id, "Inconnu")
+
+        return names
+
+    @classmethod
+    async def rename_user(cls, user: User, name: str) -> Optional[TokenResponse]:
+        """
+        Renomme un utilisateur, invalide son entrée dans le cache des noms et
+        retourne un token portant le nouveau nom.
+
+        Returns:
+            Optional[TokenResponse]: Nouveau token, ou None si l'utilisateur
+            n'existe plus
+        Raises:
+            ValueError: Si le nom est déjà celui d'un autre utilisateur (la
+                connexion se fait par nom)
+        """
+        if await cls._run_db(cls._name_taken, name, user.id):
+            raise ValueError("Nom d'utilisateur déjà utilisé")
+        updated = await cls._run_db(cls._update_user_name, user.id, name)
+        cls.invalidate_user_names(user.id)
+        if not updated:
+            return None
+
+        renamed = user.model_copy(update={"name": name})
+        return TokenResponse(
+            access_token=cls._generate_token_for_user(renamed),
+            user=UserResponse(
+                id=renamed.id,
+                name=renamed.name,
+                email=renamed.email,
+                role=renamed.role,
+            ),
+        )
+
+    @staticmethod
+    def invalidate_user_names(*user_ids: int) -> None:
+        """Invalide le cache des noms (tout le cache si aucun ID n'est fourni)."""
+        if not user_ids:
+            user_names_cache.clear()
+        for user_id in user_ids:
+            user_names_cache.pop(user_id)
 
     # ==================== PRIVATE HELPER METHODS ====================
 
+    @classmethod
+    async def _run_db(cls, func, *args):
+        """
+        Exécute une fonction d'accès SQLite dans l'exécuteur dédié, avec la
+        connexion du pool propre au thread worker (premier argument de `func`).
+        """
+
+        def _job():
+            return func(sqlite_pool.get(), *args)
+
+        # le contexte (identifiant de requête des logs) suit le thread worker
+        ctx = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_db_executor, ctx.run, _job)
+
     @classmethod
     def _generate_token_for_user(cls, user: User, scope: Optional[str] = None) -> str:
         """Génère un token JWT pour un utilisateur donné."""
@@ -276,60 +349,127 @@ class AuthService(Connection):
 
         return cls.create_access_token(subject=user.email, claims=token_claims)
 
-    @staticmethod
-    def _hash_password(password: str) -> str:
-        """Hash un mot de passe avec bcrypt."""
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
-        return hashed.decode("utf-8")
+    @classmethod
+    def _fetch_user_by_name(
+        cls, conn: sqlite3.Connection, username: str
+    ) -> Optional[Dict[str, Any]]:
+        """Récupère la ligne utilisateur (avec son rôle) par son nom."""
+        query = """
+            SELECT u.*, r.role as role 
+            FROM users u 
+            LEFT JOIN roles r ON u.role_id = r.id 
+            WHERE u.name = ?
+        """
+        result = conn.execute(query, (username,)).fetchone()
+        return dict(result) if result else None
+
+    @classmethod
+    def _fetch_user_names(
+        cls, conn: sqlite3.Connection, user_ids: List[int]
+    ) -> Dict[int, str]:
+        """Récupère les noms d'une liste d'utilisateurs (requêtes IN par lots)."""
+        names: Dict[int, str] = {}
+        for i in range(0, len(user_ids), SQLITE_IN_CHUNK):
+            chunk = user_ids[i : i + SQLITE_IN_CHUNK]
+            placeholders = ", ".join("?" for _ in chunk)
+            query = f"SELECT id, name FROM users WHERE id IN ({placeholders})"
+            for row in conn.execute(query, chunk):
+                names[row["id"]] = row["name"]
+        return names
+
+    @classmethod
+    def _update_user_name(
+        cls, conn: sqlite3.Connection, user_id: int, name: str
+    ) -> bool:
+        """Met à jour le nom d'un utilisateur."""
+        try:
+            cursor = conn.execute(
+                "UPDATE users SET name = ? WHERE id = ?", (name, user_id)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+        except Exception:
+            conn.rollback()
+            raise
 
     @classmethod
-    async def _email_exists(cls, email: str) -> bool:
+    def _name_taken(cls, conn: sqlite3.Connection, name: str, user_id: int) -> bool:
+        """Vérifie si un autre utilisateur porte déjà ce nom."""
+        query = "SELECT COUNT(*) as count FROM users WHERE name = ? AND id != ?"
+        result = conn.execute(query, (name, user_id)).fetchone()
+        return bool(result and result["count"] > 0)
+
+    @classmethod
+    def _email_exists(cls, conn: sqlite3.Connection, email: str) -> bool:
         """Vérifie si un email existe déjà en base."""
         query = "SELECT COUNT(*) as count FROM users WHERE email = ?"
-        cls.cursor.execute(query, (email,))
-        result = cls.cursor.fetchone()
-        return result and result["count"] > 0
+        result = conn.execute(query, (email,)).fetchone()
+        return bool(result and result["count"] > 0)
 
     @classmethod
-    async def _get_role_id(cls, role_name: str) -> Optional[int]:
+    def _get_role_id(cls, conn: sqlite3.Connection, role_name: str) -> Optional[int]:
         """Récupère l'ID d'un rôle par son nom."""
         query = "SELECT id FROM Roles WHERE role = ?"
-        cls.cursor.execute(query, (role_name,))
-        result = cls.cursor.fetchone()
+        result = conn.execute(query, (role_name,)).fetchone()
         return result["id"] if result else None
 
     @classmethod
-    async def _insert_user(
-        cls, name: str, email: str, hashed_password: str, role_id: int
+    def _insert_user(
+        cls,
+        conn: sqlite3.Connection,
+        name: str,
+        email: str,
+        hashed_password: str,
+        role_id: int,
     ) -> int:
         """Insère un nouvel utilisateur en base."""
         query = """
             INSERT INTO users (name, email, password, role_id)
             VALUES (?, ?, ?, ?)
         """
-        cls.cursor.execute(query, (name, email, hashed_password, role_id))
-        return cls.cursor.lastrowid
+        cursor = conn.execute(query, (name, email, hashed_password, role_id))
+        return cursor.lastrowid
 
     @classmethod
-    async def _get_user_by_id(cls, user_id: int) -> Optional[User]:
-        """Récupère un utilisateur complet par son ID."""
+    def _create_user(
+        cls,
+        conn: sqlite3.Connection,
+        name: str,
+        email: str,
+        hashed_password: str,
+        role_name: str,
+    ) -> Optional[User]:
+        """Insère l'utilisateur dans une transaction et le relit."""
         try:
-            cls.connect()
-            query = """
-                SELECT u.*, r.role as role 
-                FROM users u 
-                LEFT JOIN roles r ON u.role_id = r.id 
-                WHERE u.id = ?
-            """
-            cls.cursor.execute(query, (user_id,))
-            result = cls.cursor.fetchone()
-
-            if result:
-                user_data = dict(result)
-                user_data.setdefault("isAuth", False)
-                user_data["password"] = "[PROTECTED]"
-                return User(**user_data)
-            return None
-        finally:
-            cls.close()
+            role_id = cls._get_role_id(conn, role_name)
+            if not role_id:
+                raise RuntimeError(f"Rôle '{role_name}' introuvable")
+
+            user_id = cls._insert_user(conn, name, email, hashed_password, role_id)
+            conn.commit()
+            logger.info("Utilisateur créé", extra={"user_id": user_id})
+        except Exception:
+            conn.rollback()
+            raise
+
+        return cls._get_user_by_id(conn, user_id)
+
+    @classmethod
+    def _get_user_by_id(
+        cls, conn: sqlite3.Connection, user_id: int
+    ) -> Optional[User]:
+        """Récupère un utilisateur complet par son ID."""
+        query = """
+            SELECT u.*, r.role as role 
+            FROM users u 
+            LEFT JOIN roles r ON u.role_id = r.id 
+            WHERE u.id = ?
+        """
+        result = conn.execute(query, (user_id,)).fetchone()
+
+        if result:
+            user_data = dict(result)
+            user_data.setdefault("isAuth", False)
+            user_data["password"] = "[PROTECTED]"
+            return User(**user_data)
+        return None
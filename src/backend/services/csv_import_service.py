@@ -1,8 +1,79 @@
-from typing import List, Dict, Any
+import asyncio
+import csv
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path, PurePosixPath
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, List, Optional, Set, Tuple
 from fastapi import UploadFile
-from schemas.question import QuestionCreate, CSVImportResponse
+from starlette.concurrency import run_in_threadpool
+from schemas.question import (
+    CSVFileImportReport,
+    CSVImportResponse,
+    MultiFileImportResponse,
+    QuestionCreate,
+)
+from services.near_duplicate_service import NearDuplicateService
 from services.question_service import QuestionService
-from utils.csv_processor import CSVQuestionProcessor
+from utils.csv_processor import CSVBatch, CSVQuestionProcessor, process_import_file
+from utils.import_readers import READERS, import_format, open_rows
+
+logger = logging.getLogger(__name__)
+
+# Questions écrites par lot (insert_many) pendant l'import
+CSV_IMPORT_BATCH_SIZE = int(os.getenv("CSV_IMPORT_BATCH_SIZE", "1000"))
+# Taille maximale du fichier en Mo (0 : pas de limite)
+CSV_IMPORT_MAX_MB = float(os.getenv("CSV_IMPORT_MAX_MB", "0"))
+# Import multi-fichiers : processus d'analyse des fichiers, et nombre maximal
+# de fichiers CSV (archives ZIP dépliées)
+CSV_IMPORT_WORKERS = int(
+    os.getenv("CSV_IMPORT_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+CSV_IMPORT_MAX_FILES = int(os.getenv("CSV_IMPORT_MAX_FILES", "200"))
+# Archives ZIP : taille décompressée totale maximale en Mo et taux de
+# compression maximal d'un fichier, appliqués même sans CSV_IMPORT_MAX_MB
+CSV_IMPORT_MAX_UNCOMPRESSED_MB = float(
+    os.getenv("CSV_IMPORT_MAX_UNCOMPRESSED_MB", "1024")
+)
+CSV_IMPORT_MAX_RATIO = float(os.getenv("CSV_IMPORT_MAX_RATIO", "100"))
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Pool de processus d'analyse des fichiers, créé au premier import"""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=CSV_IMPORT_WORKERS)
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    """Arrête les processus d'analyse (arrêt de l'application ou pool cassé)"""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+class _ImportTotals:
+    """Compteurs d'un import, cumulés lot après lot"""
+
+    def __init__(self):
+        self.imported = 0
+        # questions fusionnées dans un document existant (mode upsert)
+        self.merged_existing = 0
+        self.attempted = 0
+        self.errors: List[Dict[str, str]] = []
+        # quasi-doublons trouvés (seuls les 10 premiers sont détaillés)
+        self.near_count = 0
+        self.near_details: List[Dict[str, str]] = []
+        # quasi-doublons fusionnés (near_duplicates="merge")
+        self.near_merged = 0
 
 
 class CSVImportService:
@@ -10,6 +81,7 @@ class CSVImportService:
 
     def __init__(self):
         self.question_service = QuestionService()
+        self.near_duplicate_service = NearDuplicateService()
 
     async def import_questions_from_csv(
         self,
@@ -17,70 +89,421 @@ class CSVImportService:
         user_id: int,
         fix_subjects: bool = True,
         subject_threshold: float = 0.90,
+        upsert: bool = False,
+        near_duplicates: str = "off",
     ) -> CSVImportResponse:
-        """Importe des questions depuis un fichier CSV"""
+        """
+        Importe des questions depuis un fichier CSV, JSONL ou XLSX (selon son
+        extension, voir `utils/import_readers.py`), en flux : le fichier est
+        lu et traité par lots de CSV_IMPORT_BATCH_SIZE questions, chaque
+        lot est écrit en base avant la lecture du suivant (mémoire bornée
+        quelle que soit la taille du fichier). Les doublons exacts d'une
+        question déjà écrite sont fusionnés dans le document existant.
+
+        Avec `upsert`, les questions déjà présentes en base (même intitulé
+        normalisé, y compris d'un import précédent) reçoivent les nouvelles
+        réponses au lieu d'être signalées en erreur : l'import peut être
+        rejoué sans créer de doublons.
+
+        `near_duplicates` : "flag" signale les quasi-doublons (MinHash/LSH,
+        en base ou dans le fichier), "merge" les fusionne dans la question
+        similaire, "off" (défaut) ne les recherche pas.
+        """
 
         # Validation du fichier
-        self._validate_csv_file(file)
+        self.validate_csv_file(file)
+
+        return await self.import_csv_stream(
+            file.file,
+            user_id,
+            fix_subjects,
+            subject_threshold,
+            upsert=upsert,
+            near_duplicates=near_duplicates,
+            filename=file.filename,
+        )
 
-        # Lecture du contenu
-        content = await file.read()
-        csv_content = content.decode("utf-8")
+    async def import_questions_from_files(
+        self,
+        files: List[UploadFile],
+        user_id: int,
+        fix_subjects: bool = True,
+        subject_threshold: float = 0.90,
+        upsert: bool = False,
+        near_duplicates: str = "off",
+    ) -> MultiFileImportResponse:
+        """
+        Importe plusieurs fichiers (CSV, JSONL ou XLSX), ou des archives ZIP
+        de tels fichiers (un fichier par cours par exemple). Chaque fichier
+        est analysé par un processus du pool (CSV_IMPORT_WORKERS) ; les
+        sujets de chaque fichier sont ensuite rapprochés de ceux des fichiers
+        précédents et les doublons fusionnés d'un fichier à l'autre, dans
+        l'ordre des fichiers, avant l'écriture commune par lots (mêmes
+        options que l'import d'un fichier). Un fichier illisible est signalé dans son
+        bilan sans empêcher l'import des autres.
 
-        # Traitement du CSV
+        Les fichiers sont réunis dès que leur analyse et celle des fichiers
+        précédents sont terminées : seuls les résultats arrivés avant ceux
+        d'un fichier précédent restent en mémoire en attendant leur tour.
+        """
         processor = CSVQuestionProcessor(
             fix_subjects=fix_subjects, subject_threshold=subject_threshold
         )
+        with tempfile.TemporaryDirectory(prefix="quiz-import-") as directory:
+            sources = await run_in_threadpool(
+                self._stage_files, files, Path(directory)
+            )
+            reports = [CSVFileImportReport(filename=name) for name, _, _ in sources]
+            # fichier d'origine (premier fichier où elle apparaît) de chaque question
+            origin: Dict[str, int] = {}
+            loop = asyncio.get_running_loop()
+            pool = get_parse_pool()
 
-        questions_data = processor.process_csv_content(csv_content)
-        stats = processor.get_stats()
+            async def _parse(index: int, path: str, member: Optional[str]):
+                try:
+                    result = await loop.run_in_executor(
+                        pool, process_import_file, path, member
+                    )
+                except (ValueError, csv.Error) as exc:
+                    return index, exc
+                except BrokenProcessPool:
+                    shutdown_parse_pool()
+                    raise
+                return index, result
 
-        # Import des questions
-        return await self._import_questions(questions_data, user_id, stats)
+            tasks = [
+                asyncio.ensure_future(_parse(index, path, member))
+                for index, (_, path, member) in enumerate(sources)
+            ]
+            # résultats arrivés avant ceux d'un fichier précédent
+            waiting: Dict[int, Any] = {}
+            next_index = 0
+            try:
+                for completed in asyncio.as_completed(tasks):
+                    index, result = await completed
+                    waiting[index] = result
+                    while next_index in waiting:
+                        await self._merge_file(
+                            processor,
+                            waiting.pop(next_index),
+                            reports,
+                            next_index,
+                            origin,
+                        )
+                        next_index += 1
+            finally:
+                for task in tasks:
+                    task.cancel()
 
-    def _validate_csv_file(self, file: UploadFile) -> None:
-        """Valide le fichier CSV"""
-        if not file.filename:
-            raise ValueError("Nom de fichier manquant")
+        totals = _ImportTotals()
+        batches = processor.take_batches(CSV_IMPORT_BATCH_SIZE)
+        while True:
+            batch = await run_in_threadpool(next, batches, None)
+            if batch is None:
+                break
+            batch_keys = batch[0]
+            keys, batch_errors, matched = await self._write_batch(
+                processor, batch, user_id, upsert, near_duplicates, totals
+            )
+            written = set(keys)
+            for key in batch_keys:
+                if key not in written:
+                    # quasi-doublon fusionné dans une question similaire
+                    reports[origin[key]].merged += 1
+            for position, key in enumerate(keys):
+                if position in batch_errors:
+                    reports[origin[key]].errors += 1
+                elif position in matched:
+                    # déjà en base, fusionnée par l'upsert
+                    reports[origin[key]].merged += 1
+                else:
+                    reports[origin[key]].imported += 1
 
-        if not file.filename.lower().endswith(".csv"):
-            raise ValueError("Le fichier doit être au format CSV")
+        return MultiFileImportResponse(
+            files=reports,
+            summary=self._import_response(processor.get_stats(), totals, user_id),
+        )
 
-        if file.size and file.size > 10 * 1024 * 1024:  # 10MB max
-            raise ValueError("Le fichier est trop volumineux (max 10MB)")
+    @staticmethod
+    async def _merge_file(
+        processor: CSVQuestionProcessor,
+        result: Any,
+        reports: List[CSVFileImportReport],
+        index: int,
+        origin: Dict[str, int],
+    ) -> None:
+        """Réunit le résultat d'analyse du fichier `index` aux précédents"""
+        report = reports[index]
+        if isinstance(result, BaseException):
+            report.error = str(result)
+            return
+        questions, subjects_count, stats = result
+        for key in questions:
+            origin.setdefault(key, index)
+        merged, corrections = await run_in_threadpool(
+            processor.merge_processed_file, questions, subjects_count, stats
+        )
+        report.total_rows = stats["total_rows"]
+        report.questions = len(questions)
+        report.merged = stats["merged_questions"] + merged
+        report.subject_corrections = corrections
+
+    def _stage_files(
+        self, files: List[UploadFile], directory: Path
+    ) -> List[Tuple[str, str, Optional[str]]]:
+        """
+        Copie les fichiers reçus sur disque (lus par les processus du pool)
+        et liste les fichiers à traiter : (nom, chemin, membre de l'archive)
+        """
+        sources: List[Tuple[str, str, Optional[str]]] = []
+        for position, file in enumerate(files):
+            if not file.filename:
+                raise ValueError("Nom de fichier manquant")
+            is_archive = file.filename.lower().endswith(".zip")
+            if not is_archive:
+                self.validate_csv_file(file)
+            path = directory / f"{position}{Path(file.filename).suffix.lower()}"
+            file.file.seek(0)
+            with open(path, "wb") as target:
+                shutil.copyfileobj(file.file, target, length=1024 * 1024)
+            if is_archive:
+                sources.extend(self._archive_members(file.filename, path))
+            else:
+                sources.append((file.filename, str(path), None))
+
+        if not sources:
+            raise ValueError("Aucun fichier à importer")
+        if len(sources) > CSV_IMPORT_MAX_FILES:
+            raise ValueError(
+                f"Trop de fichiers ({len(sources)}, max {CSV_IMPORT_MAX_FILES})"
+            )
+        return sources
+
+    @staticmethod
+    def _archive_members(
+        filename: str, path: Path
+    ) -> List[Tuple[str, str, Optional[str]]]:
+        """
+        Fichiers importables d'une archive ZIP (hors dossiers et fichiers
+        cachés). Les tailles annoncées par l'archive sont vérifiées avant
+        toute décompression ; la lecture d'un membre s'arrête à sa taille
+        annoncée.
+        """
+        try:
+            with zipfile.ZipFile(path) as archive:
+                members = [
+                    info
+                    for info in archive.infolist()
+                    if not info.is_dir()
+                    and import_format(info.filename) is not None
+                    and not any(
+                        part.startswith((".", "__MACOSX"))
+                        for part in PurePosixPath(info.filename).parts
+                    )
+                ]
+        except zipfile.BadZipFile:
+            raise ValueError(f"{filename} : archive ZIP invalide")
 
-    async def _import_questions(
-        self, questions_data: List[QuestionCreate], user_id: int, stats: Dict[str, int]
+        uncompressed = 0
+        for info in members:
+            if info.flag_bits & 0x1:
+                raise ValueError(
+                    f"{filename} : les archives chiffrées ne sont pas acceptées"
+                )
+            if CSV_IMPORT_MAX_MB and info.file_size > CSV_IMPORT_MAX_MB * 1024 * 1024:
+                raise ValueError(
+                    f"{filename}/{info.filename} : fichier trop volumineux "
+                    f"(max {CSV_IMPORT_MAX_MB:g} Mo)"
+                )
+            if info.file_size > CSV_IMPORT_MAX_RATIO * max(info.compress_size, 1):
+                raise ValueError(
+                    f"{filename}/{info.filename} : taux de compression suspect "
+                    f"(max {CSV_IMPORT_MAX_RATIO:g})"
+                )
+            uncompressed += info.file_size
+            if uncompressed > CSV_IMPORT_MAX_UNCOMPRESSED_MB * 1024 * 1024:
+                raise ValueError(
+                    f"{filename} : archive trop volumineuse une fois décompressée "
+                    f"(max {CSV_IMPORT_MAX_UNCOMPRESSED_MB:g} Mo)"
+                )
+        return [
+            (f"{filename}/{info.filename}", str(path), info.filename)
+            for info in members
+        ]
+
+    async def import_csv_stream(
+        self,
+        binary_file: BinaryIO,
+        user_id: int,
+        fix_subjects: bool = True,
+        subject_threshold: float = 0.90,
+        on_progress: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None,
+        upsert: bool = False,
+        near_duplicates: str = "off",
+        filename: str = "import.csv",
     ) -> CSVImportResponse:
-        """Importe la liste des questions"""
-        imported_count = 0
-        errors = []
+        """
+        Importe un flux binaire déjà validé, au format indiqué par
+        l'extension de `filename`. `on_progress` reçoit les
+        compteurs (lignes lues, questions importées, fusionnées, sujets
+        corrigés, erreurs) après l'écriture de chaque lot.
+        """
+        processor = CSVQuestionProcessor(
+            fix_subjects=fix_subjects, subject_threshold=subject_threshold
+        )
+        # Lecture et traitement (code synchrone) dans un thread : la boucle
+        # d'événements reste libre pendant l'analyse des lignes
+        try:
+            rows = await run_in_threadpool(open_rows, binary_file, filename, processor)
+        except UnicodeDecodeError:
+            raise ValueError("Le fichier doit être encodé en UTF-8")
+        batches = processor.iter_batches(rows, CSV_IMPORT_BATCH_SIZE)
 
-        for question_data in questions_data:
+        totals = _ImportTotals()
+        while True:
             try:
-                await self.question_service.create_question(question_data, user_id)
-                imported_count += 1
-            except Exception as e:
-                errors.append(
-                    {
-                        "question": (
-                            question_data.question[:50] + "..."
-                            if len(question_data.question) > 50
-                            else question_data.question
-                        ),
-                        "error": str(e),
-                    }
-                )
+                batch = await run_in_threadpool(next, batches, None)
+            except UnicodeDecodeError:
+                raise ValueError("Le fichier doit être encodé en UTF-8")
+            if batch is None:
+                break
+            await self._write_batch(
+                processor, batch, user_id, upsert, near_duplicates, totals
+            )
+            if on_progress is not None:
+                await on_progress(self._progress(processor.get_stats(), totals))
+
+        return self._import_response(processor.get_stats(), totals, user_id)
+
+    async def _write_batch(
+        self,
+        processor: CSVQuestionProcessor,
+        batch: CSVBatch,
+        user_id: int,
+        upsert: bool,
+        near_duplicates: str,
+        totals: "_ImportTotals",
+    ) -> Tuple[List[str], Dict[int, str], Set[int]]:
+        """
+        Écrit un lot de `iter_batches` (recherche des quasi-doublons, puis
+        insertion ou upsert, puis fusions dans les questions déjà écrites)
+        et cumule les compteurs dans `totals`.
+        Returns:
+            (clés des questions écrites, erreurs par position dans ces clés,
+            positions des questions fusionnées dans un document existant)
+        """
+        keys, questions_data, merges = batch
+        totals.attempted += len(questions_data)
+
+        if near_duplicates != "off" and questions_data:
+            merge_near = near_duplicates == "merge"
+            near = await self.near_duplicate_service.match_batch(
+                questions_data,
+                processor.merge_responses_and_corrects if merge_near else None,
+            )
+            totals.near_count += len(near.matches)
+            totals.near_details.extend(near.matches[: 10 - len(totals.near_details)])
+            if merge_near:
+                questions_data = [questions_data[i] for i in near.kept]
+                keys = [keys[i] for i in near.kept]
+                for question_id, (responses, corrects) in near.merges.items():
+                    pending = merges.get(question_id, ([], []))
+                    merges[question_id] = processor.merge_responses_and_corrects(
+                        pending[0], responses, pending[1], corrects
+                    )
+                totals.near_merged += len(near.matches)
 
+        if upsert:
+            # l'index unique fusionne aussi les doublons entre les lots
+            created, matched, batch_errors = (
+                await self.question_service.upsert_questions(questions_data, user_id)
+            )
+            totals.imported += len(created)
+            totals.merged_existing += matched
+            merged = set(range(len(questions_data))) - set(created) - set(batch_errors)
+        else:
+            merged = set()
+            ids, batch_errors = await self.question_service.create_questions(
+                questions_data, user_id
+            )
+            processor.mark_inserted(keys, ids)
+            totals.imported += len(questions_data) - len(batch_errors)
+        for index, message in batch_errors.items():
+            totals.errors.append(self._error_detail(questions_data[index], message))
+
+        await self.question_service.merge_answers(
+            merges, processor.merge_responses_and_corrects
+        )
+        return keys, batch_errors, merged
+
+    def _import_response(
+        self, stats: Dict[str, int], totals: "_ImportTotals", user_id: int
+    ) -> CSVImportResponse:
+        stats["merged_existing"] = totals.merged_existing
+        stats["near_duplicates"] = totals.near_count
+        stats["near_merged"] = totals.near_merged
+        logger.info(
+            "Import CSV terminé",
+            extra={"user_id": user_id, "imported": totals.imported, **stats},
+        )
         return CSVImportResponse(
-            success=len(errors) < len(questions_data),
-            imported=imported_count,
-            errors=len(errors),
-            merged=stats.get("merged_questions", 0),
-            error_details=errors[:10],
-            message=self._generate_import_message(imported_count, len(errors), stats),
+            success=len(totals.errors) < totals.attempted,
+            imported=totals.imported,
+            errors=len(totals.errors),
+            merged=stats.get("merged_questions", 0)
+            + totals.merged_existing
+            + totals.near_merged,
+            error_details=totals.errors[:10],
+            near_duplicates=totals.near_count,
+            near_duplicate_details=totals.near_details,
+            message=self._generate_import_message(
+                totals.imported, len(totals.errors), stats
+            ),
         )
 
+    def validate_csv_file(self, file: UploadFile) -> None:
+        """Valide le fichier à importer (format, taille)"""
+        if not file.filename:
+            raise ValueError("Nom de fichier manquant")
+
+        if import_format(file.filename) is None:
+            raise ValueError(
+                f"Format de fichier non pris en charge ({', '.join(READERS)})"
+            )
+
+        if (
+            CSV_IMPORT_MAX_MB
+            and file.size
+            and file.size > CSV_IMPORT_MAX_MB * 1024 * 1024
+        ):
+            raise ValueError(
+                f"Le fichier est trop volumineux (max {CSV_IMPORT_MAX_MB:g} Mo)"
+            )
+
+    @staticmethod
+    def _progress(stats: Dict[str, int], totals: "_ImportTotals") -> Dict[str, int]:
+        return {
+            "total_rows": stats.get("total_rows", 0),
+            "imported": totals.imported,
+            "merged": stats.get("merged_questions", 0)
+            + totals.merged_existing
+            + totals.near_merged,
+            "subject_corrections": stats.get("subject_corrections", 0),
+            "errors": len(totals.errors),
+            "near_duplicates": totals.near_count,
+        }
+
+    @staticmethod
+    def _error_detail(question_data: QuestionCreate, message: str) -> Dict[str, str]:
+        return {
+            "question": (
+                question_data.question[:50] + "..."
+                if len(question_data.question) > 50
+                else question_data.question
+            ),
+            "error": message,
+        }
+
     def _generate_import_message(
         self, imported: int, errors: int, stats: Dict[str, int]
     ) -> str:
@@ -93,6 +516,16 @@ class CSVImportService:
         if stats.get("merged_questions", 0) > 0:
             parts.append(f"{stats['merged_questions']} questions fusionnées")
 
+        if stats.get("merged_existing", 0) > 0:
+            parts.append(
+                f"{stats['merged_existing']} questions déjà en base fusionnées"
+            )
+
+        if stats.get("near_merged", 0) > 0:
+            parts.append(f"{stats['near_merged']} quasi-doublons fusionnés")
+        elif stats.get("near_duplicates", 0) > 0:
+            parts.append(f"{stats['near_duplicates']} quasi-doublons signalés")
+
         if stats.get("subject_corrections", 0) > 0:
             parts.append(f"{stats['subject_corrections']} sujets corrigés")
 
@@ -0,0 +1,335 @@
+import asyncio
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+from zoneinfo import ZoneInfo
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from models.import_job import FINAL_STATUSES, ImportJob, ImportJobStatus
+from models.user import User, UserRole
+from repositories.import_job_repository import ImportJobRepository
+from services.csv_import_service import CSVImportService
+
+logger = logging.getLogger(__name__)
+
+# Copie des fichiers en attente d'import (supprimée en fin de tâche)
+IMPORT_JOBS_DIR = Path(
+    os.getenv("IMPORT_JOBS_DIR", os.path.join(tempfile.gettempdir(), "quiz-imports"))
+)
+# Imports exécutés simultanément par worker (les suivants attendent)
+IMPORT_JOBS_CONCURRENCY = int(os.getenv("IMPORT_JOBS_CONCURRENCY", "2"))
+# Tâche (en attente ou en cours) sans signe de vie depuis ce délai : interrompue ;
+# le worker propriétaire en émet un au tiers de ce délai
+IMPORT_JOBS_STALE_SECONDS = float(os.getenv("IMPORT_JOBS_STALE_SECONDS", "300"))
+# Période de relecture de l'état pour le flux SSE (secondes)
+IMPORT_JOBS_POLL_INTERVAL = float(os.getenv("IMPORT_JOBS_POLL_INTERVAL", "1.0"))
+
+_HOST = socket.gethostname()
+# jeton propre au process : un pid réutilisé après redémarrage ne se confond pas
+_WORKER_ID = f"{_HOST}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _now() -> datetime:
+    return datetime.now(ZoneInfo("Europe/Paris")).replace(microsecond=0)
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # signal 0 = CTRL_C_EVENT sous Windows : pas de test, le délai suffit
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _copy_upload(source, destination: Path) -> None:
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    source.seek(0)
+    with open(destination, "wb") as target:
+        shutil.copyfileobj(source, target, length=1024 * 1024)
+
+
+class ImportJobService:
+    """
+    Imports de fichiers en arrière-plan : le fichier est copié sur disque, la tâche
+    est enregistrée dans `import_jobs` puis exécutée par une tâche asyncio
+    du worker qui a reçu la requête. L'avancement est écrit en base après
+    chaque lot ; il est donc lisible depuis n'importe quel worker et conservé
+    après un redémarrage (les tâches coupées passent alors en `interrupted`).
+    """
+
+    def __init__(self):
+        self.repository = ImportJobRepository()
+        self.csv_import_service = CSVImportService()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # un événement par tâche suivie, déclenché à chaque progression
+        self._events: Dict[str, asyncio.Event] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    ################################################################################
+    async def submit(
+        self,
+        file: UploadFile,
+        user_id: int,
+        fix_subjects: bool = True,
+        subject_threshold: float = 0.90,
+        upsert: bool = False,
+        near_duplicates: str = "off",
+    ) -> ImportJob:
+        """
+        Enregistre la tâche et lance l'import ; retourne sans attendre.
+        """
+        self.csv_import_service.validate_csv_file(file)
+
+        job = ImportJob(
+            filename=file.filename,
+            options={
+                "fix_subjects": fix_subjects,
+                "subject_threshold": subject_threshold,
+                "upsert": upsert,
+                "near_duplicates": near_duplicates,
+            },
+            worker=_WORKER_ID,
+            created_by=user_id,
+            created_at=_now(),
+            heartbeat_at=_now(),
+        )
+        job_id = await self.repository.insert_job(job)
+        job = job.model_copy(update={"id": job_id})
+
+        # le fichier reçu est fermé à la fin de la requête : copie sur disque
+        path = IMPORT_JOBS_DIR / f"{job_id}{Path(file.filename).suffix.lower()}"
+        try:
+            await run_in_threadpool(_copy_upload, file.file, path)
+        except OSError as e:
+            await self._finish(
+                job_id, ImportJobStatus.FAILED, error=f"Copie du fichier: {e}"
+            )
+            raise
+
+        task = asyncio.create_task(
+            self._run(
+                job_id,
+                path,
+                user_id,
+                fix_subjects,
+                subject_threshold,
+                upsert,
+                near_duplicates,
+            )
+        )
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+        logger.info(
+            "Import en arrière-plan soumis",
+            extra={"job_id": job_id, "file": file.filename, "user_id": user_id},
+        )
+        return job
+
+    async def _run(
+        self,
+        job_id: str,
+        path: Path,
+        user_id: int,
+        fix_subjects: bool,
+        subject_threshold: float,
+        upsert: bool,
+        near_duplicates: str,
+    ) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(IMPORT_JOBS_CONCURRENCY)
+
+        async def _progress(progress: Dict[str, int]) -> None:
+            await self.repository.update_job(
+                job_id, {"progress": progress, "heartbeat_at": _now()}
+            )
+            self._notify(job_id)
+
+        async def _heartbeat() -> None:
+            # signe de vie aussi pendant l'attente du sémaphore et entre deux lots
+            while True:
+                await asyncio.sleep(IMPORT_JOBS_STALE_SECONDS / 3)
+                try:
+                    await self.repository.update_job(job_id, {"heartbeat_at": _now()})
+                except Exception as e:
+                    logger.warning("Signe de vie de l'import %s: %s", job_id, e)
+
+        heartbeat = asyncio.create_task(_heartbeat())
+        try:
+            async with self._semaphore:
+                now = _now()
+                await self.repository.update_job(
+                    job_id,
+                    {
+                        "status": ImportJobStatus.RUNNING.value,
+                        "started_at": now,
+                        "heartbeat_at": now,
+                    },
+                )
+                self._notify(job_id)
+                with open(path, "rb") as binary_file:
+                    result = await self.csv_import_service.import_csv_stream(
+                        binary_file,
+                        user_id,
+                        fix_subjects,
+                        subject_threshold,
+                        on_progress=_progress,
+                        upsert=upsert,
+                        near_duplicates=near_duplicates,
+                        filename=path.name,
+                    )
+            await self._finish(
+                job_id,
+                ImportJobStatus.COMPLETED,
+                message=result.message,
+                error_details=result.error_details,
+            )
+        except asyncio.CancelledError:
+            await self._finish(
+                job_id,
+                ImportJobStatus.INTERRUPTED,
+                error="Import interrompu par l'arrêt du serveur",
+            )
+            raise
+        except Exception as e:
+            logger.exception("Échec de l'import %s: %s", job_id, e)
+            await self._finish(job_id, ImportJobStatus.FAILED, error=str(e))
+        finally:
+            heartbeat.cancel()
+            path.unlink(missing_ok=True)
+
+    async def _finish(self, job_id: str, status: ImportJobStatus, **fields) -> None:
+        fields.update({"status": status.value, "finished_at": _now()})
+        await self.repository.update_job(job_id, fields)
+        self._notify(job_id)
+        logger.info(
+            "Import en arrière-plan terminé",
+            extra={"job_id": job_id, "status": status.value},
+        )
+
+    ################################################################################
+    def _is_orphan(self, job: ImportJob) -> bool:
+        """
+        Vrai si plus aucun process n'exécute la tâche : process courant sans
+        tâche asyncio, process du même hôte disparu, ou signe de vie trop ancien.
+
+        Le délai s'applique aussi aux tâches en attente et, faute de signe de vie,
+        à `started_at` puis `created_at` : le nom d'hôte d'un conteneur change à
+        chaque redémarrage, le test de pid ne couvre donc pas tout.
+        """
+        if job.status in FINAL_STATUSES:
+            return False
+        if job.worker == _WORKER_ID:
+            if job.id in self._tasks:
+                return False
+            if job.status == ImportJobStatus.RUNNING:
+                return True
+            # en attente sans tâche : soumission en cours, sinon abandonnée (délai)
+        else:
+            host, _, rest = (job.worker or "").partition(":")
+            pid = rest.partition(":")[0]
+            if host == _HOST and pid.isdigit() and not _pid_alive(int(pid)):
+                return True
+        last_seen = job.heartbeat_at or job.started_at or job.created_at
+        if last_seen is None:
+            return True
+        if last_seen.tzinfo is None:
+            last_seen = last_seen.replace(tzinfo=ZoneInfo("UTC"))
+        return _now() - last_seen > timedelta(seconds=IMPORT_JOBS_STALE_SECONDS)
+
+    async def _mark_interrupted(self, job: ImportJob) -> ImportJob:
+        fields = {
+            "status": ImportJobStatus.INTERRUPTED.value,
+            "error": "Import interrompu (arrêt ou redémarrage du serveur)",
+            "finished_at": _now(),
+        }
+        await self.repository.update_job(job.id, fields)
+        for path in IMPORT_JOBS_DIR.glob(f"{job.id}.*"):
+            path.unlink(missing_ok=True)
+        logger.warning("Import %s marqué interrompu", job.id)
+        return job.model_copy(
+            update={**fields, "status": ImportJobStatus.INTERRUPTED}
+        )
+
+    async def recover(self) -> int:
+        """
+        Au démarrage : marque `interrupted` les tâches dont le process a
+        disparu. Retourne le nombre de tâches concernées.
+        """
+        interrupted = 0
+        for job in await self.repository.get_active_jobs():
+            if self._is_orphan(job):
+                await self._mark_interrupted(job)
+                interrupted += 1
+        return interrupted
+
+    async def shutdown(self) -> None:
+        """Annule les imports en cours du worker (marqués `interrupted`)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    ################################################################################
+    async def get_job(self, job_id: str, user: User) -> ImportJob:
+        """
+        Retourne la tâche (créateur ou ADMIN uniquement).
+        """
+        job = await self.repository.get_job(job_id)
+        if job is None:
+            raise LookupError("Tâche d'import introuvable")
+        if user.role != UserRole.ADMIN and job.created_by != user.id:
+            raise PermissionError("Seul le créateur de l'import peut le consulter")
+        if self._is_orphan(job):
+            job = await self._mark_interrupted(job)
+        return job
+
+    def _notify(self, job_id: str) -> None:
+        event = self._events.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def watch(
+        self, job_id: str, user: User
+    ) -> AsyncIterator[Optional[ImportJob]]:
+        """
+        Suit une tâche jusqu'à son terme : produit l'état à chaque changement,
+        et None lorsqu'il n'a pas changé depuis IMPORT_JOBS_POLL_INTERVAL.
+        Réveil immédiat si la tâche tourne dans ce worker, sinon relecture
+        périodique en base.
+        """
+        last = None
+        try:
+            while True:
+                job = await self.get_job(job_id, user)
+                snapshot = job.model_dump(exclude={"heartbeat_at"})
+                if snapshot != last:
+                    last = snapshot
+                    yield job
+                else:
+                    yield None
+                if job.status in FINAL_STATUSES:
+                    return
+                event = self._events.setdefault(job_id, asyncio.Event())
+                try:
+                    await asyncio.wait_for(event.wait(), IMPORT_JOBS_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if job_id not in self._tasks:
+                self._events.pop(job_id, None)
+
+
+import_job_service = ImportJobService()
@@ -0,0 +1,156 @@
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from models.question import QuestionStatus
+from repositories.question_repository import QuestionRepository
+from schemas.question import QuestionCreate
+from utils.csv_processor import CSVQuestionProcessor
+from utils.minhash import LSHIndex, minhasher, near_duplicate_score, question_words
+
+MergeRule = Callable[
+    [List[str], List[str], List[str], List[str]], Tuple[List[str], List[str]]
+]
+
+
+class NearDuplicateMatches(NamedTuple):
+    """Résultat de `NearDuplicateService.match_batch`"""
+
+    # positions des questions du lot à écrire
+    kept: List[int]
+    # fusions dans des questions déjà en base {id: (réponses, corrects)}
+    merges: Dict[str, Tuple[List[str], List[str]]]
+    # quasi-doublons trouvés (question, question similaire, id, score)
+    matches: List[Dict[str, str]]
+
+
+def _excerpt(text: str) -> str:
+    return text[:50] + "..." if len(text) > 50 else text
+
+
+class NearDuplicateService:
+    """
+    Recherche des quasi-doublons d'un lot de questions importées : parmi les
+    questions déjà en base (clés LSH stockées, une requête par lot) et parmi
+    les questions précédentes du lot. Chaque candidat est vérifié par
+    `near_duplicate_score` avant d'être retenu.
+    """
+
+    def __init__(self):
+        self.repository = QuestionRepository()
+        self._keys = CSVQuestionProcessor()
+
+    async def match_batch(
+        self,
+        questions: List[QuestionCreate],
+        merge: Optional[MergeRule] = None,
+    ) -> NearDuplicateMatches:
+        """
+        Signale les quasi-doublons du lot ; avec une règle `merge`, les
+        fusionne aussi : la question est retirée du lot et ses réponses sont
+        ajoutées à la question similaire (en base ou plus haut dans le lot).
+        Les doublons exacts d'une question en base (même `question_key_hash`)
+        sont laissés à l'import (upsert ou erreur de doublon). Les questions
+        cibles d'une fusion dans le lot sont remplacées dans `questions`.
+        """
+        words, keys = await run_in_threadpool(self._prepare, questions)
+        existing = await self.repository.find_by_minhash_bands(
+            [key for question_keys in keys for key in question_keys]
+        )
+        return await run_in_threadpool(
+            self._match, questions, words, keys, existing, merge
+        )
+
+    @staticmethod
+    def _prepare(
+        questions: List[QuestionCreate],
+    ) -> Tuple[List[List[str]], List[List[int]]]:
+        words = [question_words(q.question) for q in questions]
+        keys = [minhasher.band_keys(minhasher.signature(w)) for w in words]
+        return words, keys
+
+    def _match(
+        self,
+        questions: List[QuestionCreate],
+        words: List[List[str]],
+        keys: List[List[int]],
+        existing: List[Dict],
+        merge: Optional[MergeRule],
+    ) -> NearDuplicateMatches:
+        existing_index = LSHIndex()
+        for position, doc in enumerate(existing):
+            existing_index.add(position, doc["minhash_bands"])
+        existing_words: Dict[int, List[str]] = {}
+
+        batch_index = LSHIndex()
+        kept: List[int] = []
+        merges: Dict[str, Tuple[List[str], List[str]]] = {}
+        matches: List[Dict[str, str]] = []
+
+        for position, question in enumerate(questions):
+            key_hash = self._keys.question_key_hash(question.question)
+            best: Optional[Tuple[float, str, Optional[str], int]] = None
+
+            for candidate in existing_index.candidates(keys[position]):
+                doc = existing[candidate]
+                if doc["question_key_hash"] == key_hash:
+                    continue
+                if candidate not in existing_words:
+                    existing_words[candidate] = question_words(doc["question"])
+                score = near_duplicate_score(
+                    words[position], existing_words[candidate]
+                )
+                if score and (best is None or score > best[0]):
+                    best = (score, doc["question"], doc["id"], -1)
+
+            for candidate in batch_index.candidates(keys[position]):
+                score = near_duplicate_score(words[position], words[candidate])
+                if score and (best is None or score > best[0]):
+                    best = (score, questions[candidate].question, None, candidate)
+
+            if best is None:
+                kept.append(position)
+                batch_index.add(position, keys[position])
+                continue
+
+            score, similar, similar_id, similar_position = best
+            matches.append(
+                {
+                    "question": _excerpt(question.question),
+                    "similar_to": _excerpt(similar),
+                    "similar_id": similar_id or "",
+                    "score": f"{score:.2f}",
+                }
+            )
+            if merge is None:
+                kept.append(position)
+                batch_index.add(position, keys[position])
+            elif similar_id is not None:
+                pending_responses, pending_corrects = merges.get(
+                    similar_id, ([], [])
+                )
+                merges[similar_id] = merge(
+                    pending_responses,
+                    question.responses,
+                    pending_corrects,
+                    question.corrects,
+                )
+            else:
+                target = questions[similar_position]
+                responses, corrects = merge(
+                    target.responses,
+                    question.responses,
+                    target.corrects,
+                    question.corrects,
+                )
+                questions[similar_position] = target.model_copy(
+                    update={
+                        "responses": responses,
+                        "corrects": corrects,
+                        "status": (
+                            QuestionStatus.ACTIVE if corrects else QuestionStatus.DRAFT
+                        ),
+                    }
+                )
+
+        return NearDuplicateMatches(kept, merges, matches)
@@ -1,9 +1,30 @@
+import os
 from datetime import datetime
-from typing import List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from zoneinfo import ZoneInfo
+from starlette.concurrency import run_in_threadpool
 from models.question import Question, QuestionStatus
 from schemas.question import QuestionCreate, QuestionUpdate
-from repositories.question_repository import QuestionRepository
+from repositories.question_repository import (
+    DuplicateQuestionError,
+    QuestionRepository,
+)
+from utils.cache import LRUCache
+from utils.csv_processor import CSVQuestionProcessor
+from utils.metrics import register_cache
+from utils.minhash import minhasher
+from utils.question_export import export_stream
+
+# Cache des facettes, partagé par toutes les instances du service.
+# Invalidé à chaque écriture ; le TTL couvre les écritures faites hors process.
+facets_cache = LRUCache(
+    maxsize=int(os.getenv("FACETS_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("FACETS_CACHE_TTL", "30")),
+)
+register_cache("facets", facets_cache)
+
+# Clé de doublon des intitulés : même règle que l'import CSV
+_question_keys = CSVQuestionProcessor()
 
 
 class QuestionService:
@@ -27,6 +48,21 @@ class QuestionService:
 
         Returns:
             Question: L'objet Question créé
+        Raises:
+            DuplicateQuestionError: Si une question de même intitulé normalisé
+                existe déjà
+        """
+        question = self._build_question(question_data, user_id)
+
+        generated_id = await self.repository.insert_question(question)
+        facets_cache.clear()
+
+        return question.model_copy(update={"id": generated_id})
+
+    @staticmethod
+    def _build_question(question_data: QuestionCreate, user_id: int) -> Question:
+        """
+        Construit la Question à insérer (statut, créateur, date de création).
         """
         # Déterminer le statut : utiliser celui fourni ou calculer automatiquement
         if question_data.status is not None:
@@ -40,7 +76,7 @@ class QuestionService:
                 else QuestionStatus.ACTIVE
             )
 
-        question = Question(
+        return Question(
             question=question_data.question,
             subject=question_data.subject,
             use=question_data.use,
@@ -51,11 +87,114 @@ class QuestionService:
             created_by=user_id,
             created_at=datetime.now(ZoneInfo("Europe/Paris")).replace(microsecond=0),
             edited_at=None,
+            question_key_hash=_question_keys.question_key_hash(question_data.question),
+            minhash_bands=minhasher.keys(question_data.question),
         )
 
-        generated_id = await self.repository.insert_question(question)
+    def _build_questions(
+        self, questions_data: List[QuestionCreate], user_id: int
+    ) -> List[Question]:
+        return [self._build_question(q, user_id) for q in questions_data]
 
-        return question.model_copy(update={"id": generated_id})
+    ################################################################################
+    async def create_questions(
+        self, questions_data: List[QuestionCreate], user_id: int
+    ) -> Tuple[List[Optional[str]], Dict[int, str]]:
+        """
+        Crée un lot de questions en une seule écriture.
+
+        Returns:
+            (ids, erreurs) : id de chaque question (None en cas d'échec)
+            et message d'erreur par position dans le lot
+        """
+        # (empreintes calculées hors de la boucle d'événements)
+        questions = await run_in_threadpool(
+            self._build_questions, questions_data, user_id
+        )
+        ids, errors = await self.repository.insert_questions(questions)
+        facets_cache.clear()
+        return ids, errors
+
+    ################################################################################
+    async def upsert_questions(
+        self, questions_data: List[QuestionCreate], user_id: int
+    ) -> Tuple[List[int], int, Dict[int, str]]:
+        """
+        Crée les questions absentes de la base et fusionne les réponses des
+        questions déjà présentes (même intitulé normalisé), en une écriture.
+
+        Returns:
+            (positions des questions créées, fusionnées, erreurs par position
+            dans le lot)
+        """
+        questions = await run_in_threadpool(
+            self._build_questions, questions_data, user_id
+        )
+        result = await self.repository.upsert_questions(questions)
+        facets_cache.clear()
+        return result
+
+    async def ensure_question_keys(
+        self, batch_size: int = 1000, retry_duplicates: bool = False
+    ) -> Tuple[int, int]:
+        """
+        Calcule `question_key_hash` des questions qui n'en ont pas encore
+        (migration `backfill_question_keys.py`).
+
+        Returns:
+            (questions renseignées, doublons déjà présents marqués sans empreinte)
+        """
+        return await self.repository.backfill_question_key_hashes(
+            _question_keys.question_key_hash,
+            batch_size=batch_size,
+            retry_duplicates=retry_duplicates,
+        )
+
+    ################################################################################
+    async def merge_answers(
+        self,
+        merges: Dict[str, Tuple[List[str], List[str]]],
+        merge: Callable[
+            [List[str], List[str], List[str], List[str]],
+            Tuple[List[str], List[str]],
+        ],
+    ) -> int:
+        """
+        Fusionne des réponses dans des questions existantes.
+
+        Args:
+            merges: {id: (nouvelles réponses, nouvelles réponses correctes)}
+            merge: règle de fusion (réponses existantes, nouvelles,
+                corrects existants, nouveaux) -> (réponses, corrects)
+
+        Returns:
+            int: nombre de questions modifiées
+        """
+        if not merges:
+            return 0
+        existing = await self.repository.get_answers_by_ids(list(merges))
+        now = datetime.now(ZoneInfo("Europe/Paris")).replace(microsecond=0)
+        updates: Dict[str, Dict[str, Any]] = {}
+        for question_id, (new_responses, new_corrects) in merges.items():
+            if question_id not in existing:
+                continue
+            responses, corrects = merge(
+                existing[question_id][0],
+                new_responses,
+                existing[question_id][1],
+                new_corrects,
+            )
+            updates[question_id] = {
+                "responses": responses,
+                "corrects": corrects,
+                "status": (
+                    QuestionStatus.ACTIVE if corrects else QuestionStatus.DRAFT
+                ).value,
+                "edited_at": now,
+            }
+        modified = await self.repository.update_questions(updates)
+        facets_cache.clear()
+        return modified
 
     ################################################################################
     async def get_question_by_id(self, question_id: str) -> Question:
@@ -109,6 +248,76 @@ class QuestionService:
             subject_name=subject_name, limit=limit
         )
 
+    ################################################################################
+    async def get_facets(
+        self,
+        subjects: Optional[List[str]] = None,
+        uses: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        Retourne les compteurs par facette et la première page de questions
+        pour la combinaison de filtres donnée (mise en cache par signature).
+        """
+        signature = (
+            tuple(sorted(set(subjects or []))),
+            tuple(sorted(set(uses or []))),
+            tuple(sorted(set(statuses or []))),
+            limit,
+        )
+        cached = facets_cache.get(signature)
+        if cached is not None:
+            return cached
+
+        facets = await self.repository.get_facets(
+            subjects=subjects, uses=uses, statuses=statuses, limit=limit
+        )
+        facets_cache.set(signature, facets)
+        return facets
+
+    ################################################################################
+    async def query_questions(
+        self,
+        filters: Dict[str, Any],
+        sort_field: str = "created_at",
+        sort_order: int = -1,
+        page: int = 1,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Retourne une page de questions filtrées et triées côté serveur,
+        le nombre (plafonné) de questions correspondant aux filtres et le
+        curseur de la page suivante.
+        """
+        return await self.repository.query_questions(
+            filters=filters,
+            sort_field=sort_field,
+            sort_order=sort_order,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
+
+    ################################################################################
+    def export_questions(self, filters: Dict[str, Any], format: str) -> Iterator[bytes]:
+        """
+        Export en flux des questions filtrées au gabarit d'import
+        (itérateur synchrone de paquets d'octets, lu au fil du curseur).
+        """
+        return export_stream(self.repository.iter_export_docs(filters), format)
+
+    def export_questions_by_ids(
+        self, question_ids: List[str], format: str
+    ) -> Iterator[bytes]:
+        """
+        Export en flux de questions données, dans l'ordre des identifiants.
+        """
+        return export_stream(
+            self.repository.iter_export_docs_by_ids(question_ids), format
+        )
+
     ################################################################################
 
     async def update_question(
@@ -125,6 +334,8 @@ class QuestionService:
         Raises:
             LookupError: Si la question n'existe pas
             PermissionError: Si l'utilisateur n'est pas le créateur
+            DuplicateQuestionError: Si le nouvel intitulé est celui d'une autre
+                question
         """
         # Vérifier que la question existe et récupérer le créateur
         existing_question = await self.repository.get_question_by_id(question_id)
@@ -137,6 +348,11 @@ class QuestionService:
 
         # Convertir les données en dictionnaire, en excluant les champs non définis
         update_data = question_data.model_dump(exclude_unset=True)
+        if update_data.get("question"):
+            update_data["question_key_hash"] = _question_keys.question_key_hash(
+                update_data["question"]
+            )
+            update_data["minhash_bands"] = minhasher.keys(update_data["question"])
 
         # Ajouter la date de modification
         update_data["edited_at"] = datetime.now(ZoneInfo("Europe/Paris")).replace(
@@ -145,6 +361,7 @@ class QuestionService:
 
         # Effectuer la mise à jour
         await self.repository.update_question(question_id, update_data)
+        facets_cache.clear()
 
         # Retourner la question mise à jour
         return await self.repository.get_question_by_id(question_id)
@@ -1,8 +1,10 @@
+import logging
 import random
 from services.question_service import QuestionService
 from models.question import QuestionStatus
+from bson import ObjectId
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Tuple
 from zoneinfo import ZoneInfo
 from models.questionnaire import Questionnaire, QuestionnaireStatus
 from schemas.questionnaire import (
@@ -12,6 +14,8 @@ from schemas.questionnaire import (
 )
 from repositories.questionnaire_repository import QuestionnaireRepository
 
+logger = logging.getLogger(__name__)
+
 
 class QuestionnaireService:
     """
@@ -96,11 +100,35 @@ class QuestionnaireService:
 
         else:
             # Format non reconnu
-            print(f"Format non implémenté : {format}")
+            logger.warning("Format non implémenté : %s", format)
             raise ValueError(
                 f"Format '{format}' non supporté. Utilisez 'short' ou 'full'."
             )
 
+    ################################################################################
+    async def export_questionnaire(
+        self, questionnaire_id: str, format: str
+    ) -> Tuple[Questionnaire, Iterator[bytes]]:
+        """
+        Questionnaire et export en flux de ses questions (gabarit d'import),
+        dans l'ordre du questionnaire.
+        """
+        questionnaire = await self.repository.get_short_questionnaire_by_id(
+            questionnaire_id
+        )
+        if questionnaire is None:
+            raise LookupError("Questionnaire introuvable")
+
+        question_ids = []
+        for item in questionnaire.questions:
+            if ObjectId.is_valid(item.id):
+                question_ids.append(item.id)
+            else:
+                logger.warning("ID question invalide ignoré: %s", item.id)
+        return questionnaire, self.question_service.export_questions_by_ids(
+            question_ids, format
+        )
+
     ################################################################################
     async def update_questionnaire(
         self,
@@ -0,0 +1,129 @@
+"""
+Mode de déploiement mono-process : l'interface Flask est montée dans
+l'application FastAPI via `WSGIMiddleware`, et l'`APIClient` du frontend
+appelle `AuthService` directement au lieu de passer par HTTP en boucle locale.
+
+Les routes de l'API sont servies en priorité ; toute autre URL est transmise
+à Flask (pages, fichiers statiques, routes proxy `/api/users/...`).
+Le serveur écoute sur le port 8000, attendu par les templates (`apiUrl`).
+
+Lancement depuis `backend/` :
+
+    python unified.py
+"""
+
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import anyio.from_thread
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.wsgi import WSGIMiddleware
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import ValidationError
+
+from api import quiz_api
+from schemas.user import TokenResponse, UserCreate, UserResponse
+from services.auth_service import AuthService
+from utils.auth_dependencies import get_current_user, revoke_token
+
+# `src/` pour importer le package `frontend`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from frontend.app import APIClient, app as flask_app  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+UNIFIED_HOST = os.getenv("UNIFIED_HOST", "0.0.0.0")
+UNIFIED_PORT = int(os.getenv("UNIFIED_PORT", "8000"))
+
+
+class InProcessAuthBackend:
+    """
+    Backend local de l'`APIClient` : mêmes méthodes et mêmes formats de retour
+    que les appels HTTP, mais exécutés dans le process.
+    Flask tourne dans un thread worker d'anyio (WSGIMiddleware) : les
+    coroutines d'`AuthService` sont renvoyées sur la boucle d'événements
+    avec `anyio.from_thread.run`.
+    """
+
+    @staticmethod
+    def _authorized(token: str) -> bool:
+        """Valide le token comme le ferait la dépendance `get_current_user`."""
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        try:
+            anyio.from_thread.run(get_current_user, credentials)
+            return True
+        except HTTPException:
+            return False
+
+    def login(self, username: str, password: str) -> Optional[Dict[str, Any]]:
+        if not username or not password:
+            return None
+        user, token = anyio.from_thread.run(AuthService.login, username, password)
+        if not user or not token:
+            return None
+        return TokenResponse(
+            access_token=token,
+            user=UserResponse(
+                id=user.id, name=user.name, email=user.email, role=user.role
+            ),
+        ).model_dump(mode="json")
+
+    def register(
+        self, name: str, email: str, password: str
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            user_data = UserCreate(name=name, email=email, password=password)
+        except ValidationError as e:
+            logger.info("Données d'inscription invalides: %s", e)
+            return None
+        result = anyio.from_thread.run(AuthService.register, user_data)
+        return result.model_dump(mode="json") if result else None
+
+    def logout(self, token: str) -> bool:
+        if not self._authorized(token):
+            return False
+        try:
+            revoke_token(token)
+        except RuntimeError:
+            return False
+        return True
+
+    def get_user_name(self, user_id: int, token: str) -> str:
+        if not self._authorized(token):
+            return "Inconnu"
+        return anyio.from_thread.run(AuthService.get_user_name, user_id)
+
+    def get_user_names(self, user_ids: List[int], token: str) -> Dict[str, str]:
+        if not self._authorized(token):
+            return {}
+        names = anyio.from_thread.run(AuthService.get_user_names, user_ids)
+        # clés en chaînes, comme dans la réponse JSON de l'API
+        return {str(user_id): name for user_id, name in names.items()}
+
+
+def create_unified_app() -> FastAPI:
+    """
+    Crée l'application FastAPI et y monte l'interface Flask à la racine.
+    La route d'information `GET /` de l'API est retirée : `/` reste la page
+    de connexion de l'interface.
+    """
+    app = quiz_api.create_app()
+    app.router.routes = [
+        route for route in app.router.routes if getattr(route, "path", None) != "/"
+    ]
+    APIClient.use_backend(InProcessAuthBackend())
+    app.mount("/", WSGIMiddleware(flask_app))
+    return app
+
+
+app = create_unified_app()
+
+
+if __name__ == "__main__":
+    logger.info("Démarrage en mode unifié (API + interface dans un seul process)")
+    uvicorn.run(app, host=UNIFIED_HOST, port=UNIFIED_PORT, reload=False)
@@ -1,16 +1,61 @@
+import hashlib
+import logging
+import os
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from models.user import User
+from utils.cache import ExpiringSet, LRUCache
+from utils.metrics import register_cache
 from utils.security import verify_token
 
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer()
 
+# Tokens déjà vérifiés (digest -> User), chaque entrée expirant avec le token
+token_cache = LRUCache(maxsize=int(os.getenv("JWT_CACHE_SIZE", "1024")))
+# Tokens révoqués (digests), conservés jusqu'à leur propre expiration et jamais
+# évincés avant. Mémoire du process : avec plusieurs workers uvicorn, une
+# révocation ne vaut que dans le worker qui l'a reçue.
+revoked_tokens = ExpiringSet(maxsize=int(os.getenv("JWT_REVOKED_SIZE", "10000")))
+register_cache("jwt", token_cache)
+
+
+def _token_digest(token: str) -> str:
+    """Empreinte du token utilisée comme clé de cache (le token n'est pas stocké)."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def revoke_token(token: str) -> None:
+    """
+    Révoque un token (déconnexion, `POST /api/auth/logout`) : il est retiré du
+    cache et refusé jusqu'à son expiration, dans ce process seulement (un
+    worker uvicorn).
+    Raises:
+        RuntimeError: si JWT_REVOKED_SIZE révocations non expirées sont déjà
+            enregistrées (aucune n'est oubliée pour faire de la place)
+    """
+    payload = verify_token(token)
+    if payload is None:
+        return  # déjà invalide ou expiré
+    digest = _token_digest(token)
+    try:
+        revoked_tokens.add(digest, expires_at=payload.get("exp"))
+    except RuntimeError:
+        logger.error(
+            "Révocation refusée : %d tokens révoqués non expirés (JWT_REVOKED_SIZE)",
+            revoked_tokens.maxsize,
+        )
+        raise
+    token_cache.pop(digest)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> User:
     """
     Vérifie le token JWT et retourne les informations utilisateur.
+    Les tokens déjà vérifiés sont servis depuis un cache LRU jusqu'à leur expiration.
     Args:
         credentials: Credentials JWT du header Authorization
     Returns:
@@ -19,6 +64,19 @@ async def get_current_user(
         HTTPException: Si le token est invalide
     """
     token = credentials.credentials
+    digest = _token_digest(token)
+
+    if digest in revoked_tokens:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token révoqué",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    cached = token_cache.get(digest)
+    if cached is not None:
+        return cached
+
     payload = verify_token(token)
 
     if payload is None:
@@ -29,13 +87,16 @@ async def get_current_user(
         )
 
     try:
-        return User(**payload)
+        user = User(**payload)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Données utilisateur invalides dans le token ({exc})",
         )
 
+    token_cache.set(digest, user, expires_at=payload.get("exp"))
+    return user
+
 
 def hide_email(email: str) -> str:
     """
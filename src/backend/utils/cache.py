@@ -0,0 +1,125 @@
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Cache LRU borné et thread-safe, avec expiration optionnelle des entrées.
+    Les entrées expirent soit après `ttl` secondes, soit à l'instant
+    (timestamp epoch) passé explicitement à `set`.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retourne la valeur associée à la clé, ou `default` si absente/expirée."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self, key: Hashable, value: Any, expires_at: Optional[float] = None
+    ) -> None:
+        """Ajoute une entrée, en évinçant la moins récemment utilisée si plein."""
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any:
+        """Supprime une entrée et retourne sa valeur (None si absente)."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry[0] if entry else None
+
+    def clear(self) -> None:
+        """Vide le cache (les compteurs sont conservés)."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne la taille et les compteurs hits/misses du cache."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ExpiringSet:
+    """
+    Ensemble borné et thread-safe dont les éléments ne sortent qu'à leur
+    expiration (timestamp epoch) : contrairement à `LRUCache`, rien n'est
+    évincé pour faire de la place. Plein, `add` lève une erreur.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._expires: Dict[Hashable, float] = {}
+        self._heap: List[Tuple[float, Hashable]] = []
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            if self._expires.get(key) == expires_at:
+                del self._expires[key]
+
+    def add(self, key: Hashable, expires_at: Optional[float] = None) -> None:
+        """Ajoute un élément jusqu'à `expires_at` (sans limite si None)."""
+        if expires_at is None:
+            expires_at = float("inf")
+        with self._lock:
+            self._purge(time.time())
+            current = self._expires.get(key)
+            if current is None and len(self._expires) >= self.maxsize:
+                raise RuntimeError(
+                    f"Ensemble plein ({self.maxsize} éléments non expirés)"
+                )
+            if current is None or expires_at > current:
+                self._expires[key] = expires_at
+                heapq.heappush(self._heap, (expires_at, key))
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            expires_at = self._expires.get(key)
+            return expires_at is not None and expires_at > time.time()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge(time.time())
+            return len(self._expires)
@@ -1,10 +1,21 @@
 import csv
+import hashlib
 import io
 import unicodedata
+import zipfile
 from collections import Counter
 from difflib import SequenceMatcher
-from typing import Dict, List, Iterator, Tuple
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, List, Iterator, Optional, Tuple
 from schemas.question import QuestionCreate, QuestionStatus
+from utils.import_readers import open_rows
+
+# Lot produit par `iter_batches` : clés des nouvelles questions, questions à
+# insérer, et fusions à appliquer aux questions des lots déjà insérés
+# ({id: (réponses, corrects)})
+CSVBatch = Tuple[
+    List[str], List[QuestionCreate], Dict[str, Tuple[List[str], List[str]]]
+]
 
 
 class CSVQuestionProcessor:
@@ -14,7 +25,14 @@ class CSVQuestionProcessor:
         self.fix_subjects = fix_subjects
         self.subject_threshold = subject_threshold
         self.subjects_count: Dict[str, int] = {}
+        # Sujet brut -> (meilleur sujet connu, score, nombre de sujets déjà
+        # comparés) : seuls les sujets ajoutés depuis sont comparés ensuite
+        self._subject_matches: Dict[str, Tuple[Optional[str], float, int]] = {}
         self.questions_cache: Dict[str, dict] = {}
+        # Import en flux : empreinte 64 bits de la clé -> id des questions
+        # déjà insérées, et fusions en attente sur ces questions
+        self.flushed_keys: Dict[int, str] = {}
+        self.flushed_merges: Dict[str, Tuple[List[str], List[str]]] = {}
         self.stats = {
             "total_rows": 0,
             "valid_questions": 0,
@@ -61,16 +79,24 @@ class CSVQuestionProcessor:
         if subject in self.subjects_count:
             return subject, False
 
-        best_subject = None
-        best_score = 0.0
+        # `subjects_count` ne fait que croître : le résultat d'un précédent
+        # parcours reste valable pour les sujets déjà comparés
+        best_subject, best_score, compared = self._subject_matches.get(
+            subject, (None, 0.0, 0)
+        )
+        if compared > len(self.subjects_count):
+            best_subject, best_score, compared = None, 0.0, 0
 
-        for s in self.subjects_count.keys():
-            if s == subject:
-                return s, False
+        for s in islice(self.subjects_count, compared, None):
             score = self.similarity(subject, s)
             if score > best_score:
                 best_score = score
                 best_subject = s
+        self._subject_matches[subject] = (
+            best_subject,
+            best_score,
+            len(self.subjects_count),
+        )
 
         if best_subject and best_score >= self.subject_threshold:
             return best_subject, True
@@ -110,6 +136,26 @@ class CSVQuestionProcessor:
         """Crée une clé unique pour détecter les doublons"""
         return self.standardize_question(question).lower()
 
+    @staticmethod
+    def key_digest(question_key: str) -> int:
+        """Empreinte compacte (64 bits) d'une clé de question"""
+        return int.from_bytes(
+            hashlib.blake2b(question_key.encode("utf-8"), digest_size=8).digest(),
+            "big",
+        )
+
+    @staticmethod
+    def key_hash(question_key: str) -> str:
+        """
+        Empreinte stockée en base (`question_key_hash`, index unique) :
+        identifie une question d'un import à l'autre
+        """
+        return hashlib.blake2b(question_key.encode("utf-8"), digest_size=16).hexdigest()
+
+    def question_key_hash(self, question: str) -> str:
+        """Empreinte de la clé de doublon d'un intitulé de question"""
+        return self.key_hash(self.create_question_key(question))
+
     def merge_responses_and_corrects(
         self,
         existing_responses: List[str],
@@ -172,68 +218,90 @@ class CSVQuestionProcessor:
 
     def _process_csv_row(self, row: Dict[str, str]) -> None:
         """Traite une ligne du CSV"""
+        item = self.normalize_row(row)
+        if item is not None:
+            self.add_normalized_row(item)
+
+    def normalize_row(self, row: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Nettoyage d'une ligne, indépendant des lignes précédentes (peut
+        s'exécuter dans un autre processus) ; None si la ligne n'a pas de
+        question.
+        """
         # Nettoyage initial
         question = self.strip_or_none(row.get("question"))
         if question:
             question = self.standardize_question(question)
+        if not question:
+            return None  # Ignore les lignes sans question
 
-        subject = self.strip_or_none(row.get("subject"))
-        use = self.strip_or_none(row.get("use"))
         correct = self.normalize_correct(row.get("correct", ""))
-        responseA = self.strip_or_none(row.get("responseA"))
-        responseB = self.strip_or_none(row.get("responseB"))
-        responseC = self.strip_or_none(row.get("responseC"))
-        responseD = self.strip_or_none(row.get("responseD"))
-        remark = self.strip_or_none(row.get("remark"))
+        # Construction des réponses et corrects
+        response_mapping = {
+            "A": self.strip_or_none(row.get("responseA")),
+            "B": self.strip_or_none(row.get("responseB")),
+            "C": self.strip_or_none(row.get("responseC")),
+            "D": self.strip_or_none(row.get("responseD")),
+        }
 
-        if not question:
-            return  # Ignore les lignes sans question
+        return {
+            "key": self.create_question_key(question),
+            "question": question,
+            "subject": self.strip_or_none(row.get("subject")),
+            "use": self.strip_or_none(row.get("use")),
+            "responses": [resp for resp in response_mapping.values() if resp],
+            "corrects": [
+                response_mapping[label]
+                for label in correct
+                if label in response_mapping and response_mapping[label]
+            ],
+            "remark": self.strip_or_none(row.get("remark")),
+        }
 
-        question_key = self.create_question_key(question)
+    def add_normalized_row(self, item: Dict[str, Any]) -> None:
+        """
+        Correction du sujet et dédoublonnage d'une ligne issue de
+        `normalize_row` (dans l'ordre du fichier)
+        """
+        question_key = item["key"]
+        subject = item["subject"]
+        use = item["use"]
+        liste_responses = item["responses"]
+        liste_corrects = item["corrects"]
 
         # Correction du sujet
-        subject_corrected = False
         if self.fix_subjects and subject:
             canon, corrected = self.canonicalize_subject(subject)
             subject = canon
-            subject_corrected = corrected
             self.subjects_count[canon] = self.subjects_count.get(canon, 0) + 1
             if corrected:
                 self.stats["subject_corrections"] += 1
 
-        # Construction des réponses et corrects
-        response_mapping = {
-            "A": responseA,
-            "B": responseB,
-            "C": responseC,
-            "D": responseD,
-        }
-
-        liste_responses = [resp for resp in response_mapping.values() if resp]
-        liste_corrects = [
-            response_mapping[label]
-            for label in correct
-            if label in response_mapping and response_mapping[label]
-        ]
-
         # Gestion des doublons
         if question_key in self.questions_cache:
             self._merge_duplicate_question(
                 question_key, liste_responses, liste_corrects
             )
             return
+        if self.flushed_keys:
+            question_id = self.flushed_keys.get(self.key_digest(question_key))
+            if question_id is not None:
+                self._merge_flushed_question(
+                    question_id, liste_responses, liste_corrects
+                )
+                return
 
         # Détermination du statut
         status = self.determine_status(liste_corrects)
 
         # Nouvelle question
         cleaned_row = {
-            "question": question,
+            "question": item["question"],
             "subject": [subject] if subject else [],
             "use": [use] if use else [],
             "responses": liste_responses,
             "corrects": liste_corrects,
-            "remark": remark,
+            "remark": item["remark"],
             "status": status,
         }
 
@@ -261,6 +329,165 @@ class CSVQuestionProcessor:
 
         self.stats["merged_questions"] += 1
 
+    def _merge_flushed_question(
+        self, question_id: str, new_responses: List[str], new_corrects: List[str]
+    ) -> None:
+        """
+        Doublon d'une question d'un lot déjà inséré : les nouvelles réponses
+        sont cumulées (mêmes règles de fusion) jusqu'à l'écriture du lot suivant.
+        """
+        pending_responses, pending_corrects = self.flushed_merges.get(
+            question_id, ([], [])
+        )
+        self.flushed_merges[question_id] = self.merge_responses_and_corrects(
+            pending_responses, new_responses, pending_corrects, new_corrects
+        )
+        self.stats["merged_questions"] += 1
+
+    def open_csv_stream(self, binary_file: BinaryIO) -> csv.DictReader:
+        """
+        Lecteur CSV décodant le fichier au fil de la lecture (UTF-8, BOM
+        toléré) ; seules les lignes en cours de traitement sont en mémoire.
+        """
+        text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text)
+        if not reader.fieldnames:
+            raise ValueError("Le fichier CSV ne contient pas d'en-têtes")
+        self.validate_csv_headers(reader.fieldnames)
+        return reader
+
+    def merge_processed_file(
+        self,
+        questions: Dict[str, dict],
+        subjects_count: Dict[str, int],
+        stats: Dict[str, int],
+    ) -> Tuple[int, int]:
+        """
+        Ajoute le résultat d'un fichier traité séparément (`process_csv_file`) :
+        ses sujets, dans l'ordre où ils apparaissent, sont corrigés comme
+        ceux d'une ligne, puis ses questions sont fusionnées avec celles des
+        fichiers précédents. Retourne (questions fusionnées, lignes au sujet
+        corrigé).
+        """
+        subjects: Dict[str, str] = {}
+        corrections = 0
+        if self.fix_subjects:
+            for subject, count in subjects_count.items():
+                canon, corrected = self.canonicalize_subject(subject)
+                self.subjects_count[canon] = self.subjects_count.get(canon, 0) + count
+                if corrected:
+                    subjects[subject] = canon
+                    corrections += count
+
+        merged = 0
+        for question_key, question_data in questions.items():
+            if subjects:
+                question_data["subject"] = [
+                    subjects.get(subject, subject)
+                    for subject in question_data["subject"]
+                ]
+            if question_key in self.questions_cache:
+                self._merge_duplicate_question(
+                    question_key, question_data["responses"], question_data["corrects"]
+                )
+                merged += 1
+            else:
+                self.questions_cache[question_key] = question_data
+
+        for name in ("total_rows", "merged_questions"):
+            self.stats[name] += stats.get(name, 0)
+        self.stats["subject_corrections"] += corrections
+        return merged, corrections
+
+    def take_batches(self, batch_size: int) -> Iterator[CSVBatch]:
+        """Lots des questions en cache, vidé au fur et à mesure"""
+        while self.questions_cache:
+            keys = list(islice(self.questions_cache, batch_size))
+            questions = [
+                QuestionCreate(**self.questions_cache.pop(key)) for key in keys
+            ]
+            self.stats["valid_questions"] += len(questions)
+            yield keys, questions, {}
+
+    def iter_batches(
+        self,
+        rows: Iterable[Optional[Dict[str, Any]]],
+        batch_size: int,
+        normalized: bool = False,
+    ) -> Iterator[CSVBatch]:
+        """
+        Traite les lignes au fil de l'eau et produit un lot dès que
+        `batch_size` questions (nouvelles ou fusions) sont en attente.
+        L'appelant doit enregistrer les ids insérés (`mark_inserted`) avant
+        de demander le lot suivant pour que la fusion des doublons exacts
+        continue de fonctionner entre les lots.
+        Avec `normalized`, les lignes sont déjà passées par `normalize_row`
+        (None pour une ligne sans question).
+        """
+        for row in rows:
+            self.stats["total_rows"] += 1
+            if not normalized:
+                self._process_csv_row(row)
+            elif row is not None:
+                self.add_normalized_row(row)
+            if len(self.questions_cache) + len(self.flushed_merges) >= batch_size:
+                yield self._take_batch()
+        if self.questions_cache or self.flushed_merges:
+            yield self._take_batch()
+
+    def _take_batch(self) -> CSVBatch:
+        keys = list(self.questions_cache.keys())
+        questions = [QuestionCreate(**data) for data in self.questions_cache.values()]
+        merges = self.flushed_merges
+        self.questions_cache = {}
+        self.flushed_merges = {}
+        self.stats["valid_questions"] += len(questions)
+        return keys, questions, merges
+
+    def mark_inserted(self, keys: List[str], ids: List[str]) -> None:
+        """Enregistre les ids des questions d'un lot inséré (index des clés)"""
+        for key, question_id in zip(keys, ids):
+            if question_id is not None:
+                self.flushed_keys[self.key_digest(key)] = question_id
+
     def get_stats(self) -> Dict[str, int]:
         """Retourne les statistiques de traitement"""
         return self.stats.copy()
+
+
+def process_import_file(
+    path: str, member: Optional[str] = None
+) -> Tuple[Dict[str, dict], Dict[str, int], Dict[str, int]]:
+    """
+    Traite un fichier d'import entier (CSV, JSONL ou XLSX selon son
+    extension), ou le fichier `member` de l'archive ZIP `path` (exécutable
+    dans un processus d'un pool), sans corriger les sujets : la correction
+    se fait à la réunion des fichiers pour rester cohérente entre eux.
+    Retourne les questions par clé, le nombre de lignes par sujet (ordre
+    d'apparition) et les statistiques, à réunir avec `merge_processed_file`.
+    """
+    processor = CSVQuestionProcessor(fix_subjects=False)
+    subjects_count: Dict[str, int] = {}
+
+    def _process(binary_file: BinaryIO, filename: str) -> None:
+        for row in open_rows(binary_file, filename, processor):
+            processor.stats["total_rows"] += 1
+            item = processor.normalize_row(row)
+            if item is None:
+                continue
+            if item["subject"]:
+                subjects_count[item["subject"]] = (
+                    subjects_count.get(item["subject"], 0) + 1
+                )
+            processor.add_normalized_row(item)
+
+    try:
+        if member is None:
+            with open(path, "rb") as binary_file:
+                _process(binary_file, path)
+        else:
+            with zipfile.ZipFile(path) as archive, archive.open(member) as binary_file:
+                _process(binary_file, member)
+    except UnicodeDecodeError:
+        raise ValueError("Le fichier doit être encodé en UTF-8")
+    return processor.questions_cache, subjects_count, processor.get_stats()
@@ -0,0 +1,135 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Union
+
+import bcrypt
+
+from utils.metrics import executor_queue_depth
+
+BCRYPT_WORKERS = int(
+    os.getenv("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+BCRYPT_MAX_CONCURRENCY = int(
+    os.getenv("BCRYPT_MAX_CONCURRENCY", str(BCRYPT_WORKERS))
+)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+class PasswordHasher:
+    """
+    Exécute les opérations bcrypt (≈200 ms chacune) hors de la boucle asyncio,
+    dans un pool de threads dédié et de taille limitée.
+    Un sémaphore borne le nombre de hachages en cours ; les appels en surplus
+    attendent leur tour et ce temps d'attente est mesuré.
+    """
+
+    def __init__(
+        self,
+        workers: int = BCRYPT_WORKERS,
+        max_concurrency: int = BCRYPT_MAX_CONCURRENCY,
+    ):
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+        # boucle d'événements -> sémaphore
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.run_time_total = 0.0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Sémaphore de la boucle d'événements courante (un `asyncio.Semaphore`
+        est lié à sa boucle). En service, c'est toujours la boucle principale
+        du worker, y compris en mode unifié (`anyio.from_thread.run` renvoie
+        les appels de Flask sur cette boucle) ; une autre boucle
+        (`asyncio.run` d'un script ou d'un test) a le sien. Les entrées sont
+        indexées par la boucle elle-même, en références faibles : elles
+        disparaissent avec la boucle.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            sem = self._semaphores.get(loop)
+            if sem is None:
+                sem = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = sem
+            return sem
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        submitted_at = time.perf_counter()
+        started_at: Optional[float] = None
+
+        def _job():
+            nonlocal started_at
+            started_at = time.perf_counter()
+            return func(*args)
+
+        self.waiting += 1
+        acquired = False
+        try:
+            async with self._get_semaphore():
+                acquired = True
+                self.waiting -= 1
+                self.running += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self._executor, _job)
+                finally:
+                    self.running -= 1
+                    if started_at is not None:
+                        queued = started_at - submitted_at
+                        self.completed += 1
+                        self.queue_time_total += queued
+                        self.queue_time_max = max(self.queue_time_max, queued)
+                        self.run_time_total += time.perf_counter() - started_at
+        finally:
+            if not acquired:
+                self.waiting -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hash un mot de passe avec bcrypt (sel généré)."""
+
+        def _hash() -> str:
+            salt = bcrypt.gensalt(BCRYPT_ROUNDS)
+            return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+        return await self._submit(_hash)
+
+    async def check(self, password: str, hashed: Union[bytes, str]) -> bool:
+        """Vérifie un mot de passe contre son hash bcrypt."""
+        if isinstance(hashed, str):
+            hashed = hashed.encode("utf-8")
+
+        def _check() -> bool:
+            return bcrypt.checkpw(password.encode("utf-8"), hashed)
+
+        return await self._submit(_check)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne l'état du pool et les temps d'attente/exécution moyens (ms)."""
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "avg_queue_ms": self.queue_time_total / completed * 1000,
+            "max_queue_ms": self.queue_time_max * 1000,
+            "avg_run_ms": self.run_time_total / completed * 1000,
+        }
+
+
+password_hasher = PasswordHasher()
+# appels en attente du sémaphore (le pool lui-même ne fait jamais la queue)
+executor_queue_depth.set_function(lambda: password_hasher.waiting, executor="bcrypt")
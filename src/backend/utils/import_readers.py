@@ -0,0 +1,124 @@
+"""
+Lecteurs des fichiers d'import de questions. Chaque format produit, en flux,
+des lignes au gabarit d'import (`question`, `subject`, `use`, `correct`,
+`responseA`..`responseD`, `remark` ; valeurs texte ou None) traitées ensuite
+par `CSVQuestionProcessor` (nettoyage, correction des sujets, fusion des
+doublons), quel que soit le format :
+
+- .csv   : en-tête puis une ligne par question (UTF-8, BOM toléré) ;
+- .jsonl : un objet JSON par ligne, mêmes clés que les colonnes du CSV
+  (`correct` peut aussi être une liste de lettres) ; le premier objet tient
+  lieu d'en-tête et doit avoir toutes les clés (null pour une valeur vide) ;
+- .xlsx  : première feuille, en-tête en première ligne (openpyxl en lecture
+  seule : les lignes sont lues au fil de l'eau).
+
+Un format s'ajoute en enregistrant son lecteur dans READERS.
+"""
+
+import io
+import json
+from datetime import date, datetime
+from pathlib import PurePath
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional
+
+Row = Dict[str, Optional[str]]
+# lecteur(flux binaire, processeur) -> lignes ; le processeur valide l'en-tête
+Reader = Callable[[BinaryIO, Any], Iterator[Row]]
+
+
+def _cell_text(value: Any) -> Optional[str]:
+    """Valeur d'une cellule ou d'un champ JSON en texte"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    return str(value)
+
+
+def read_csv(binary_file: BinaryIO, processor) -> Iterator[Row]:
+    return processor.open_csv_stream(binary_file)
+
+
+def read_jsonl(binary_file: BinaryIO, processor) -> Iterator[Row]:
+    """Un objet par ligne ; les lignes vides sont ignorées"""
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig")
+    first = True
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Ligne {number} : JSON invalide ({e.msg})")
+        if not isinstance(data, dict):
+            raise ValueError(f"Ligne {number} : un objet JSON est attendu")
+        if first:
+            processor.validate_csv_headers(list(data))
+            first = False
+        yield {key: _cell_text(value) for key, value in data.items()}
+
+
+def read_xlsx(binary_file: BinaryIO, processor) -> Iterator[Row]:
+    """Première feuille du classeur, lue ligne à ligne (mode lecture seule)"""
+    try:
+        # dépendance chargée au premier import XLSX seulement
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("L'import XLSX nécessite le paquet openpyxl")
+
+    try:
+        workbook = load_workbook(binary_file, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"Classeur XLSX illisible : {e}")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        fieldnames = [
+            str(cell).strip() if cell is not None else "" for cell in header or ()
+        ]
+        if not any(fieldnames):
+            raise ValueError("Le classeur ne contient pas d'en-têtes")
+        processor.validate_csv_headers(fieldnames)
+        for values in rows:
+            if values is None or all(value is None for value in values):
+                continue
+            yield {
+                name: _cell_text(value)
+                for name, value in zip(fieldnames, values)
+                if name
+            }
+    finally:
+        workbook.close()
+
+
+READERS: Dict[str, Reader] = {
+    ".csv": read_csv,
+    ".jsonl": read_jsonl,
+    ".xlsx": read_xlsx,
+}
+
+
+def import_format(filename: str) -> Optional[str]:
+    """Extension du fichier si son format est pris en charge, sinon None"""
+    suffix = PurePath(filename).suffix.lower()
+    return suffix if suffix in READERS else None
+
+
+def open_rows(binary_file: BinaryIO, filename: str, processor) -> Iterator[Row]:
+    """
+    Lignes du fichier selon son extension. Comme `open_csv_stream`, l'en-tête
+    est vérifié dès l'appel (CSV) ou à la première ligne lue (XLSX, JSONL).
+    """
+    suffix = import_format(filename)
+    if suffix is None:
+        raise ValueError(
+            f"Format non pris en charge : {filename} "
+            f"(formats acceptés : {', '.join(READERS)})"
+        )
+    return READERS[suffix](binary_file, processor)
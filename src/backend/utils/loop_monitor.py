@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+# Période de mesure du retard de la boucle (secondes)
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", "0.1"))
+# Retard au-delà duquel la pile du code bloquant est capturée (ms)
+LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+# Nombre de blocages récents conservés
+LOOP_STALLS_KEEP = int(os.getenv("LOOP_STALLS_KEEP", "50"))
+
+_BACKEND_DIR = str(Path(__file__).resolve().parent.parent)
+
+event_loop_lag = registry.gauge(
+    "event_loop_lag_seconds", "Dernier retard mesuré de la boucle d'événements"
+)
+event_loop_lag_histogram = registry.histogram(
+    "event_loop_lag_distribution_seconds",
+    "Distribution du retard de la boucle d'événements",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+event_loop_stalls_total = registry.counter(
+    "event_loop_stalls_total", "Blocages de la boucle au-delà du seuil", ("site",)
+)
+
+
+def _blocking_site(stack: traceback.StackSummary) -> str:
+    """
+    Frame du code applicatif le plus profond de la pile (hors bibliothèques) :
+    c'est l'appel synchrone à corriger.
+    """
+    for frame in reversed(stack):
+        if frame.filename.startswith(_BACKEND_DIR) and "site-packages" not in (
+            frame.filename
+        ):
+            relative = os.path.relpath(frame.filename, _BACKEND_DIR)
+            return f"{relative}:{frame.lineno} ({frame.name})"
+    last = stack[-1] if stack else None
+    return f"{last.filename}:{last.lineno} ({last.name})" if last else "inconnu"
+
+
+class LoopMonitor:
+    """
+    Surveille la boucle d'événements du worker :
+    - une tâche asyncio mesure le retard d'ordonnancement (durée réelle d'un
+      `sleep(interval)` moins `interval`) et le publie en métrique ;
+    - un thread chien de garde vérifie que cette tâche progresse ; si elle est
+      bloquée plus de LOOP_LAG_THRESHOLD_MS, il capture la pile du thread de
+      la boucle, c'est-à-dire le code synchrone qui la bloque.
+    """
+
+    def __init__(
+        self,
+        interval: float = LOOP_MONITOR_INTERVAL,
+        threshold_ms: float = LOOP_LAG_THRESHOLD_MS,
+    ):
+        self.interval = interval
+        self.threshold = threshold_ms / 1000
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=LOOP_STALLS_KEEP)
+        self.sites: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def _measure(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            event_loop_lag.set(lag)
+            event_loop_lag_histogram.observe(lag)
+
+    def _watch(self):
+        captured_for: Optional[float] = None
+        while not self._stop.wait(self.interval / 2):
+            beat = self._last_beat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked < self.threshold:
+                continue
+            if captured_for == beat:
+                continue  # un seul relevé par blocage
+            captured_for = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._record(traceback.extract_stack(frame), blocked)
+
+    def _record(self, stack: traceback.StackSummary, blocked: float):
+        site = _blocking_site(stack)
+        with self._lock:
+            self.sites[site] = self.sites.get(site, 0) + 1
+            self.stalls.append(
+                {
+                    "at": time.time(),
+                    "blocked_ms": round(blocked * 1000, 1),
+                    "site": site,
+                    "stack": traceback.format_list(stack),
+                }
+            )
+        event_loop_stalls_total.inc(site=site)
+        logger.warning(
+            "Boucle d'événements bloquée depuis %.0f ms par %s",
+            blocked * 1000,
+            site,
+            extra={"stack": "".join(traceback.format_list(stack[-8:]))},
+        )
+
+    def start(self):
+        """Démarre la mesure (à appeler depuis la boucle, au démarrage)."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def report(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Sites bloquants (par nombre d'occurrences) et blocages récents."""
+        with self._lock:
+            sites = sorted(self.sites.items(), key=lambda item: item[1], reverse=True)
+            stalls = list(self.stalls)
+        return {
+            "sites": [{"site": site, "count": count} for site, count in sites],
+            "recent": list(reversed(stalls)),
+        }
+
+
+loop_monitor = LoopMonitor()
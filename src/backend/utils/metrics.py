@@ -0,0 +1,337 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from pymongo import monitoring
+
+# Bornes (secondes) des histogrammes de latence
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base commune : nom, aide, étiquettes et verrou."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix_name, values, value in self.samples():
+            names = self.labels
+            if len(values) > len(names):
+                names = names + ("le",)
+            lines.append(
+                f"{suffix_name}{_format_labels(names, values)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(_Metric):
+    """Compteur monotone, par combinaison d'étiquettes."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    """
+    Jauge : valeur posée explicitement, ou lue à chaque export via une
+    fonction enregistrée avec `set_function`.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, func: Callable[[], float], **labels: str) -> None:
+        with self._lock:
+            self._functions[self._key(labels)] = func
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+            functions = list(self._functions.items())
+        for key, func in functions:
+            try:
+                values[key] = float(func())
+            except Exception:
+                continue  # une jauge en erreur ne doit pas casser l'export
+        return [(self.name, key, value) for key, value in values.items()]
+
+
+class Histogram(_Metric):
+    """Histogramme à bornes fixes (compteurs par tranche, somme et total)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # par étiquettes : [compteurs par tranche (+Inf en dernier), somme, total]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[key] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            snapshot = [
+                (key, list(counts), total, count)
+                for key, (counts, total, count) in self._series.items()
+            ]
+        samples = []
+        for key, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append(
+                    (f"{self.name}_bucket", key + (_format_value(bound),), cumulative)
+                )
+            samples.append((f"{self.name}_sum", key, total))
+            samples.append((f"{self.name}_count", key, count))
+        return samples
+
+
+class MetricsRegistry:
+    """Registre des métriques exportées au format texte Prometheus."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "Requêtes HTTP traitées", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Durée des requêtes HTTP par route",
+    ("method", "route"),
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "Requêtes HTTP en cours de traitement"
+)
+http_request_errors_total = registry.counter(
+    "http_request_errors_total",
+    "Requêtes HTTP en erreur (exception ou statut 5xx)",
+    ("method", "route"),
+)
+executor_queue_depth = registry.gauge(
+    "executor_queue_depth",
+    "Tâches en attente d'un thread, par exécuteur",
+    ("executor",),
+)
+mongo_pool_checked_out = registry.gauge(
+    "mongo_pool_checked_out", "Connexions MongoDB actuellement empruntées au pool"
+)
+mongo_pool_checkouts_total = registry.counter(
+    "mongo_pool_checkouts_total",
+    "Emprunts de connexions au pool MongoDB",
+    ("outcome",),
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI (sans BaseHTTPMiddleware) : nombre de requêtes, latence par
+    modèle de route (`/api/questions/{question_id}`, pas l'URL brute), requêtes
+    en cours et erreurs. Les URL sans route FastAPI sont regroupées sous `<other>`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "<other>"
+            method = scope["method"]
+            http_request_duration.observe(elapsed, method=method, route=template)
+            http_requests_total.inc(
+                method=method, route=template, status=str(status_code)
+            )
+            if status_code >= 500:
+                http_request_errors_total.inc(method=method, route=template)
+
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """Suit les emprunts de connexions du pool MongoDB (jauge et compteurs)."""
+
+    def connection_checked_out(self, event):
+        mongo_pool_checked_out.inc()
+        mongo_pool_checkouts_total.inc(outcome="ok")
+
+    def connection_checked_in(self, event):
+        mongo_pool_checked_out.dec()
+
+    def connection_check_out_failed(self, event):
+        mongo_pool_checkouts_total.inc(outcome="failed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+
+mongo_pool_listener = MongoPoolListener()
+
+
+def register_cache(name: str, cache) -> None:
+    """Expose le taux de succès et la taille d'un `LRUCache`."""
+    hit_ratio = registry.gauge(
+        "cache_hit_ratio", "Taux de succès des caches applicatifs", ("cache",)
+    )
+    size = registry.gauge(
+        "cache_entries", "Nombre d'entrées des caches applicatifs", ("cache",)
+    )
+    hit_ratio.set_function(lambda: cache.stats()["hit_ratio"], cache=name)
+    size.set_function(lambda: len(cache), cache=name)
+
+
+def register_executor(name: str, executor) -> None:
+    """Expose la file d'attente d'un `ThreadPoolExecutor`."""
+    executor_queue_depth.set_function(
+        lambda: executor._work_queue.qsize(), executor=name
+    )
@@ -1,11 +1,17 @@
+import logging
 import os
 from pymongo import MongoClient
 from dotenv import load_dotenv
 from typing import Optional
 import threading
 
+from utils.metrics import mongo_pool_listener
+from utils.query_monitor import mongo_command_listener
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 class Database:
     """
@@ -54,27 +60,66 @@ class Database:
             # Collection questions
             if "questions" not in existing_collections:
                 cls._db.create_collection("questions")
-                print("Collection 'questions' créée")
+                logger.info("Collection 'questions' créée")
 
                 # Optionnel: Créer des index pour optimiser les requêtes
                 cls._db["questions"].create_index("id")
-                print("Index créé sur 'questions.id'")
+                logger.info("Index créé sur 'questions.id'")
             else:
-                print("Collection 'questions' déjà existante")
+                logger.debug("Collection 'questions' déjà existante")
 
             # Collection questionnaires
             if "questionnaires" not in existing_collections:
                 cls._db.create_collection("questionnaires")
-                print("Collection 'questionnaires' créée")
+                logger.info("Collection 'questionnaires' créée")
 
                 # Optionnel: Créer des index
                 cls._db["questionnaires"].create_index("id")
-                print("Index créé sur 'questionnaires.id'")
+                logger.info("Index créé sur 'questionnaires.id'")
             else:
-                print("Collection 'questionnaires' déjà existante")
+                logger.debug("Collection 'questionnaires' déjà existante")
 
         except Exception as e:
-            print(f"Erreur lors de la création des collections: {e}")
+            logger.exception("Erreur lors de la création des collections: %s", e)
+            raise
+
+    @classmethod
+    def _create_indexes(cls):
+        """
+        Crée (de façon idempotente) les index utilisés par les filtres
+        et agrégations sur les questions.
+        """
+        try:
+            questions = cls._db["questions"]
+            # filtre + tri par défaut (date de création, puis _id) de
+            # /api/questions/query : le champ filtré sert aussi aux facettes
+            for field in ("subject", "use", "status", "created_by"):
+                questions.create_index(
+                    [(field, 1), ("created_at", -1), ("_id", -1)]
+                )
+            # tris sans filtre (et pagination par curseur sur (champ, _id))
+            questions.create_index([("created_at", -1), ("_id", -1)])
+            questions.create_index([("edited_at", -1), ("_id", -1)])
+            questions.create_index([("question", 1), ("_id", 1)])
+            questions.create_index([("status", 1), ("_id", 1)])
+            # recherche par mots dans l'intitulé (filtre `text`)
+            questions.create_index(
+                [("question", "text")], default_language="french"
+            )
+            # dédoublonnage entre imports ; les questions sans empreinte (doublons
+            # antérieurs à l'index) ne sont pas concernées
+            questions.create_index(
+                "question_key_hash",
+                unique=True,
+                partialFilterExpression={"question_key_hash": {"$type": "string"}},
+            )
+            # index multiclé des clés LSH (quasi-doublons)
+            questions.create_index("minhash_bands")
+            logger.debug("Index des questions vérifiés")
+            # tâches d'import actives relues au démarrage
+            cls._db["import_jobs"].create_index("status")
+        except Exception as e:
+            logger.exception("Erreur lors de la création des index: %s", e)
             raise
 
     @classmethod
@@ -87,8 +132,7 @@ class Database:
             if cls._mongodb_uri is None:
                 cls._load_config()
 
-            print("Connexion à MongoDB...")
-            print(f"   URI: {cls._mongodb_uri}")
+            logger.info("Connexion à MongoDB: %s", cls._mongodb_uri)
 
             try:
                 cls._client = MongoClient(
@@ -97,10 +141,11 @@ class Database:
                     connectTimeoutMS=5000,
                     maxPoolSize=10,
                     minPoolSize=1,
+                    event_listeners=[mongo_pool_listener, mongo_command_listener],
                 )
 
                 cls._client.admin.command("ping")
-                print("Connexion MongoDB réussie")
+                logger.info("Connexion MongoDB réussie")
 
                 # Sélectionner la base de données (la crée si elle n'existe pas)
                 cls._db = cls._client[cls._db_name]
@@ -108,21 +153,25 @@ class Database:
                 # Vérifier si la base existe déjà
                 existing_dbs = cls._client.list_database_names()
                 if cls._db_name not in existing_dbs:
-                    print(f"Base de données '{cls._db_name}' créée")
+                    logger.info("Base de données '%s' créée", cls._db_name)
                 else:
-                    print(f"Base de données '{cls._db_name}' existante")
+                    logger.debug("Base de données '%s' existante", cls._db_name)
 
                 # Créer les collections nécessaires
                 cls._create_collections()
+                cls._create_indexes()
 
                 # Sélectionner la collection par défaut
                 cls._collection = cls._db[cls._collection_name]
 
-                print(f"Base de données: {cls._db_name}")
-                print(f"Collection par défaut: {cls._collection_name}")
+                logger.info(
+                    "Base de données: %s, collection par défaut: %s",
+                    cls._db_name,
+                    cls._collection_name,
+                )
 
             except Exception as e:
-                print(f"Erreur connexion MongoDB: {e}")
+                logger.error("Erreur connexion MongoDB: %s", e)
                 raise
 
     @classmethod
@@ -136,7 +185,7 @@ class Database:
                 cls._client = None
                 cls._db = None
                 cls._collection = None
-                print("Connexion MongoDB fermée")
+                logger.info("Connexion MongoDB fermée")
 
     @classmethod
     def ping(cls):
@@ -150,7 +199,7 @@ class Database:
             cls._client.admin.command("ping")
             return True
         except Exception as e:
-            print(f"Ping MongoDB échoué: {e}")
+            logger.warning("Ping MongoDB échoué: %s", e)
             return False
 
     @classmethod
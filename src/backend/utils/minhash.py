@@ -0,0 +1,141 @@
+"""
+MinHash et LSH (locality-sensitive hashing) sur l'intitulé normalisé des
+questions, pour repérer les quasi-doublons (article, ponctuation ou faute de
+frappe près) sans comparer chaque question à toutes les autres.
+
+- l'intitulé est réduit à ses mots (minuscules, sans accents ni ponctuation,
+  sans articles ni mots vides) ;
+- la signature MinHash (MINHASH_PERMUTATIONS minima) estime la similarité
+  de Jaccard entre deux ensembles de mots ;
+- elle est découpée en MINHASH_BANDS bandes dont l'empreinte (entier 64 bits)
+  sert de clé de seau : deux questions partageant une clé sont candidates.
+  La recherche des candidats coûte donc un nombre fixe de clés par question,
+  quelle que soit la taille de la banque.
+
+Les candidats sont ensuite vérifiés par `near_duplicate_score`. Les clés
+sont stockées en base (`minhash_bands`) : les paramètres ci-dessous ne
+peuvent changer sans recalculer toutes les clés.
+"""
+
+import hashlib
+import os
+import random
+import re
+import unicodedata
+import zlib
+from difflib import SequenceMatcher
+from typing import Dict, Hashable, Iterable, List, Sequence, Set
+
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+_MINHASH_SEED = 20240611
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# Score minimal (0-1) de deux intitulés pour être considérés quasi-doublons
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.90"))
+
+# Articles et mots vides ignorés (après suppression des accents)
+STOPWORDS = frozenset("a au aux c ce d de des du en et l la le les qu un une".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def question_words(text: str) -> List[str]:
+    """Mots significatifs de l'intitulé, dans l'ordre"""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return [word for word in _WORD.findall(text) if word not in STOPWORDS]
+
+
+def near_duplicate_score(
+    words_a: Sequence[str],
+    words_b: Sequence[str],
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+) -> float:
+    """
+    Similarité (0-1) de deux intitulés réduits par `question_words` : ratio
+    de séquence sur les mots joints, tolérant aux fautes de frappe. Retourne
+    0 sous le seuil (les bornes rapides évitent alors le calcul complet).
+    """
+    a, b = " ".join(words_a), " ".join(words_b)
+    if not a or not b:
+        return 0.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return 0.0
+    ratio = matcher.ratio()
+    return ratio if ratio >= threshold else 0.0
+
+
+class MinHasher:
+    """Signatures MinHash et clés LSH (paramètres fixes : clés stockées)"""
+
+    def __init__(
+        self,
+        permutations: int = MINHASH_PERMUTATIONS,
+        bands: int = MINHASH_BANDS,
+        seed: int = _MINHASH_SEED,
+    ):
+        if permutations % bands:
+            raise ValueError("Le nombre de permutations doit être multiple des bandes")
+        self.bands = bands
+        self.rows = permutations // bands
+        rng = random.Random(seed)
+        # permutations universelles h -> (a*h + b) mod p
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(_MERSENNE_PRIME))
+            for _ in range(permutations)
+        ]
+
+    def signature(self, words: Iterable[str]) -> List[int]:
+        """Minimum de chaque permutation sur les mots (vide si aucun mot)"""
+        hashes = {zlib.crc32(word.encode("utf-8")) for word in words}
+        if not hashes:
+            return []
+        values = [
+            [(a * h + b) % _MERSENNE_PRIME for a, b in self._permutations]
+            for h in hashes
+        ]
+        if len(values) == 1:
+            return values[0]
+        return list(map(min, *values))
+
+    def band_keys(self, signature: List[int]) -> List[int]:
+        """Une clé de seau (entier signé 64 bits) par bande de la signature"""
+        keys = []
+        for band in range(len(signature) // self.rows):
+            rows = signature[band * self.rows : (band + 1) * self.rows]
+            digest = hashlib.blake2b(
+                b"".join(value.to_bytes(8, "big") for value in rows),
+                digest_size=8,
+                salt=band.to_bytes(2, "big"),
+            ).digest()
+            keys.append(int.from_bytes(digest, "big", signed=True))
+        return keys
+
+    def keys(self, text: str) -> List[int]:
+        """Clés LSH d'un intitulé"""
+        return self.band_keys(self.signature(question_words(text)))
+
+
+class LSHIndex:
+    """Index en mémoire : clé de seau -> éléments qui la partagent"""
+
+    def __init__(self):
+        self.buckets: Dict[int, List[Hashable]] = {}
+
+    def add(self, item: Hashable, keys: Iterable[int]) -> None:
+        for key in keys:
+            self.buckets.setdefault(key, []).append(item)
+
+    def candidates(self, keys: Iterable[int]) -> Set[Hashable]:
+        """Éléments partageant au moins une clé"""
+        found: Set[Hashable] = set()
+        for key in keys:
+            found.update(self.buckets.get(key, ()))
+        return found
+
+
+minhasher = MinHasher()
@@ -0,0 +1,135 @@
+import cProfile
+import logging
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from utils.logger import request_id_var
+from utils.security import verify_token
+
+logger = logging.getLogger(__name__)
+
+# Profilage d'une requête sur N (0 : désactivé)
+PROFILE_SAMPLE_RATE = int(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Profilage à la demande via l'en-tête X-Profile (token ADMIN requis)
+PROFILE_ON_HEADER = os.getenv("PROFILE_ON_HEADER", "false").lower() == "true"
+PROFILE_DIR = Path(
+    os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "quiz-profiles"))
+)
+# Nombre de fichiers conservés (les plus anciens sont supprimés)
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+PROFILE_HEADER = b"x-profile"
+PROFILING_ENABLED = PROFILE_SAMPLE_RATE > 0 or PROFILE_ON_HEADER
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _is_admin_request(scope) -> bool:
+    """Vrai si la requête porte un token Bearer valide d'un ADMIN."""
+    authorization = _header(scope, b"authorization") or ""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    payload = verify_token(token)
+    return bool(payload) and str(payload.get("role", "")).lower() == "admin"
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Profils disponibles, du plus récent au plus ancien."""
+    if not PROFILE_DIR.exists():
+        return []
+    files = sorted(
+        PROFILE_DIR.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True
+    )
+    return [
+        {
+            "name": path.name,
+            "size": path.stat().st_size,
+            "created_at": path.stat().st_mtime,
+        }
+        for path in files
+    ]
+
+
+def get_profile_path(name: str) -> Optional[Path]:
+    """Chemin d'un profil existant ; None si le nom est inconnu ou invalide."""
+    if _SAFE_NAME.sub("", name) != name or not name.endswith(".prof"):
+        return None
+    path = PROFILE_DIR / name
+    return path if path.is_file() else None
+
+
+def _save(profiler: cProfile.Profile, name: str) -> None:
+    """Écrit le profil (format pstats) et applique la rotation."""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(PROFILE_DIR / name))
+    files = sorted(PROFILE_DIR.glob("*.prof"), key=lambda p: p.stat().st_mtime)
+    for old in files[:-PROFILE_KEEP] if PROFILE_KEEP > 0 else []:
+        old.unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI profilant une requête avec cProfile, soit sur demande
+    (en-tête `X-Profile` avec un token ADMIN, si PROFILE_ON_HEADER), soit pour
+    une requête sur PROFILE_SAMPLE_RATE. Un seul profil à la fois par worker :
+    cProfile suit le thread de la boucle, les autres requêtes traitées au même
+    moment apparaissent donc aussi dans le profil.
+    Installé seulement si le profilage est activé (aucun coût sinon).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = threading.Lock()
+
+    def _should_profile(self, scope) -> bool:
+        if PROFILE_ON_HEADER and _header(scope, PROFILE_HEADER) is not None:
+            return _is_admin_request(scope)
+        return PROFILE_SAMPLE_RATE > 0 and random.randrange(PROFILE_SAMPLE_RATE) == 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)  # un profil est déjà en cours
+            return
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                profiler.disable()
+        finally:
+            self._busy.release()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            name = _SAFE_NAME.sub(
+                "_",
+                f"{time.strftime('%Y%m%d-%H%M%S')}_{scope['method']}_"
+                f"{route.strip('/')}_{int(elapsed_ms)}ms_"
+                f"{request_id_var.get() or os.getpid()}",
+            )
+            try:
+                await run_in_threadpool(_save, profiler, f"{name}.prof")
+                logger.info("Profil enregistré", extra={"profile": f"{name}.prof"})
+            except OSError as e:
+                logger.error("Impossible d'enregistrer le profil: %s", e)
@@ -0,0 +1,272 @@
+import copy
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+from utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Seuil (ms) au-delà duquel une commande est consignée dans le journal lent
+MONGO_SLOW_QUERY_MS = float(os.getenv("MONGO_SLOW_QUERY_MS", "100"))
+# Nombre maximal de formes de requêtes lentes conservées
+MONGO_SLOW_SHAPES = int(os.getenv("MONGO_SLOW_SHAPES", "200"))
+
+# Commandes techniques du driver, non mesurées
+_IGNORED_COMMANDS = frozenset(
+    {
+        "hello",
+        "ismaster",
+        "isMaster",
+        "ping",
+        "buildInfo",
+        "endSessions",
+        "saslStart",
+        "saslContinue",
+        "authenticate",
+        "getnonce",
+        "killCursors",
+    }
+)
+# Commandes pour lesquelles `explain` est possible
+_EXPLAINABLE = frozenset(
+    {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+)
+# Champs ajoutés par le driver, retirés avant un `explain`
+_DRIVER_FIELDS = ("lsid", "$db", "$clusterTime", "$readPreference", "txnNumber")
+
+mongo_command_duration = registry.histogram(
+    "mongo_command_duration_seconds",
+    "Durée des commandes MongoDB",
+    ("collection", "operation"),
+)
+mongo_command_documents = registry.histogram(
+    "mongo_command_documents",
+    "Documents retournés ou modifiés par commande MongoDB",
+    ("collection", "operation"),
+    buckets=(0, 1, 10, 100, 1000, 10000, 100000),
+)
+mongo_command_errors_total = registry.counter(
+    "mongo_command_errors_total",
+    "Commandes MongoDB en échec",
+    ("collection", "operation"),
+)
+mongo_slow_queries_total = registry.counter(
+    "mongo_slow_queries_total",
+    "Commandes MongoDB au-delà du seuil de lenteur",
+    ("collection", "operation"),
+)
+
+
+def normalize_shape(value: Any) -> Any:
+    """
+    Forme normalisée d'un filtre : les clés et opérateurs sont conservés,
+    les valeurs remplacées par "?" (les listes de sous-filtres de `$and`,
+    `$or`, `$nor` sont normalisées élément par élément).
+    """
+    if isinstance(value, dict):
+        return {key: normalize_shape(sub) for key, sub in sorted(value.items())}
+    if isinstance(value, (list, tuple)) and value and all(
+        isinstance(item, dict) for item in value
+    ):
+        return [normalize_shape(item) for item in value]
+    return "?"
+
+
+def _command_filter(name: str, command: Dict[str, Any]) -> Any:
+    """Extrait la partie « filtre » d'une commande selon son type."""
+    if name == "find":
+        return command.get("filter", {})
+    if name in ("count", "distinct", "findAndModify"):
+        return command.get("query", {})
+    if name == "update":
+        return [u.get("q", {}) for u in command.get("updates", [])[:1]]
+    if name == "delete":
+        return [d.get("q", {}) for d in command.get("deletes", [])[:1]]
+    if name == "aggregate":
+        return command.get("pipeline", [])
+    return {}
+
+
+def _documents_count(name: str, reply: Dict[str, Any]) -> int:
+    """Nombre de documents retournés (curseur) ou affectés (écritures)."""
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch", []))
+        return len(batch)
+    if name == "distinct":
+        return len(reply.get("values", []))
+    n = reply.get("n")
+    return int(n) if isinstance(n, (int, float)) else 0
+
+
+class SlowQueryLog:
+    """
+    Formes de requêtes lentes, agrégées par (collection, opération, forme) :
+    nombre d'occurrences, durées totale et maximale, et un exemple de commande
+    (celui de la durée maximale) pour `explain`.
+    """
+
+    def __init__(self, max_shapes: int = MONGO_SLOW_SHAPES):
+        self.max_shapes = max_shapes
+        self._entries: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        collection: str,
+        operation: str,
+        shape: str,
+        duration_ms: float,
+        command: Optional[Dict[str, Any]],
+    ) -> None:
+        key = (collection, operation, shape)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_shapes:
+                    # évince la forme dont la durée maximale est la plus faible
+                    weakest = min(
+                        self._entries, key=lambda k: self._entries[k]["max_ms"]
+                    )
+                    del self._entries[weakest]
+                entry = {
+                    "collection": collection,
+                    "operation": operation,
+                    "shape": shape,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "command": None,
+                }
+                self._entries[key] = entry
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            if duration_ms >= entry["max_ms"]:
+                entry["max_ms"] = duration_ms
+                if command is not None:
+                    entry["command"] = copy.deepcopy(command)
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Les `limit` formes les plus lentes (durée maximale décroissante)."""
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        entries.sort(key=lambda e: e["max_ms"], reverse=True)
+        for entry in entries:
+            entry["avg_ms"] = entry["total_ms"] / entry["count"]
+        return entries[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """
+    Mesure chaque commande MongoDB : durée, collection, opération et nombre
+    de documents. Les commandes au-delà de MONGO_SLOW_QUERY_MS sont consignées
+    dans `slow_query_log` avec la forme normalisée de leur filtre.
+    """
+
+    def __init__(self, threshold_ms: float = MONGO_SLOW_QUERY_MS):
+        self.threshold_ms = threshold_ms
+        self._pending: Dict[Tuple[int, Any], Tuple[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        if event.command_name in _IGNORED_COMMANDS:
+            return
+        name = event.command_name
+        collection = event.command.get(name)
+        if not isinstance(collection, str):
+            collection = event.command.get("collection", "")  # getMore
+        with self._lock:
+            self._pending[(event.request_id, event.connection_id)] = (
+                str(collection),
+                event.command,
+            )
+
+    def _finish(self, event) -> Optional[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            return self._pending.pop((event.request_id, event.connection_id), None)
+
+    def succeeded(self, event):
+        pending = self._finish(event)
+        if pending is None:
+            return
+        collection, command = pending
+        name = event.command_name
+        duration_ms = event.duration_micros / 1000
+        mongo_command_duration.observe(
+            duration_ms / 1000, collection=collection, operation=name
+        )
+        mongo_command_documents.observe(
+            _documents_count(name, event.reply),
+            collection=collection,
+            operation=name,
+        )
+        if duration_ms >= self.threshold_ms:
+            self._log_slow(collection, name, command, duration_ms)
+
+    def failed(self, event):
+        pending = self._finish(event)
+        if pending is None:
+            return
+        collection, _ = pending
+        mongo_command_errors_total.inc(
+            collection=collection, operation=event.command_name
+        )
+
+    def _log_slow(
+        self, collection: str, name: str, command: Dict[str, Any], duration_ms: float
+    ) -> None:
+        shape = json.dumps(
+            normalize_shape(_command_filter(name, command)),
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        mongo_slow_queries_total.inc(collection=collection, operation=name)
+        slow_query_log.record(
+            collection,
+            name,
+            shape,
+            duration_ms,
+            command if name in _EXPLAINABLE else None,
+        )
+        logger.warning(
+            "Requête lente %s.%s (%.1f ms)",
+            collection,
+            name,
+            duration_ms,
+            extra={"slow_query_shape": shape, "duration_ms": round(duration_ms, 1)},
+        )
+
+
+mongo_command_listener = MongoCommandListener()
+
+
+def explain_winning_plan(db, command: Optional[Dict[str, Any]]) -> Optional[Any]:
+    """
+    Rejoue une commande enregistrée avec `explain` (mode queryPlanner) et
+    retourne le plan gagnant, ou None si la commande n'est pas explicable.
+    """
+    if not command:
+        return None
+    command = {k: v for k, v in command.items() if k not in _DRIVER_FIELDS}
+    result = db.command("explain", command, verbosity="queryPlanner")
+    planner = result.get("queryPlanner")
+    if planner is None:
+        # agrégation : le plan est porté par l'étape $cursor
+        for stage in result.get("stages", []):
+            cursor = stage.get("$cursor")
+            if cursor and "queryPlanner" in cursor:
+                planner = cursor["queryPlanner"]
+                break
+    return planner.get("winningPlan") if planner else None
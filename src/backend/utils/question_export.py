@@ -0,0 +1,162 @@
+"""
+Export des questions au gabarit d'import (`question`, `subject`, `use`,
+`correct`, `responseA`..`responseD`, `remark`) : un fichier exporté peut
+être réimporté tel quel par `PUT /api/questions/from_csv`.
+
+Les documents sont lus au fil d'un curseur MongoDB et encodés par paquets
+(`EXPORT_CHUNK_SIZE` octets environ) : la mémoire ne dépend pas du nombre de
+questions exportées.
+
+Une question de plus de 4 réponses occupe plusieurs lignes de même intitulé,
+que l'import fusionne en une seule question. Le gabarit n'a qu'un sujet et
+qu'un usage par question : seuls les premiers sont exportés.
+
+`ExportFormat` et `export_response` sont partagés par les routes d'export
+(questions filtrées, questions d'un questionnaire).
+"""
+
+import csv
+import io
+import json
+import os
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from fastapi.responses import StreamingResponse
+
+# taille des paquets envoyés au client (octets)
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", str(64 * 1024)))
+# documents lus par aller-retour du curseur MongoDB
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_FIELDS = [
+    "question",
+    "subject",
+    "use",
+    "correct",
+    "responseA",
+    "responseB",
+    "responseC",
+    "responseD",
+    "remark",
+]
+LETTERS = "ABCD"
+
+# champs lus en base (projection des requêtes d'export)
+EXPORT_PROJECTION = {
+    "question": 1,
+    "subject": 1,
+    "use": 1,
+    "corrects": 1,
+    "responses": 1,
+    "remark": 1,
+}
+
+Row = Dict[str, Optional[str]]
+Encoder = Callable[[Iterable[Dict[str, Any]]], Iterator[bytes]]
+
+
+def _first(values: Optional[List[str]]) -> Optional[str]:
+    return values[0] if values else None
+
+
+def question_rows(doc: Dict[str, Any]) -> Iterator[Row]:
+    """Lignes du gabarit d'import d'un document question"""
+    responses = doc.get("responses") or []
+    corrects = set(doc.get("corrects") or [])
+    subject = _first(doc.get("subject"))
+    use = _first(doc.get("use"))
+    for start in range(0, max(len(responses), 1), len(LETTERS)):
+        chunk = responses[start : start + len(LETTERS)]
+        row: Row = {
+            "question": doc.get("question"),
+            "subject": subject,
+            "use": use,
+            "correct": " ".join(
+                letter
+                for letter, response in zip(LETTERS, chunk)
+                if response in corrects
+            ),
+        }
+        for index, letter in enumerate(LETTERS):
+            row[f"response{letter}"] = chunk[index] if index < len(chunk) else None
+        row["remark"] = doc.get("remark") if start == 0 else None
+        yield row
+
+
+def _chunks(lines: Iterable[str], head: str = "") -> Iterator[bytes]:
+    """Regroupe les lignes en paquets d'environ EXPORT_CHUNK_SIZE octets"""
+    buffer: List[str] = [head] if head else []
+    size = len(head)
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def encode_csv(docs: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """CSV UTF-8 avec BOM (lisible par Excel, accepté par l'import)"""
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS, lineterminator="\n")
+
+    def _lines() -> Iterator[str]:
+        for doc in docs:
+            for row in question_rows(doc):
+                writer.writerow(row)
+                yield out.getvalue()
+                out.seek(0)
+                out.truncate()
+
+    writer.writeheader()
+    header = out.getvalue()
+    out.seek(0)
+    out.truncate()
+    return _chunks(_lines(), "\ufeff" + header)
+
+
+def encode_jsonl(docs: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Un objet JSON par ligne, mêmes clés que les colonnes du CSV"""
+    return _chunks(
+        json.dumps(row, ensure_ascii=False) + "\n"
+        for doc in docs
+        for row in question_rows(doc)
+    )
+
+
+# format -> (encodeur, type MIME)
+EXPORT_FORMATS: Dict[str, Tuple[Encoder, str]] = {
+    "csv": (encode_csv, "text/csv; charset=utf-8"),
+    "jsonl": (encode_jsonl, "application/x-ndjson"),
+}
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    jsonl = "jsonl"
+
+
+def export_stream(docs: Iterable[Dict[str, Any]], format: str) -> Iterator[bytes]:
+    """Contenu du fichier d'export, paquet par paquet"""
+    if format not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Format d'export non pris en charge : {format} "
+            f"(formats acceptés : {', '.join(EXPORT_FORMATS)})"
+        )
+    encoder, _ = EXPORT_FORMATS[format]
+    return encoder(docs)
+
+
+def export_response(
+    chunks: Iterable[bytes], format: ExportFormat, filename: str
+) -> StreamingResponse:
+    """Réponse en flux d'un export, proposée au téléchargement"""
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[format.value][1],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format.value}"'
+        },
+    )
@@ -1,23 +1,57 @@
+import logging
 import sqlite3
 import os
-
-
-class Connection:
-    connexion = None
-    cursor = None
-
-    @classmethod
-    def _get_db_path(cls):
-        """Détermine le chemin de la base de données."""
+import threading
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    Pool de connexions SQLite : une connexion par thread worker, ouverte au
+    premier usage puis réutilisée (pas de réouverture du fichier à chaque appel).
+    Chaque connexion est configurée en WAL, `synchronous=NORMAL`, avec un
+    délai d'attente sur verrou et un cache de requêtes préparées.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        busy_timeout_ms: Optional[int] = None,
+        cached_statements: Optional[int] = None,
+    ):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms or int(
+            os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")
+        )
+        self.cached_statements = cached_statements or int(
+            os.getenv("SQLITE_CACHED_STATEMENTS", "128")
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._initialized = False
+
+    @staticmethod
+    def _default_db_dir() -> str:
+        """Répertoire `db` du projet (base par défaut et script de création)."""
         current_dir = os.path.dirname(os.path.abspath(__file__))
         if "src" in current_dir:
             src_index = current_dir.find("src")
             src_dir = current_dir[: src_index + 3]
-            db_dir = os.path.join(src_dir, "db")
-        else:
-            parent_dir = os.path.dirname(current_dir)
-            db_dir = os.path.join(parent_dir, "db")
+            return os.path.join(src_dir, "db")
+        parent_dir = os.path.dirname(current_dir)
+        return os.path.join(parent_dir, "db")
 
+    @classmethod
+    def _get_db_path(cls):
+        """Détermine le chemin de la base (surchargeable par SQLITE_DB_PATH)."""
+        env_path = os.getenv("SQLITE_DB_PATH")
+        if env_path:
+            return os.path.dirname(os.path.abspath(env_path)), env_path
+
+        db_dir = cls._default_db_dir()
         return db_dir, os.path.join(db_dir, "utilisateurs.db")
 
     @classmethod
@@ -27,11 +61,13 @@ class Connection:
         os.makedirs(db_dir, exist_ok=True)
 
         # Chercher le script de création
-        script_path = os.path.join(db_dir, "script_creation.sql")
+        script_path = os.path.join(cls._default_db_dir(), "script_creation.sql")
 
         if not os.path.exists(script_path):
-            print(f"Attention: Script de création non trouvé à {script_path}")
-            print("Création d'une base de données vide...")
+            logger.warning(
+                "Script de création non trouvé à %s, création d'une base vide",
+                script_path,
+            )
 
         # Créer la connexion (cela crée le fichier .db)
         conn = sqlite3.connect(db_path)
@@ -43,54 +79,84 @@ class Connection:
                     script = f.read()
                 conn.executescript(script)
                 conn.commit()
-                print(
-                    f"Base de données créée avec succès à partir du script: {script_path}"
+                logger.info(
+                    "Base de données créée à partir du script: %s", script_path
                 )
             except Exception as e:
-                print(f"Erreur lors de l'exécution du script de création: {e}")
+                logger.exception("Erreur lors de l'exécution du script de création")
                 conn.close()
                 raise
 
         conn.close()
 
-    @classmethod
-    def connect(cls):
-        if cls.connexion is None:
+    def _initialize(self):
+        """Résout le chemin et crée la base si absente (une seule fois)."""
+        with self._lock:
+            if self._initialized:
+                return
+            db_dir, default_path = self._get_db_path()
+            if self.db_path is None:
+                self.db_path = default_path
+            else:
+                db_dir = os.path.dirname(os.path.abspath(self.db_path))
+
+            if not os.path.exists(self.db_path):
+                logger.info(
+                    "Base de données non trouvée à %s, création...", self.db_path
+                )
+                self._create_database(self.db_path, db_dir)
+            self._initialized = True
+
+    def _open(self) -> sqlite3.Connection:
+        """Ouvre et configure une nouvelle connexion pour le thread courant."""
+        try:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.busy_timeout_ms / 1000,
+                cached_statements=self.cached_statements,
+                # une connexion par thread ; autorise seulement close_all() ailleurs
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            logger.debug(
+                "Base de données SQLite connectée: %s (%s)",
+                self.db_path,
+                threading.current_thread().name,
+            )
+        except sqlite3.Error as e:
+            logger.error("Erreur BDD SQLite: %s", e)
+            raise
+
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        """Retourne la connexion du thread courant (ouverte au besoin)."""
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            if not self._initialized:
+                self._initialize()
+            conn = self._open()
+            self._local.connection = conn
+        return conn
+
+    def close_all(self):
+        """Ferme toutes les connexions ouvertes par le pool."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
             try:
-                db_dir, db_path = cls._get_db_path()
-
-                # Vérifier si la base de données existe, sinon la créer
-                if not os.path.exists(db_path):
-                    print(f"Base de données non trouvée à {db_path}")
-                    print("Création de la base de données...")
-                    cls._create_database(db_path, db_dir)
-
-                # Connexion à la base de données
-                cls.connexion = sqlite3.connect(db_path)
-                cls.connexion.row_factory = sqlite3.Row
-
-                # Test de la connexion
-                cls.connexion.execute("SELECT 1").fetchone()
-                print(f"Base de données SQLite connectée: {db_path}")
-
-            except sqlite3.Error as e:
-                print(f"Erreur BDD SQLite: {e}")
-                cls.connexion = None
-                raise
-            except Exception as e:
-                print(f"Erreur de connexion BDD SQLite: {e}")
-                cls.connexion = None
-                raise
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+        if connections:
+            logger.info("Connexions SQLite fermées (%d)", len(connections))
 
-        if cls.cursor is None and cls.connexion is not None:
-            cls.cursor = cls.connexion.cursor()
 
-    @classmethod
-    def close(cls):
-        if cls.cursor is not None:
-            cls.cursor.close()
-            cls.cursor = None
-        if cls.connexion is not None:
-            cls.connexion.close()
-            cls.connexion = None
-            print("Connexion SQLite fermée")
+# Pool partagé de la base utilisateurs
+sqlite_pool = ConnectionPool()
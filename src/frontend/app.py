@@ -2,14 +2,24 @@ from pathlib import Path
 from flask import Flask, jsonify, redirect, render_template, request, session, url_for
 from werkzeug.exceptions import HTTPException
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, List
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # Configuration de l'API Backend
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "5"))
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "20"))
+API_RETRIES = int(os.getenv("API_RETRIES", "2"))
+API_RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.2"))
+# Identifiants par appel à /api/auth/users/names (limite du schéma de l'API)
+USER_NAMES_BATCH = 1000
 
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -36,17 +46,108 @@ def inject_user():
 # ==================== API CLIENT HELPERS ====================
 
 
-class APIClient:
-    """Client pour communiquer avec l'API FastAPI"""
+class APIMetrics:
+    """Compteurs de temps par type d'appel à l'API (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Dict[str, float]] = {}
 
-    @staticmethod
-    def login(username: str, password: str) -> Optional[Dict[str, Any]]:
+    def record(self, name: str, elapsed_ms: float, error: bool = False) -> None:
+        with self._lock:
+            m = self._calls.setdefault(
+                name, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            m["count"] += 1
+            m["errors"] += int(error)
+            m["total_ms"] += elapsed_ms
+            m["max_ms"] = max(m["max_ms"], elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {**m, "avg_ms": m["total_ms"] / m["count"]}
+                for name, m in self._calls.items()
+            }
+
+
+def build_http_session() -> requests.Session:
+    """
+    Session HTTP partagée vers l'API : pool de connexions keep-alive et
+    relances avec backoff (erreurs de connexion, 502/503/504 sur GET).
+    """
+    retry = Retry(
+        total=API_RETRIES,
+        connect=API_RETRIES,
+        read=1,
+        status=API_RETRIES,
+        backoff_factor=API_RETRY_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=API_POOL_SIZE, max_retries=retry
+    )
+    http = requests.Session()
+    http.mount("http://", adapter)
+    http.mount("https://", adapter)
+    return http
+
+
+class APIClient:
+    """
+    Client pour communiquer avec l'API FastAPI.
+    Par défaut les appels passent par HTTP ; en mode unifié (Flask monté dans
+    FastAPI), `use_backend` branche un backend local qui appelle les services
+    directement, avec les mêmes méthodes et formats de retour.
+    """
+
+    http = build_http_session()
+    metrics = APIMetrics()
+    backend: Optional[Any] = None
+
+    @classmethod
+    def use_backend(cls, backend: Optional[Any]) -> None:
+        """Branche (ou retire avec None) un backend local à la place de HTTP"""
+        cls.backend = backend
+
+    @classmethod
+    def _local(cls, name: str, *args):
+        """Appel du backend local, chronométré comme un appel HTTP"""
+        start = time.perf_counter()
+        error = True
+        try:
+            result = getattr(cls.backend, name)(*args)
+            error = False
+            return result
+        finally:
+            cls.metrics.record(name, (time.perf_counter() - start) * 1000, error)
+
+    @classmethod
+    def _request(cls, name: str, method: str, path: str, **kwargs):
+        """Appel HTTP via la session partagée, chronométré par type d'appel"""
+        kwargs.setdefault("timeout", API_TIMEOUT)
+        start = time.perf_counter()
+        error = True
+        try:
+            response = cls.http.request(method, f"{API_BASE_URL}{path}", **kwargs)
+            error = response.status_code >= 500
+            return response
+        finally:
+            cls.metrics.record(name, (time.perf_counter() - start) * 1000, error)
+
+    @classmethod
+    def login(cls, username: str, password: str) -> Optional[Dict[str, Any]]:
         """Authentifie un utilisateur via l'API"""
+        if cls.backend is not None:
+            return cls._local("login", username, password)
         try:
-            response = requests.post(
-                f"{API_BASE_URL}/api/auth/login",
+            response = cls._request(
+                "login",
+                "POST",
+                "/api/auth/login",
                 json={"username": username, "password": password},
-                timeout=5,
             )
             if response.status_code == 200:
                 return response.json()
@@ -55,14 +156,19 @@ class APIClient:
             print(f"❌ Erreur API login: {e}")
             return None
 
-    @staticmethod
-    def register(name: str, email: str, password: str) -> Optional[Dict[str, Any]]:
+    @classmethod
+    def register(
+        cls, name: str, email: str, password: str
+    ) -> Optional[Dict[str, Any]]:
         """Crée un compte utilisateur via l'API"""
+        if cls.backend is not None:
+            return cls._local("register", name, email, password)
         try:
-            response = requests.post(
-                f"{API_BASE_URL}/api/auth/register",
+            response = cls._request(
+                "register",
+                "POST",
+                "/api/auth/register",
                 json={"name": name, "email": email, "password": password},
-                timeout=5,
             )
             if response.status_code == 201:
                 return response.json()
@@ -71,14 +177,34 @@ class APIClient:
             print(f"❌ Erreur API register: {e}")
             return None
 
-    @staticmethod
-    def get_user_name(user_id: int, token: str) -> str:
+    @classmethod
+    def logout(cls, token: str) -> bool:
+        """Révoque le token côté API (déconnexion)"""
+        if cls.backend is not None:
+            return cls._local("logout", token)
+        try:
+            response = cls._request(
+                "logout",
+                "POST",
+                "/api/auth/logout",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            return response.status_code == 204
+        except requests.RequestException as e:
+            print(f"❌ Erreur API logout: {e}")
+            return False
+
+    @classmethod
+    def get_user_name(cls, user_id: int, token: str) -> str:
         """Récupère le nom d'un utilisateur via l'API"""
+        if cls.backend is not None:
+            return cls._local("get_user_name", user_id, token)
         try:
-            response = requests.get(
-                f"{API_BASE_URL}/api/auth/users/{user_id}/name",
+            response = cls._request(
+                "get_user_name",
+                "GET",
+                f"/api/auth/users/{user_id}/name",
                 headers={"Authorization": f"Bearer {token}"},
-                timeout=5,
             )
             if response.status_code == 200:
                 return response.json().get("userName", "Inconnu")
@@ -87,6 +213,26 @@ class APIClient:
             print(f"❌ Erreur API get_user_name: {e}")
             return "Inconnu"
 
+    @classmethod
+    def get_user_names(cls, user_ids: List[int], token: str) -> Dict[str, str]:
+        """Récupère les noms de plusieurs utilisateurs en un seul appel API"""
+        if cls.backend is not None:
+            return cls._local("get_user_names", user_ids, token)
+        try:
+            response = cls._request(
+                "get_user_names",
+                "POST",
+                "/api/auth/users/names",
+                json={"ids": user_ids},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            if response.status_code == 200:
+                return response.json().get("names", {})
+            return {}
+        except requests.RequestException as e:
+            print(f"❌ Erreur API get_user_names: {e}")
+            return {}
+
 
 # ==================== DECORATORS ====================
 
@@ -296,9 +442,51 @@ def get_user_name(user_id):
     return jsonify({"userName": user_name})
 
 
+@app.post("/api/users/names")
+def get_user_names():
+    """
+    Récupère les noms de plusieurs utilisateurs via l'API : identifiants
+    dédoublonnés, par appels groupés de USER_NAMES_BATCH au plus
+    """
+    if "token" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    data = request.get_json(silent=True) or {}
+    try:
+        user_ids = list(dict.fromkeys(int(i) for i in data.get("ids", [])))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Identifiants invalides"}), 400
+
+    names: Dict[str, str] = {}
+    for start in range(0, len(user_ids), USER_NAMES_BATCH):
+        names.update(
+            APIClient.get_user_names(
+                user_ids[start : start + USER_NAMES_BATCH], session["token"]
+            )
+        )
+    return jsonify(
+        {"names": {str(i): names.get(str(i), "Inconnu") for i in user_ids}}
+    )
+
+
+@app.get("/health")
+def health():
+    """Sonde de santé du process (utilisée par le lanceur de production)"""
+    return jsonify(
+        {
+            "status": "ok",
+            "pid": os.getpid(),
+            "threads": threading.active_count(),
+            "api_calls": APIClient.metrics.snapshot(),
+        }
+    )
+
+
 @app.route("/logout")
 def logout():
-    """Déconnecte l'utilisateur"""
+    """Déconnecte l'utilisateur (le token est révoqué côté API)"""
+    if "token" in session:
+        APIClient.logout(session["token"])
     session.clear()
     return redirect(url_for("login"))
 
@@ -0,0 +1,96 @@
+"""
+Mesure du gain de latence par connexion apporté par la session HTTP
+partagée (keep-alive) de `APIClient`, face à un backend bouchon local.
+
+Compare `requests.post` (une connexion TCP par appel, comportement historique)
+à `APIClient.login` (connexions réutilisées). Lancement depuis `frontend/` :
+
+    python -m benchmarks.bench_api_client --iterations 500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubAuthHandler(BaseHTTPRequestHandler):
+    """Backend bouchon : répond immédiatement à /api/auth/login."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = json.dumps(
+            {
+                "access_token": "stub-token",
+                "token_type": "bearer",
+                "user": {
+                    "id": 1,
+                    "name": "bob",
+                    "email": "bob@example.com",
+                    "role": "teacher",
+                },
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _time_calls(func, iterations: int):
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAuthHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    # L'URL de l'API est lue à l'import du module Flask
+    os.environ["API_BASE_URL"] = base_url
+    import requests
+    from app import APIClient
+
+    payload = {"username": "bob", "password": "Pass123*"}
+
+    def _per_call_connection():
+        requests.post(f"{base_url}/api/auth/login", json=payload, timeout=5).json()
+
+    def _pooled():
+        APIClient.login("bob", "Pass123*")
+
+    try:
+        fresh = _time_calls(_per_call_connection, args.iterations)
+        pooled = _time_calls(_pooled, args.iterations)
+    finally:
+        server.shutdown()
+
+    fresh_ms, pooled_ms = statistics.median(fresh), statistics.median(pooled)
+    print(f"Itérations                   : {args.iterations}")
+    print(f"requests.post (médiane, ms)  : {fresh_ms:.3f}")
+    print(f"APIClient.login (médiane, ms): {pooled_ms:.3f}")
+    print(f"Gain par connexion (ms)      : {fresh_ms - pooled_ms:.3f}")
+    print(f"Métriques APIClient          : {APIClient.metrics.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -137,6 +137,8 @@ export class QuestionnaireManager extends BaseManager {
     if (!tbody) return
     tbody.innerHTML = ''
 
+    await this.prefetchUserNames(list.map(q => q.created_by).filter(Boolean))
+
     for (const q of list) {
       const latestDate = this.getLatestDate(
         q.created_at,
@@ -1,8 +1,18 @@
+// Questions lues par appel à /questions/query (200 au plus côté API)
+const QUERY_PAGE_SIZE = 100
+
 class TableManager {
   constructor () {
     this.config = window.APP_CONFIG || {}
     this.elements = this.getElements()
+    // Questions déjà chargées (pages successives de /questions/query)
     this.fullData = []
+    this.nextCursor = null
+    this.total = 0
+    this.totalCapped = false
+    // Numéro de la dernière recherche : les réponses d'une recherche
+    // remplacée (filtre modifié entre-temps) sont ignorées
+    this.queryId = 0
     this.userNameCache = new Map()
 
     // Gestion générique des filtres
@@ -17,6 +27,7 @@ class TableManager {
   getElements () {
     return {
       loadButton: document.getElementById('loadQ'),
+      loadMoreButton: document.getElementById('loadMoreQ'),
       feedback: document.getElementById('resultMessage'),
       scrollCard: document.getElementById('scroll-card'),
       table: document.getElementById('questionsTable'),
@@ -178,6 +189,28 @@ class TableManager {
     return userName
   }
 
+  async prefetchUserNames (userIds) {
+    const missing = [...new Set(userIds)].filter(
+      id => id != null && !this.userNameCache.has(id)
+    )
+    if (missing.length === 0) return
+
+    try {
+      const response = await fetch('/api/users/names', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ids: missing })
+      })
+      const result = await response.json()
+      const names = result.names || {}
+      missing.forEach(id => {
+        this.userNameCache.set(id, names[String(id)] || 'Inconnu')
+      })
+    } catch (error) {
+      console.warn('Erreur récupération noms utilisateurs:', error)
+    }
+  }
+
   // === GESTION GÉNÉRIQUE DES FILTRES ===
 
   getFilterConfig (filterType) {
@@ -242,6 +275,11 @@ class TableManager {
       btn.textContent = option
       btn.dataset[filterConfig.dataAttr] = option
 
+      // nombre de questions de cette valeur (facettes), renseigné plus tard
+      const count = document.createElement('span')
+      count.className = 'facet-count'
+      btn.appendChild(count)
+
       if (!this.filters[filterType].active.has(option)) {
         btn.classList.add('inactive')
       }
@@ -288,32 +326,101 @@ class TableManager {
   }
 
   applyFilters () {
-    const filteredData = this.fullData.filter(question => {
-      // Vérifier chaque type de filtre
-      return Object.keys(this.filters).every(filterType => {
-        const filterData = this.filters[filterType]
-        const questionValues = Array.isArray(question[filterType])
-          ? question[filterType]
-          : [question[filterType]]
-
-        return (
-          filterData.active.size === 0 ||
-          questionValues.some(v => filterData.active.has(v))
+    // Filtrage côté serveur : la recherche repart de la première page
+    this.loadQuestions()
+  }
+
+  // Filtres envoyés à l'API : un filtre n'est envoyé que s'il exclut des
+  // valeurs (toutes actives ou aucune : pas de filtre)
+  buildFilterParams () {
+    const params = new URLSearchParams()
+    Object.keys(this.filters).forEach(filterType => {
+      const { active, all } = this.filters[filterType]
+      if (active.size === 0 || active.size >= all.length) return
+      active.forEach(value => params.append(filterType, value))
+    })
+    return params
+  }
+
+  // Paramètres de /questions/query
+  buildQueryParams (cursor = null) {
+    const params = this.buildFilterParams()
+    params.set('page_size', QUERY_PAGE_SIZE)
+    if (cursor) params.set('cursor', cursor)
+    return params
+  }
+
+  // Compteurs des boutons de filtre (/questions/facets) : pour chaque valeur,
+  // questions correspondant aux filtres des autres facettes
+  async loadFacetCounts () {
+    const queryId = this.queryId
+    const params = this.buildFilterParams()
+    params.set('limit', 1)
+
+    try {
+      const response = await fetch(
+        `${this.config.apiUrl}/questions/facets?${params}`,
+        {
+          method: 'GET',
+          headers: {
+            Authorization: `Bearer ${this.config.token}`,
+            Accept: 'application/json'
+          }
+        }
+      )
+      if (!response.ok) {
+        throw new Error(`Erreur HTTP ${response.status}`)
+      }
+      const facets = await response.json()
+      if (queryId !== this.queryId) return
+
+      Object.keys(this.filters).forEach(filterType => {
+        const counts = new Map(
+          (facets[filterType] || []).map(f => [f.value, f.count])
         )
+        const filterConfig = this.getFilterConfig(filterType)
+        filterConfig.container
+          ?.querySelectorAll(`.${filterConfig.btnClass}`)
+          .forEach(btn => {
+            const count = btn.querySelector('.facet-count')
+            const value = btn.dataset[filterConfig.dataAttr]
+            if (count) count.textContent = ` (${counts.get(value) || 0})`
+          })
       })
-    })
+    } catch (error) {
+      console.warn('Erreur récupération des compteurs de filtres:', error)
+    }
+  }
 
-    this.renderTable(filteredData)
+  async fetchPage (cursor = null) {
+    const response = await fetch(
+      `${this.config.apiUrl}/questions/query?${this.buildQueryParams(cursor)}`,
+      {
+        method: 'GET',
+        headers: {
+          Authorization: `Bearer ${this.config.token}`,
+          Accept: 'application/json'
+        }
+      }
+    )
+
+    if (!response.ok) {
+      throw new Error(`Erreur HTTP ${response.status}`)
+    }
+
+    return response.json()
   }
 
   // === FIN GESTION DES FILTRES ===
 
-  // Rendu du tableau
-  async renderTable (data = []) {
+  // Rendu du tableau (`append` : lignes ajoutées à la suite des précédentes)
+  async renderTable (data = [], append = false) {
     if (!this.elements.tbody) return
 
-    this.elements.tbody.innerHTML = ''
+    const queryId = this.queryId
+    await this.prefetchUserNames(data.map(item => item.created_by))
 
+    const rows = document.createDocumentFragment()
     for (const item of data) {
       const tr = document.createElement('tr')
       const creatorName = await this.getUserNameFromCache(item.created_by)
@@ -340,17 +447,41 @@ class TableManager {
       actions.forEach(action => actionsCell.appendChild(action))
       tr.appendChild(actionsCell)
 
-      this.elements.tbody.appendChild(tr)
+      rows.appendChild(tr)
     }
 
+    // recherche remplacée pendant la résolution des noms
+    if (queryId !== this.queryId) return
+    if (!append) this.elements.tbody.innerHTML = ''
+    this.elements.tbody.appendChild(rows)
+
     // Affichage conditionnel du conteneur
     if (this.elements.scrollCard) {
-      this.elements.scrollCard.style.display = data.length
+      this.elements.scrollCard.style.display = this.elements.tbody.rows.length
+        ? 'inline-block'
+        : 'none'
+    }
+  }
+
+  updateLoadMore () {
+    if (this.elements.loadMoreButton) {
+      this.elements.loadMoreButton.style.display = this.nextCursor
         ? 'inline-block'
         : 'none'
     }
   }
 
+  showLoadedCount () {
+    if (!this.fullData.length) {
+      this.showMessage('Aucune question trouvée')
+      return
+    }
+    const total = `${this.total}${this.totalCapped ? '+' : ''}`
+    this.showMessage(
+      `${this.fullData.length} questions affichées sur ${total} trouvées`
+    )
+  }
+
   getLastModifiedDate (item) {
     const created = item.created_at ? new Date(item.created_at).getTime() : 0
     const edited = item.edited_at ? new Date(item.edited_at).getTime() : 0
@@ -358,42 +489,68 @@ class TableManager {
     return this.formatDateTime(new Date(lastDate).toISOString())
   }
 
-  // Chargement des données
+  // Chargement des données : première page de la recherche courante
   async loadQuestions () {
     if (!this.config.apiUrl || !this.config.token) {
       this.showMessage('Configuration API manquante', 'error')
       return
     }
 
+    const queryId = ++this.queryId
     this.showMessage('Chargement…')
 
     try {
-      const response = await fetch(`${this.config.apiUrl}/questions`, {
-        method: 'GET',
-        headers: {
-          Authorization: `Bearer ${this.config.token}`,
-          Accept: 'application/json'
-        }
-      })
+      const page = await this.fetchPage()
+      if (queryId !== this.queryId) return
+
+      this.fullData = page.items || []
+      this.nextCursor = page.next_cursor || null
+      this.total = page.total || 0
+      this.totalCapped = Boolean(page.total_capped)
+
+      await this.renderTable(this.fullData)
+      this.updateLoadMore()
+      this.showLoadedCount()
+      this.loadFacetCounts()
+    } catch (error) {
+      if (queryId !== this.queryId) return
+      console.error('Erreur lors du chargement:', error)
+      this.showMessage(`Échec de la requête : ${error.message}`, 'error')
+      this.fullData = []
+      this.nextCursor = null
+      this.updateLoadMore()
+      this.renderTable([])
+    }
+  }
 
-      if (!response.ok) {
-        throw new Error(`Erreur HTTP ${response.status}`)
-      }
+  // Page suivante (curseur `next_cursor` de la page précédente)
+  async loadMoreQuestions () {
+    if (!this.nextCursor) return
 
-      const data = await response.json()
-      this.fullData = Array.isArray(data) ? data : []
+    const queryId = this.queryId
+    const cursor = this.nextCursor
+    this.nextCursor = null
+    this.updateLoadMore()
+    this.showMessage('Chargement…')
 
-      this.applyFilters()
+    try {
+      const page = await this.fetchPage(cursor)
+      if (queryId !== this.queryId) return
 
-      const message = this.fullData.length
-        ? `Chargement complet : ${this.fullData.length} questions trouvées`
-        : 'Aucune question trouvée'
+      const items = page.items || []
+      this.fullData.push(...items)
+      this.nextCursor = page.next_cursor || null
 
-      this.showMessage(message)
+      await this.renderTable(items, true)
+      this.updateLoadMore()
+      this.showLoadedCount()
     } catch (error) {
+      if (queryId !== this.queryId) return
       console.error('Erreur lors du chargement:', error)
       this.showMessage(`Échec de la requête : ${error.message}`, 'error')
-      this.renderTable([])
+      // nouvel essai possible avec le même curseur
+      this.nextCursor = cursor
+      this.updateLoadMore()
     }
   }
 
@@ -414,6 +571,12 @@ class TableManager {
       )
     }
 
+    if (this.elements.loadMoreButton) {
+      this.elements.loadMoreButton.addEventListener('click', () =>
+        this.loadMoreQuestions()
+      )
+    }
+
     if (this.elements.resetFiltersBtn) {
       this.elements.resetFiltersBtn.addEventListener('click', () =>
         this.resetFilters()
@@ -430,6 +593,8 @@ class TableManager {
       this.loadFilterOptions('subject'),
       this.loadFilterOptions('use')
     ])
+    // boutons créés après le premier chargement du tableau
+    this.loadFacetCounts()
 
     // Auto-chargement si configuré
     if (this.config.autoLoad) {
@@ -59,6 +59,31 @@ export class BaseManager {
     }
   }
 
+  /**
+   * Précharge en un seul appel les noms d'utilisateurs absents du cache
+   */
+  async prefetchUserNames (userIds) {
+    const missing = [...new Set(userIds)].filter(
+      id => id != null && !this.userNameCache.has(id)
+    )
+    if (missing.length === 0) return
+
+    try {
+      const response = await fetch('/api/users/names', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ids: missing })
+      })
+      const result = await response.json()
+      const names = result.names || {}
+      missing.forEach(id => {
+        this.userNameCache.set(id, names[String(id)] || 'Inconnu')
+      })
+    } catch (error) {
+      console.warn('Erreur récupération noms utilisateurs:', error)
+    }
+  }
+
   /**
    * Trouve la date la plus récente parmi plusieurs dates
    */
@@ -1,9 +1,14 @@
+import argparse
 import os
 import signal
 import subprocess
 import sys
+import threading
+import urllib.error
+import urllib.request
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
 
 
 class MonoRepoLauncher:
@@ -16,9 +21,15 @@ class MonoRepoLauncher:
 
     """
 
-    def __init__(self):
+    MODES = ("split", "unified")
+
+    def __init__(self, mode: str = "split"):
         root = Path(__file__).resolve().parent
-        self.targets = [root / "backend" / "api.py", root / "frontend" / "app.py"]
+        if mode == "unified":
+            # API et interface Flask dans un seul process (voir backend/unified.py)
+            self.targets = [root / "backend" / "unified.py"]
+        else:
+            self.targets = [root / "backend" / "api.py", root / "frontend" / "app.py"]
         self.processes = []
 
     def run_script(self, path: Path):
@@ -48,5 +59,218 @@ class MonoRepoLauncher:
             wait(futures)
 
 
+# /proc n'existe que sous Linux : ailleurs, pas de relevé des ressources
+_HAS_PROC = Path("/proc/self/status").exists()
+
+
+def _proc_children(pid: int) -> List[int]:
+    """PIDs des enfants directs d'un process (Linux, via /proc)."""
+    children: List[int] = []
+    task_dir = Path(f"/proc/{pid}/task")
+    if not task_dir.exists():
+        return children
+    for task in task_dir.iterdir():
+        try:
+            children.extend(map(int, (task / "children").read_text().split()))
+        except OSError:
+            continue
+    return children
+
+
+def _proc_usage(pid: int) -> Optional[Dict[str, float]]:
+    """Mémoire résidente (Mo), temps CPU (s) et threads d'un process (Linux)."""
+    try:
+        status = Path(f"/proc/{pid}/status").read_text().splitlines()
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return None
+    fields = dict(line.split(":", 1) for line in status if ":" in line)
+    # champs après le nom du process : utime et stime en 12e et 13e positions
+    ticks = stat.rsplit(")", 1)[1].split()
+    clock = os.sysconf("SC_CLK_TCK")
+    return {
+        "rss_mb": int(fields.get("VmRSS", "0 kB").split()[0]) / 1024,
+        "cpu_s": (int(ticks[11]) + int(ticks[12])) / clock,
+        "threads": int(fields.get("Threads", "0")),
+    }
+
+
+class ProductionLauncher:
+    """
+    Lancement de production :
+    - API : N workers uvicorn partageant le même socket (N = API_WORKERS,
+      ou le nombre de CPU par défaut) ;
+    - interface Flask : serveur WSGI waitress avec un pool de UI_THREADS threads.
+
+    Toutes les HEALTH_INTERVAL secondes, `/health` (vivacité) est interrogé des
+    deux côtés, les ressources de chaque worker sont affichées (Linux) et un service
+    arrêté ou ne répondant plus (HEALTH_MAX_FAILURES échecs consécutifs) est
+    relancé. `/ready` (MongoDB joignable) est seulement signalé : relancer
+    l'API ne rétablit pas la base et interromprait les imports en cours.
+    SIGHUP déclenche un redémarrage progressif : uvicorn remplace ses workers
+    un par un, puis l'interface est relancée.
+    """
+
+    def __init__(
+        self, workers: Optional[int] = None, ui_threads: Optional[int] = None
+    ):
+        self.root = Path(__file__).resolve().parent
+        self.workers = (
+            workers or int(os.getenv("API_WORKERS", "0")) or os.cpu_count() or 1
+        )
+        self.ui_threads = ui_threads or int(os.getenv("UI_THREADS", "16"))
+        self.host = os.getenv("HOST", "0.0.0.0")
+        self.ports = {
+            "api": int(os.getenv("API_PORT", "8000")),
+            "ui": int(os.getenv("UI_PORT", "5005")),
+        }
+        self.health_interval = float(os.getenv("HEALTH_INTERVAL", "15"))
+        self.max_failures = int(os.getenv("HEALTH_MAX_FAILURES", "3"))
+        self.processes: Dict[str, subprocess.Popen] = {}
+        self.failures = {"api": 0, "ui": 0}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def _command(self, name: str):
+        """Ligne de commande et répertoire de travail d'un service."""
+        if name == "api":
+            return [
+                sys.executable, "-m", "uvicorn", "api:app",
+                "--host", self.host,
+                "--port", str(self.ports["api"]),
+                "--workers", str(self.workers),
+                "--timeout-graceful-shutdown", "30",
+                # journal d'accès synchrone remplacé par /metrics et les logs applicatifs
+                "--no-access-log",
+            ], self.root / "backend"
+        return [
+            sys.executable, "-m", "waitress",
+            f"--host={self.host}",
+            f"--port={self.ports['ui']}",
+            f"--threads={self.ui_threads}",
+            "app:app",
+        ], self.root / "frontend"
+
+    def _spawn(self, name: str):
+        command, cwd = self._command(name)
+        self.processes[name] = subprocess.Popen(
+            command, cwd=cwd, env={**os.environ, "PYTHONUNBUFFERED": "1"}
+        )
+        self.failures[name] = 0
+
+    @staticmethod
+    def _terminate(process: subprocess.Popen, timeout: float = 35):
+        if process.poll() is None:
+            process.terminate()
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    def restart(self, name: str):
+        """Arrête proprement puis relance un service."""
+        with self._lock:
+            if self._stopping.is_set():
+                return
+            print(f"[launcher] redémarrage de {name}")
+            self._terminate(self.processes[name])
+            self._spawn(name)
+
+    def rolling_restart(self, *_):
+        """SIGHUP : workers uvicorn remplacés un par un, puis l'interface."""
+
+        def _run():
+            print("[launcher] redémarrage progressif demandé")
+            api = self.processes.get("api")
+            if api is not None and api.poll() is None:
+                api.send_signal(signal.SIGHUP)
+            self.restart("ui")
+
+        threading.Thread(target=_run, name="rolling-restart", daemon=True).start()
+
+    def _healthy(self, name: str, probe: str = "health") -> bool:
+        url = f"http://127.0.0.1:{self.ports[name]}/{probe}"
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                return response.status == 200
+        except (urllib.error.URLError, OSError):
+            return False
+
+    def _report(self, name: str):
+        """Affiche les ressources de chaque worker d'un service (Linux)."""
+        if not _HAS_PROC:
+            return
+        process = self.processes[name]
+        pids = _proc_children(process.pid) if name == "api" else [process.pid]
+        for pid in pids:
+            usage = _proc_usage(pid)
+            if usage is None:
+                continue
+            print(
+                f"[{name}] pid={pid} rss={usage['rss_mb']:.1f}Mo "
+                f"cpu={usage['cpu_s']:.1f}s threads={usage['threads']}"
+            )
+
+    def check(self):
+        """Un tour de supervision : process, sondes de santé et ressources."""
+        for name, process in list(self.processes.items()):
+            if self._stopping.is_set():
+                return
+            if process.poll() is not None:
+                print(f"[launcher] {name} arrêté (code {process.returncode})")
+                self.restart(name)
+                continue
+            if self._healthy(name):
+                self.failures[name] = 0
+            else:
+                self.failures[name] += 1
+                print(f"[launcher] {name} /health en échec ({self.failures[name]})")
+                if self.failures[name] >= self.max_failures:
+                    self.restart(name)
+                    continue
+            if name == "api" and not self._healthy(name, "ready"):
+                print("[launcher] api /ready en échec (MongoDB indisponible)")
+            self._report(name)
+
+    def stop(self, *_):
+        self._stopping.set()
+        for process in self.processes.values():
+            if process.poll() is None:
+                process.terminate()
+        for process in self.processes.values():
+            self._terminate(process)
+
+    def start(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        if hasattr(signal, "SIGHUP"):  # absent sous Windows
+            signal.signal(signal.SIGHUP, self.rolling_restart)
+        print(
+            f"[launcher] API: {self.workers} workers, "
+            f"interface: {self.ui_threads} threads"
+        )
+        self._spawn("api")
+        self._spawn("ui")
+        while not self._stopping.wait(self.health_interval):
+            self.check()
+
+
 if __name__ == "__main__":
-    MonoRepoLauncher().start()
+    parser = argparse.ArgumentParser(description="Lance l'API et l'interface")
+    parser.add_argument(
+        "--mode",
+        choices=MonoRepoLauncher.MODES + ("production",),
+        default=os.getenv("LAUNCH_MODE", "split"),
+        help="split : deux process (API :8000, Flask :5005) ; "
+        "unified : un seul process sur :8000 ; "
+        "production : N workers uvicorn et Flask sous waitress",
+    )
+    parser.add_argument("--workers", type=int, help="workers uvicorn (production)")
+    parser.add_argument(
+        "--ui-threads", type=int, help="threads waitress (production)"
+    )
+    args = parser.parse_args()
+    if args.mode == "production":
+        ProductionLauncher(args.workers, args.ui_threads).start()
+    else:
+        MonoRepoLauncher(args.mode).start()